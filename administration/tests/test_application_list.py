@@ -0,0 +1,66 @@
+import os
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from applications.factories import ApplicationFactory
+from applications.models import Application
+
+pytestmark = pytest.mark.django_db
+
+ARCHIVED_YEAR = '2020/2021'
+OLD_YEAR = '2022/2023'
+
+
+@pytest.fixture
+def staff_client(client, staff_user, settings):
+    settings.QUERY_BUDGET_MODE = 'raise'
+    client.force_login(staff_user)
+    return client
+
+
+@pytest.fixture
+def years():
+    """One current application, one still in the table from an old year, two archived"""
+    current = ApplicationFactory(status='pending')
+    old = ApplicationFactory(status='pending')
+    archived = [ApplicationFactory(status='approved'), ApplicationFactory(status='rejected')]
+    Application.all_years.filter(pk=old.pk).update(academic_year=OLD_YEAR)
+    Application.all_years.filter(pk__in=[application.pk for application in archived]).update(academic_year=ARCHIVED_YEAR)
+    call_command('archive_academic_year', ARCHIVED_YEAR, stdout=open(os.devnull, 'w'))
+    return current, old, archived
+
+
+def list_references(client, **params):
+    response = client.get(reverse('administration:application_list'), params)
+    assert response.status_code == 200
+    return response, {application.reference_number for application in response.context['applications']}
+
+
+def test_current_year_is_listed_by_default(staff_client, years, settings):
+    current, old, archived = years
+
+    response, references = list_references(staff_client)
+
+    assert references == {current.reference_number}
+    assert response.context['year_choices'] == [settings.ACADEMIC_YEAR, OLD_YEAR, ARCHIVED_YEAR]
+    assert response.context['archived_years'] == [ARCHIVED_YEAR]
+
+
+def test_older_year_still_in_the_table(staff_client, years):
+    current, old, archived = years
+
+    _, references = list_references(staff_client, year=OLD_YEAR)
+
+    assert references == {old.reference_number}
+
+
+def test_archived_year_is_filtered_on_the_archive(staff_client, years):
+    current, old, archived = years
+
+    response, references = list_references(staff_client, year=ARCHIVED_YEAR, status='approved')
+
+    assert response.context['archived']
+    assert references == {archived[0].reference_number}
+    assert b'Archived' in response.content
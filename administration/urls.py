@@ -10,5 +10,6 @@ urlpatterns = [
     path('', views.DashboardView.as_view(), name='dashboard'),
     path('applications/', views.ApplicationListView.as_view(), name='application_list'),
     path('applications/<int:pk>/', views.ApplicationDetailView.as_view(), name='application_detail'),
+    path('documents/<int:pk>/', views.document_download, name='document_download'),
     path('logout/', views.custom_logout_view, name='logout'),
 ]
\ No newline at end of file
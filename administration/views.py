@@ -2,16 +2,21 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import TemplateView, ListView, DetailView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth import logout
-from django.contrib.auth.decorators import login_required
+from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.db.models import Count, Q
+from django.conf import settings
+from django.db.models import BooleanField, Count, Q, Value
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.db import DatabaseError
+from django.http import FileResponse, Http404
 from datetime import timedelta
 import logging
-from applications.models import Application
+from applications.models import Application, ApplicationArchive, ApplicationDocument, GradeCapacity
+from applications.seats import SeatsFull, change_status
 from core.email_service import EmailService
+from core.db_router import ReplicaReadMixin, pin_to_primary
+from core.query_budget import QueryBudgetMixin, query_budget
 
 logger = logging.getLogger(__name__)
 
@@ -27,8 +32,9 @@ class StaffRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
         return super().handle_no_permission()
 
 
-class DashboardView(StaffRequiredMixin, TemplateView):
+class DashboardView(QueryBudgetMixin, ReplicaReadMixin, StaffRequiredMixin, TemplateView):
     template_name = 'administration/dashboard.html'
+    query_budget = 10
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -62,14 +68,36 @@ class DashboardView(StaffRequiredMixin, TemplateView):
         return context
 
 
-class ApplicationListView(StaffRequiredMixin, ListView):
+class ApplicationListView(QueryBudgetMixin, ReplicaReadMixin, StaffRequiredMixin, ListView):
     model = Application
+    query_budget = 5
     template_name = 'administration/application_list.html'
     context_object_name = 'applications'
     paginate_by = 20
     
+    def get_years(self):
+        """``{academic_year: archived}`` for the current year and every year with applications, newest first"""
+        archived = ApplicationArchive.objects.order_by().values_list(
+            'academic_year', Value(True, output_field=BooleanField())
+        ).distinct()
+        live = Application.all_years.order_by().values_list(
+            'academic_year', Value(False, output_field=BooleanField())
+        ).distinct()
+        years = {settings.ACADEMIC_YEAR: False}
+        # A year still partly in the applications table is listed from there
+        for year, is_archived in sorted(archived.union(live), key=lambda row: row[1], reverse=True):
+            years[year] = is_archived
+        return dict(sorted(years.items(), reverse=True))
+    
     def get_queryset(self):
-        queryset = Application.objects.all().order_by('-created_at')
+        self.years = self.get_years()
+        self.year = self.request.GET.get('year') or settings.ACADEMIC_YEAR
+        if self.year not in self.years:
+            self.year = settings.ACADEMIC_YEAR
+        if self.years[self.year]:
+            return self.get_archived_queryset()
+        
+        queryset = Application.all_years.filter(academic_year=self.year).order_by('-created_at')
         
         status = self.request.GET.get('status')
         if status and status in ['pending', 'approved', 'rejected', 'waitlist']:
@@ -92,25 +120,64 @@ class ApplicationListView(StaffRequiredMixin, ListView):
         
         return queryset
     
+    def get_archived_queryset(self):
+        """The selected archived year, filtered on the columns kept beside the snapshot"""
+        queryset = ApplicationArchive.objects.filter(academic_year=self.year).defer('payload').order_by('-created_at')
+        
+        status = self.request.GET.get('status')
+        if status and status in ['pending', 'approved', 'rejected', 'waitlist']:
+            queryset = queryset.filter(status=status)
+        
+        grade = self.request.GET.get('grade')
+        if grade:
+            queryset = queryset.filter(grade_applying_for=grade)
+        
+        search = self.request.GET.get('search')
+        if search:
+            queryset = queryset.filter(
+                Q(student_name__icontains=search) |
+                Q(reference_number__icontains=search) |
+                Q(guardian_name__icontains=search) |
+                Q(guardian_email__icontains=search)
+            )
+        
+        return queryset
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
         context['status_choices'] = Application.STATUS_CHOICES
         context['grade_choices'] = Application.GRADE_CHOICES
+        context['year_choices'] = list(self.years)
+        context['archived_years'] = [year for year, archived in self.years.items() if archived]
+        context['archived'] = self.years[self.year]
         context['current_status'] = self.request.GET.get('status', '')
         context['current_grade'] = self.request.GET.get('grade', '')
         context['current_search'] = self.request.GET.get('search', '')
+        context['current_year'] = self.year
         
         return context
 
 
-class ApplicationDetailView(StaffRequiredMixin, DetailView):
+class ApplicationDetailView(QueryBudgetMixin, ReplicaReadMixin, StaffRequiredMixin, DetailView):
     model = Application
+    query_budget = 10
     template_name = 'administration/application_detail.html'
     context_object_name = 'application'
     
     def get_object(self):
-        return get_object_or_404(Application, pk=self.kwargs['pk'])
+        return get_object_or_404(Application.all_years, pk=self.kwargs['pk'])
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        application = self.object
+        context['grade_capacity'] = GradeCapacity.objects.filter(
+            academic_year=application.academic_year,
+            grade=application.grade_applying_for,
+        ).first()
+        context['email_logs'] = application.email_logs.all()[:20]
+        context['documents'] = application.documents.exclude(status='uploading')
+        return context
     
     def post(self, request, *args, **kwargs):
         try:
@@ -118,9 +185,8 @@ class ApplicationDetailView(StaffRequiredMixin, DetailView):
             new_status = request.POST.get('status')
             
             if new_status in ['pending', 'approved', 'rejected', 'waitlist']:
-                old_status = application.status
-                application.status = new_status
-                application.save()
+                old_status, promoted = change_status(application, new_status)
+                pin_to_primary(request)
                 
                 # Send status update email
                 try:
@@ -145,12 +211,29 @@ class ApplicationDetailView(StaffRequiredMixin, DetailView):
                     f'Application {application.reference_number} status updated from '
                     f'{old_status} to {new_status}.{email_message}'
                 )
+                if promoted:
+                    messages.info(
+                        request,
+                        'Promoted from the waitlist into the freed seat: '
+                        + ', '.join(waitlisted.reference_number for waitlisted in promoted)
+                        + '. Their guardians are being notified.'
+                    )
             else:
                 logger.warning(
                     f'Invalid status update attempt: {new_status} by {request.user.username}'
                 )
                 messages.error(request, 'Invalid status selected.')
                 
+        except SeatsFull as e:
+            logger.warning(
+                f'Approval of {application.reference_number} refused, no seats left: {e.capacity}'
+            )
+            messages.error(
+                request,
+                f'No seats left in {e.capacity.get_grade_display()} for {e.capacity.academic_year} '
+                f'({e.capacity.seats} seats). Place the application on the waitlist instead.'
+            )
+            
         except ValidationError as e:
             logger.error(f'Validation error during status update: {e}')
             messages.error(request, 'Invalid data provided. Please try again.')
@@ -166,8 +249,23 @@ class ApplicationDetailView(StaffRequiredMixin, DetailView):
         return redirect('administration:application_detail', pk=application.pk)
 
 
+@query_budget(4)
 @login_required
 def custom_logout_view(request):
     logout(request)
     messages.success(request, 'You have been successfully logged out.')
     return redirect('core:home')
+
+
+@query_budget(4)
+@login_required
+@user_passes_test(lambda user: user.is_staff)
+def document_download(request, pk):
+    """Serve an uploaded supporting document to staff; documents are never public media"""
+    document = get_object_or_404(ApplicationDocument.objects.exclude(status='uploading'), pk=pk)
+    try:
+        handle = document.file.open('rb')
+    except (OSError, ValueError):
+        raise Http404('Document file is missing')
+    return FileResponse(handle, as_attachment=True, filename=document.original_name,
+                        content_type=document.content_type)
@@ -1,16 +1,47 @@
-from django.contrib import admin
-from .models import Application
+import logging
+
+from django import forms
+from django.contrib import admin, messages
+from .models import Application, ApplicationArchive, ApplicationDocument, DailyIntake, EmailLog, GradeCapacity
+from .seats import SeatsFull, change_grade, change_status, fill_seats, recount_seats
+from core.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+
+class ApplicationAdminForm(forms.ModelForm):
+    
+    class Meta:
+        model = Application
+        fields = '__all__'
+    
+    def clean_grade_applying_for(self):
+        grade = self.cleaned_data['grade_applying_for']
+        application = self.instance
+        if application.pk and application.status == 'approved' and grade != application.grade_applying_for:
+            capacity = GradeCapacity.objects.filter(academic_year=application.academic_year, grade=grade).first()
+            if capacity and not capacity.seats_available:
+                raise forms.ValidationError(
+                    f'No seats left in {capacity.get_grade_display()} for {capacity.academic_year}.'
+                )
+        return grade
+
 
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
+    # Status only changes through the actions below, and an approved
+    # application's grade through change_grade, so seats stay counted
+    form = ApplicationAdminForm
+    actions = ['mark_approved', 'mark_waitlist', 'mark_rejected', 'mark_pending']
     list_display = [
         'reference_number', 
         'student_full_name', 
         'grade_applying_for', 
         'status', 
+        'academic_year',
         'created_at'
     ]
-    list_filter = ['status', 'grade_applying_for', 'created_at']
+    list_filter = ['academic_year', 'status', 'grade_applying_for', 'created_at']
     search_fields = [
         'reference_number', 
         'student_first_name', 
@@ -19,11 +50,11 @@ class ApplicationAdmin(admin.ModelAdmin):
         'guardian_last_name',
         'guardian_email'
     ]
-    readonly_fields = ['reference_number', 'created_at', 'updated_at']
+    readonly_fields = ['reference_number', 'academic_year', 'status', 'created_at', 'updated_at']
     
     fieldsets = (
         ('Application Info', {
-            'fields': ('reference_number', 'status', 'created_at', 'updated_at')
+            'fields': ('reference_number', 'academic_year', 'status', 'created_at', 'updated_at')
         }),
         ('Student Information', {
             'fields': (
@@ -64,3 +95,154 @@ class ApplicationAdmin(admin.ModelAdmin):
     def student_full_name(self, obj):
         return obj.student_full_name
     student_full_name.short_description = 'Student Name'
+    
+    def save_model(self, request, obj, form, change):
+        if not (change and 'grade_applying_for' in form.changed_data):
+            return super().save_model(request, obj, form, change)
+        try:
+            promoted = change_grade(obj, obj.grade_applying_for)
+        except SeatsFull as e:
+            # Taken between validating the form and saving it
+            self.message_user(
+                request,
+                f'Not saved: no seats left in {e.capacity.get_grade_display()} for {e.capacity.academic_year}.',
+                messages.ERROR,
+            )
+            return
+        self.report_promoted(request, promoted)
+    
+    def apply_status(self, request, queryset, new_status):
+        changed = 0
+        for application in queryset:
+            try:
+                old_status, promoted = change_status(application, new_status)
+            except SeatsFull as e:
+                self.message_user(
+                    request,
+                    f'{application.reference_number} not approved: no seats left in '
+                    f'{e.capacity.get_grade_display()} for {e.capacity.academic_year}.',
+                    messages.ERROR,
+                )
+                continue
+            if old_status == new_status:
+                continue
+            changed += 1
+            logger.info(
+                f'Application {application.reference_number} status changed from '
+                f'{old_status} to {new_status} by {request.user.username}'
+            )
+            try:
+                if not EmailService.send_status_update(application, old_status, new_status):
+                    logger.warning(f'Failed to send status update email for application {application.reference_number}')
+            except Exception as e:
+                logger.error(f'Error sending status update email for {application.reference_number}: {e}')
+            self.report_promoted(request, promoted)
+        if changed:
+            self.message_user(request, f'Updated {changed} application(s) to {new_status}.')
+    
+    def report_promoted(self, request, promoted):
+        if promoted:
+            self.message_user(
+                request,
+                'Promoted from the waitlist into the freed seat: '
+                + ', '.join(waitlisted.reference_number for waitlisted in promoted),
+                messages.INFO,
+            )
+    
+    @admin.action(description='Approve selected applications')
+    def mark_approved(self, request, queryset):
+        self.apply_status(request, queryset, 'approved')
+    
+    @admin.action(description='Waitlist selected applications')
+    def mark_waitlist(self, request, queryset):
+        self.apply_status(request, queryset, 'waitlist')
+    
+    @admin.action(description='Reject selected applications')
+    def mark_rejected(self, request, queryset):
+        self.apply_status(request, queryset, 'rejected')
+    
+    @admin.action(description='Return selected applications to pending review')
+    def mark_pending(self, request, queryset):
+        self.apply_status(request, queryset, 'pending')
+
+
+@admin.register(ApplicationArchive)
+class ApplicationArchiveAdmin(admin.ModelAdmin):
+    list_display = ['reference_number', 'student_name', 'grade_applying_for', 'status', 'academic_year', 'created_at']
+    list_filter = ['academic_year', 'status']
+    search_fields = ['reference_number', 'student_name', 'guardian_name', 'guardian_email']
+    readonly_fields = [
+        'academic_year', 'reference_number', 'student_name', 'guardian_name', 'guardian_email',
+        'grade_applying_for', 'status', 'created_at', 'archived_at', 'archived_details',
+    ]
+    exclude = ['payload']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def archived_details(self, obj):
+        data = obj.data
+        documents = data.pop('documents', [])
+        lines = [f'{key}: {"" if value is None else value}' for key, value in data.items()]
+        lines += [
+            f'document: {document["document_type"]} {document["original_name"]} '
+            f'({document["size"]} bytes, sha256 {document["checksum"] or "-"})'
+            for document in documents
+        ]
+        return '\n'.join(lines)
+    archived_details.short_description = 'Archived Details'
+
+
+@admin.register(DailyIntake)
+class DailyIntakeAdmin(admin.ModelAdmin):
+    list_display = ['date', 'grade', 'count']
+    list_filter = ['date']
+    readonly_fields = ['date', 'grade', 'count']
+
+
+@admin.register(GradeCapacity)
+class GradeCapacityAdmin(admin.ModelAdmin):
+    list_display = ['grade', 'academic_year', 'seats', 'seats_taken', 'seats_available']
+    list_filter = ['academic_year']
+    readonly_fields = ['seats_taken']
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        recount_seats(obj)
+        promoted = fill_seats(obj.academic_year, obj.grade)
+        if promoted:
+            self.message_user(
+                request,
+                f'Promoted {len(promoted)} waitlisted application(s) into the new seats.'
+            )
+
+
+@admin.register(EmailLog)
+class EmailLogAdmin(admin.ModelAdmin):
+    list_display = ['sent_at', 'email_type', 'recipient', 'status', 'duration_ms', 'application']
+    list_filter = ['status', 'email_type', 'sent_at']
+    search_fields = ['recipient', 'application__reference_number']
+    list_select_related = ['application']
+    date_hierarchy = 'sent_at'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ApplicationDocument)
+class ApplicationDocumentAdmin(admin.ModelAdmin):
+    list_display = ['application', 'document_type', 'original_name', 'size', 'page_count', 'status', 'created_at']
+    list_filter = ['status', 'document_type']
+    search_fields = ['application__reference_number', 'original_name', 'checksum']
+    list_select_related = ['application']
+    readonly_fields = [
+        'application', 'upload_id', 'original_name', 'content_type', 'size', 'file', 'thumbnail',
+        'checksum', 'page_count', 'status', 'error', 'created_at', 'uploaded_at', 'processed_at',
+    ]
+    exclude = ['claimed_until']
+    
+    def has_add_permission(self, request):
+        return False
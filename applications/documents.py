@@ -0,0 +1,242 @@
+"""
+Resumable supporting-document uploads
+
+An upload is started with its type, name and size, which creates an
+``ApplicationDocument`` in ``uploading`` state. The browser then sends the
+file in chunks, each a ``PATCH`` carrying the byte offset it starts at.
+Chunks are copied from the request stream straight to a ``.part`` file,
+64 KB at a time, so nothing larger than that is held in memory. If the
+connection drops, a ``HEAD`` returns the bytes already on disk and the
+upload carries on from there. The last chunk moves the file into
+``MEDIA_ROOT/documents/`` and marks the document ``pending``.
+
+The ``process_documents`` worker then checksums each pending document,
+checks that its content matches its type, counts PDF pages and writes
+thumbnails for images, outside any request.
+"""
+import fcntl
+import hashlib
+import logging
+import os
+import re
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .models import ApplicationDocument
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_TYPES = {
+    'application/pdf': '.pdf',
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+}
+STREAM_BLOCK_SIZE = 65536
+THUMBNAIL_SIZE = (320, 320)
+
+PAGES_COUNT_RE = re.compile(rb'/Type\s*/Pages\b.*?/Count\s+(\d+)', re.S)
+PAGE_RE = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+STREAM_RE = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.S)
+
+
+class UploadError(Exception):
+    """An upload request that cannot be accepted; ``status`` is the HTTP status to answer with"""
+
+    def __init__(self, message, status=400):
+        self.status = status
+        super().__init__(message)
+
+
+class OffsetMismatch(UploadError):
+    def __init__(self, offset):
+        self.offset = offset
+        super().__init__(f'Upload is at byte {offset}', status=409)
+
+
+def partial_path(document):
+    return os.path.join(settings.MEDIA_ROOT, 'uploads', 'partial', f'{document.upload_id}.part')
+
+
+def start_upload(application, document_type, filename, size, content_type):
+    """Validate an upload and create its ``uploading`` document"""
+    if document_type not in dict(ApplicationDocument.DOCUMENT_TYPE_CHOICES):
+        raise UploadError('Unknown document type')
+    if content_type not in ALLOWED_TYPES:
+        raise UploadError('Only PDF, JPEG, PNG and WebP files can be uploaded', status=415)
+    if not isinstance(size, int) or size < 1:
+        raise UploadError('The file is empty')
+    if size > settings.DOCUMENT_MAX_SIZE:
+        raise UploadError(
+            f'Files can be at most {settings.DOCUMENT_MAX_SIZE // 1048576} MB', status=413
+        )
+    if application.documents.exclude(status='failed').count() >= settings.DOCUMENT_MAX_PER_APPLICATION:
+        raise UploadError(f'At most {settings.DOCUMENT_MAX_PER_APPLICATION} documents per application', status=409)
+
+    return ApplicationDocument.objects.create(
+        application=application,
+        document_type=document_type,
+        original_name=os.path.basename(filename or '')[:255] or 'document',
+        content_type=content_type,
+        size=size,
+    )
+
+
+def current_offset(document):
+    """Bytes received so far"""
+    if document.status != 'uploading':
+        return document.size
+    try:
+        return os.path.getsize(partial_path(document))
+    except OSError:
+        return 0
+
+
+def append_chunk(document, offset, stream, length):
+    """
+    Copy ``length`` bytes from ``stream`` to the document's partial file at
+    ``offset``. Returns the new offset; a dropped connection keeps whatever
+    arrived. Completes the upload once all ``document.size`` bytes are in.
+    """
+    if document.status != 'uploading':
+        raise UploadError('Upload already complete', status=409)
+    if offset + length > document.size:
+        raise UploadError('Chunk goes past the declared file size', status=413)
+
+    path = partial_path(document)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'ab') as handle:
+        # One writer per upload: a retried chunk waits for the one it replaces
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        handle.seek(0, os.SEEK_END)
+        if handle.tell() != offset:
+            raise OffsetMismatch(handle.tell())
+        remaining = length
+        while remaining:
+            block = stream.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            handle.write(block)
+            remaining -= len(block)
+        handle.flush()
+        new_offset = handle.tell()
+
+    if new_offset == document.size:
+        complete_upload(document)
+    return new_offset
+
+
+def complete_upload(document):
+    name = ApplicationDocument._meta.get_field('file').generate_filename(
+        document, f'{document.upload_id}{ALLOWED_TYPES[document.content_type]}'
+    )
+    target = default_storage.path(name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.replace(partial_path(document), target)
+    document.file.name = name
+    document.status = 'pending'
+    document.uploaded_at = timezone.now()
+    document.save(update_fields=['file', 'status', 'uploaded_at'])
+    logger.info(f'Document {document.upload_id} uploaded for application {document.application_id}')
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(STREAM_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def count_pdf_pages(path):
+    """
+    Page count from the page tree's ``/Count``, looking inside compressed
+    object streams too. Falls back to counting ``/Type /Page`` objects.
+    """
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    if not data.startswith(b'%PDF-'):
+        raise ValueError('Not a PDF file')
+
+    sections = [data]
+    for stream in STREAM_RE.findall(data):
+        try:
+            sections.append(zlib.decompress(stream))
+        except zlib.error:
+            continue
+    counts = [int(count) for section in sections for count in PAGES_COUNT_RE.findall(section)]
+    if counts:
+        return max(counts)
+    return sum(len(PAGE_RE.findall(section)) for section in sections) or None
+
+
+def make_thumbnail(document, path):
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as image:
+        image.verify()
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(THUMBNAIL_SIZE)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        name = document.thumbnail.field.generate_filename(document, f'{document.upload_id}.jpg')
+        target = default_storage.path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        image.save(target, 'JPEG', quality=80, optimize=True)
+    return name
+
+
+def process_document(document):
+    """Checksum, validate and thumbnail one uploaded document"""
+    path = document.file.path
+    try:
+        document.checksum = file_checksum(path)
+        if document.content_type == 'application/pdf':
+            document.page_count = count_pdf_pages(path)
+        else:
+            document.thumbnail.name = make_thumbnail(document, path)
+            document.page_count = 1
+        document.status = 'ready'
+        document.error = ''
+    except Exception as e:
+        logger.warning(f'Document {document.upload_id} failed processing: {e}')
+        document.status = 'failed'
+        document.error = str(e)[:500]
+    document.processed_at = timezone.now()
+    document.claimed_until = None
+    document.save(update_fields=[
+        'checksum', 'page_count', 'thumbnail', 'status', 'error', 'processed_at', 'claimed_until',
+    ])
+    return document.status == 'ready'
+
+
+def delete_document_files(documents):
+    """Remove the stored, partial and thumbnail files of ``documents``"""
+    for document in documents:
+        paths = [partial_path(document)]
+        paths += [field.path for field in (document.file, document.thumbnail) if field]
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def expire_uploads(hours=None):
+    """Delete uploads that were started but not finished; returns how many"""
+    hours = settings.DOCUMENT_UPLOAD_EXPIRY_HOURS if hours is None else hours
+    stale = list(ApplicationDocument.objects.filter(
+        status='uploading', created_at__lt=timezone.now() - timedelta(hours=hours),
+    ))
+    for document in stale:
+        try:
+            os.remove(partial_path(document))
+        except OSError:
+            pass
+    ApplicationDocument.objects.filter(pk__in=[document.pk for document in stale]).delete()
+    return len(stale)
@@ -0,0 +1,163 @@
+"""
+Duplicate application detection
+
+Each application stores two indexed fingerprints of its normalised student
+name and date of birth, one combined with the guardian phone and one with
+the guardian email. Checking a new submission is then a single indexed
+lookup. ``cluster_near_duplicates`` groups existing near-duplicates for
+staff, comparing only rows that share a blocking key.
+"""
+import hashlib
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+NON_LETTERS_RE = re.compile(r'[^a-z\s]')
+WHITESPACE_RE = re.compile(r'\s+')
+NON_DIGITS_RE = re.compile(r'\D')
+
+# Statuses that make a repeat submission a duplicate rather than a re-application
+ACTIVE_STATUSES = ('pending', 'approved', 'waitlist')
+
+NAME_SIMILARITY_THRESHOLD = 0.85
+MAX_BLOCK_SIZE = 200
+
+
+def normalise_name(first_name, last_name):
+    """Lowercase letters only, tokens sorted so swapped first/last names match"""
+    name = NON_LETTERS_RE.sub('', f'{first_name} {last_name}'.lower())
+    return ' '.join(sorted(WHITESPACE_RE.split(name.strip())))
+
+
+def normalise_phone(phone):
+    """Digits only, with local 0XX numbers rewritten to the +233 form"""
+    digits = NON_DIGITS_RE.sub('', phone or '')
+    if len(digits) == 10 and digits.startswith('0'):
+        digits = '233' + digits[1:]
+    return digits
+
+
+def normalise_email(email):
+    return (email or '').strip().lower()
+
+
+def fingerprint(name, date_of_birth, contact):
+    if not (name and date_of_birth and contact):
+        return ''
+    key = f'{name}|{date_of_birth.isoformat()}|{contact}'
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def compute_fingerprints(student_first_name, student_last_name, student_date_of_birth,
+                         guardian_phone, guardian_email):
+    """Return ``(phone_fingerprint, email_fingerprint)`` for the given details"""
+    name = normalise_name(student_first_name, student_last_name)
+    return (
+        fingerprint(name, student_date_of_birth, normalise_phone(guardian_phone)),
+        fingerprint(name, student_date_of_birth, normalise_email(guardian_email)),
+    )
+
+
+def find_duplicates(phone_fingerprint, email_fingerprint, exclude_pk=None):
+    """Active applications matching either fingerprint (one indexed query)"""
+    from django.db.models import Q
+    from .models import Application
+
+    conditions = Q()
+    if phone_fingerprint:
+        conditions |= Q(phone_fingerprint=phone_fingerprint)
+    if email_fingerprint:
+        conditions |= Q(email_fingerprint=email_fingerprint)
+    if not conditions:
+        return Application.objects.none()
+
+    queryset = Application.objects.filter(conditions, status__in=ACTIVE_STATUSES)
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    return queryset
+
+
+class DisjointSet:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def blocking_keys(row):
+    """Keys under which a row is compared with others"""
+    name = normalise_name(row['student_first_name'], row['student_last_name'])
+    dob = row['student_date_of_birth']
+    keys = [f'dob:{dob.isoformat()}:{name[:2]}']
+    phone = normalise_phone(row['guardian_phone'])
+    if phone:
+        keys.append(f'phone:{phone}')
+    email = normalise_email(row['guardian_email'])
+    if email:
+        keys.append(f'email:{email}')
+    return name, keys
+
+
+def is_near_duplicate(a, b):
+    """Similar student names, plus the same DOB or the same guardian contact"""
+    if SequenceMatcher(None, a['name'], b['name']).ratio() < NAME_SIMILARITY_THRESHOLD:
+        return False
+    return (
+        a['student_date_of_birth'] == b['student_date_of_birth']
+        or a['phone'] and a['phone'] == b['phone']
+        or a['email'] and a['email'] == b['email']
+    )
+
+
+def cluster_near_duplicates(queryset=None):
+    """
+    Group near-duplicate applications into clusters of primary keys.
+
+    Rows are bucketed by blocking key (DOB + name prefix, guardian phone,
+    guardian email) and only compared within a bucket, so the work grows
+    with the bucket sizes rather than quadratically with the table.
+    """
+    from .models import Application
+
+    if queryset is None:
+        queryset = Application.objects.all()
+
+    rows = {}
+    blocks = defaultdict(list)
+    fields = (
+        'pk', 'student_first_name', 'student_last_name', 'student_date_of_birth',
+        'guardian_phone', 'guardian_email',
+    )
+    for row in queryset.values(*fields).iterator(chunk_size=2000):
+        name, keys = blocking_keys(row)
+        row['name'] = name
+        row['phone'] = normalise_phone(row['guardian_phone'])
+        row['email'] = normalise_email(row['guardian_email'])
+        rows[row['pk']] = row
+        for key in keys:
+            blocks[key].append(row['pk'])
+
+    clusters = DisjointSet()
+    for members in blocks.values():
+        # Oversized blocks (e.g. a shared school phone) carry no signal
+        if len(members) < 2 or len(members) > MAX_BLOCK_SIZE:
+            continue
+        for index, pk in enumerate(members):
+            for other_pk in members[index + 1:]:
+                if clusters.find(pk) != clusters.find(other_pk) and is_near_duplicate(rows[pk], rows[other_pk]):
+                    clusters.union(pk, other_pk)
+
+    grouped = defaultdict(list)
+    for pk in clusters.parent:
+        grouped[clusters.find(pk)].append(pk)
+    return sorted((sorted(members) for members in grouped.values() if len(members) > 1), key=len, reverse=True)
@@ -0,0 +1,133 @@
+"""
+Synthetic application data for seeding, tests and benchmarks
+"""
+import random
+from datetime import timedelta
+
+import factory
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Application, ApplicationArchive
+
+GRADE_AGES = {
+    'preschool': 3,
+    'nursery_1': 3,
+    'nursery_2': 4,
+    'kindergarten_1': 5,
+    'kindergarten_2': 6,
+    'primary_1': 6,
+    'primary_2': 7,
+    'primary_3': 8,
+    'primary_4': 9,
+    'primary_5': 10,
+    'primary_6': 11,
+    'jhs_1': 12,
+    'jhs_2': 13,
+    'jhs_3': 14,
+}
+
+# Most applications sit in review; the rest are spread over the decisions
+STATUS_WEIGHTS = {
+    'pending': 55,
+    'approved': 25,
+    'waitlist': 12,
+    'rejected': 8,
+}
+
+
+def random_phone():
+    return f"+233 {random.choice(['20', '24', '26', '27', '54', '55'])} {random.randint(100, 999)} {random.randint(1000, 9999)}"
+
+
+def date_of_birth_for_grade(grade):
+    age = GRADE_AGES.get(grade, 8) + random.randint(0, 1)
+    return timezone.now().date() - timedelta(days=age * 365 + random.randint(30, 330))
+
+
+class ApplicationFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Application
+
+    status = factory.LazyFunction(
+        lambda: random.choices(list(STATUS_WEIGHTS), weights=STATUS_WEIGHTS.values())[0]
+    )
+    grade_applying_for = factory.LazyFunction(
+        lambda: random.choice([choice for choice, _ in Application.GRADE_CHOICES])
+    )
+
+    student_first_name = factory.Faker('first_name')
+    student_last_name = factory.Faker('last_name')
+    student_date_of_birth = factory.LazyAttribute(
+        lambda obj: date_of_birth_for_grade(obj.grade_applying_for)
+    )
+    student_gender = factory.LazyFunction(lambda: random.choice(['M', 'F']))
+    student_place_of_birth = factory.LazyFunction(
+        lambda: random.choice(['Tamale', 'Accra', 'Kumasi', 'Bolgatanga', 'Yendi', 'Savelugu'])
+    )
+    previous_school = factory.LazyFunction(
+        lambda: random.choice(['', 'Gbanyamli Basic School', 'Bright Future Academy', 'Tamale Preparatory'])
+    )
+
+    guardian_first_name = factory.Faker('first_name')
+    guardian_last_name = factory.SelfAttribute('student_last_name')
+    guardian_relationship = factory.LazyFunction(
+        lambda: random.choice([choice for choice, _ in Application.RELATIONSHIP_CHOICES])
+    )
+    guardian_phone = factory.LazyFunction(random_phone)
+    guardian_email = factory.Sequence(lambda n: f'guardian{n}@example.com')
+    guardian_address = factory.LazyFunction(
+        lambda: f'House {random.randint(1, 400)}, Gbanyamli, Tamale'
+    )
+    guardian_occupation = factory.LazyFunction(
+        lambda: random.choice(['Teacher', 'Trader', 'Nurse', 'Farmer', 'Engineer', 'Civil Servant'])
+    )
+
+    emergency_contact_name = factory.LazyAttribute(
+        lambda obj: f'{obj.guardian_first_name} {obj.student_last_name}'
+    )
+    emergency_contact_phone = factory.LazyFunction(random_phone)
+    emergency_contact_relationship = factory.LazyFunction(
+        lambda: random.choice(['aunt', 'uncle', 'grandparent', 'neighbour'])
+    )
+
+
+def seed_applications(count, days=365, batch_size=1000, academic_year=None):
+    """
+    Bulk insert ``count`` synthetic applications with creation dates spread
+    over the last ``days`` days. Reference numbers continue each year's
+    existing sequence, so ``generate_reference_number`` stays consistent.
+    Rows belong to ``academic_year`` (default: the current one).
+    """
+    now = timezone.now()
+    created_dates = sorted(
+        now - timedelta(days=random.randint(0, days), seconds=random.randint(0, 86399))
+        for _ in range(count)
+    )
+    applications = ApplicationFactory.build_batch(
+        count, academic_year=academic_year or settings.ACADEMIC_YEAR
+    )
+
+    sequences = {}
+    for application, created_at in zip(applications, created_dates):
+        year = created_at.year
+        if year not in sequences:
+            sequences[year] = (
+                Application.all_years.filter(created_at__year=year).count()
+                + ApplicationArchive.objects.filter(created_at__year=year).count()
+            )
+        sequences[year] += 1
+        application.reference_number = f"MSA{year}{sequences[year]:03d}"
+        application.update_fingerprints()
+
+    with transaction.atomic():
+        created = Application.all_years.bulk_create(applications, batch_size=batch_size)
+        # bulk_create applies auto_now_add, so restore the spread dates
+        for application, created_at in zip(created, created_dates):
+            application.created_at = created_at
+            application.updated_at = created_at
+        Application.all_years.bulk_update(
+            created, ['created_at', 'updated_at'], batch_size=batch_size
+        )
+    return created
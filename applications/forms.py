@@ -3,8 +3,9 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.utils.html import strip_tags
 from datetime import date, timedelta
-import re
 from .models import Application
+from .validators import FIELD_VALIDATORS
+from .duplicates import compute_fingerprints, find_duplicates
 
 
 class ApplicationForm(forms.ModelForm):
@@ -138,17 +139,11 @@ class ApplicationForm(forms.ModelForm):
             }),
         }
     
-    def clean_student_first_name(self):
-        value = self.cleaned_data['student_first_name']
-        if not re.match(r'^[A-Za-z\s\-\']+$', value):
-            raise ValidationError("Name should only contain letters, spaces, hyphens, and apostrophes.")
-        return value
-    
-    def clean_student_last_name(self):
-        value = self.cleaned_data['student_last_name']
-        if not re.match(r'^[A-Za-z\s\-\']+$', value):
-            raise ValidationError("Name should only contain letters, spaces, hyphens, and apostrophes.")
-        return value
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Name and phone rules come from the shared table in validators.py
+        for field_name, validator in FIELD_VALIDATORS.items():
+            self.fields[field_name].validators.append(validator)
     
     def clean_student_date_of_birth(self):
         dob = self.cleaned_data['student_date_of_birth']
@@ -170,54 +165,6 @@ class ApplicationForm(forms.ModelForm):
             
         return dob
     
-    def clean_guardian_first_name(self):
-        value = self.cleaned_data['guardian_first_name']
-        if not re.match(r'^[A-Za-z\s\-\']+$', value):
-            raise ValidationError("Name should only contain letters, spaces, hyphens, and apostrophes.")
-        return value
-    
-    def clean_guardian_last_name(self):
-        value = self.cleaned_data['guardian_last_name']
-        if not re.match(r'^[A-Za-z\s\-\']+$', value):
-            raise ValidationError("Name should only contain letters, spaces, hyphens, and apostrophes.")
-        return value
-    
-    def clean_guardian_phone(self):
-        phone = self.cleaned_data['guardian_phone']
-        # Remove any spaces, dashes, or parentheses
-        phone_digits = re.sub(r'[\s\-\(\)]', '', phone)
-        
-        # Check if the phone number has a reasonable length
-        if len(phone_digits) < 10 or len(phone_digits) > 15:
-            raise ValidationError("Please enter a valid phone number with at least 10 digits.")
-            
-        # Check if the phone number contains only digits and possibly a leading +
-        if not re.match(r'^\+?\d+$', phone_digits):
-            raise ValidationError("Phone number should only contain digits and possibly a leading + symbol.")
-            
-        return phone
-    
-    def clean_emergency_contact_phone(self):
-        phone = self.cleaned_data['emergency_contact_phone']
-        # Remove any spaces, dashes, or parentheses
-        phone_digits = re.sub(r'[\s\-\(\)]', '', phone)
-        
-        # Check if the phone number has a reasonable length
-        if len(phone_digits) < 10 or len(phone_digits) > 15:
-            raise ValidationError("Please enter a valid phone number with at least 10 digits.")
-            
-        # Check if the phone number contains only digits and possibly a leading +
-        if not re.match(r'^\+?\d+$', phone_digits):
-            raise ValidationError("Phone number should only contain digits and possibly a leading + symbol.")
-            
-        return phone
-    
-    def clean_emergency_contact_name(self):
-        value = self.cleaned_data['emergency_contact_name']
-        if not re.match(r'^[A-Za-z\s\-\']+$', value):
-            raise ValidationError("Name should only contain letters, spaces, hyphens, and apostrophes.")
-        return value
-    
     def clean_medical_conditions(self):
         value = self.cleaned_data['medical_conditions']
         # Strip HTML tags for security
@@ -244,7 +191,40 @@ class ApplicationForm(forms.ModelForm):
             self.add_error('emergency_contact_phone', 
                           "Emergency contact should be different from guardian.")
         
+        self.check_duplicate(cleaned_data)
+        
         return cleaned_data
+    
+    def check_duplicate(self, cleaned_data):
+        """Reject a repeat submission for a child who already has an active application"""
+        detail_fields = [
+            'student_first_name', 'student_last_name', 'student_date_of_birth',
+            'guardian_phone', 'guardian_email',
+        ]
+        if any(not cleaned_data.get(field) for field in detail_fields):
+            return
+        
+        phone_fingerprint, email_fingerprint = compute_fingerprints(
+            *(cleaned_data[field] for field in detail_fields)
+        )
+        if find_duplicates(phone_fingerprint, email_fingerprint, exclude_pk=self.instance.pk).exists():
+            raise ValidationError(
+                "An application for this student has already been submitted. "
+                "Please check your email for the reference number or contact the school."
+            )
+    
+    def save(self, commit=True):
+        # An instance saved later (commit=False) may be edited first, so it is
+        # validated in full
+        if not commit:
+            return super().save(commit=False)
+        # Fields validated here (including the model's own checks in
+        # _post_clean) need not be validated again by Application.save()
+        self.instance.certified_fields = frozenset(self._meta.fields)
+        try:
+            return super().save()
+        finally:
+            self.instance.certified_fields = frozenset()
 
 
 class ApplicationDownloadForm(forms.Form):
@@ -263,7 +243,7 @@ class ApplicationDownloadForm(forms.Form):
         
         # Check if application with this reference number exists
         try:
-            Application.objects.get(reference_number=reference_number)
+            Application.all_years.get(reference_number=reference_number)
         except Application.DoesNotExist:
             raise ValidationError("No application found with this reference number.")
             
@@ -0,0 +1,111 @@
+"""
+Daily application intake caps
+
+``MAX_APPLICATIONS_PER_DAY`` caps all submissions for a day and
+``MAX_APPLICATIONS_PER_DAY_BY_GRADE`` optionally caps single grades (0 means
+no cap). Each submission claims a slot with one conditional
+``UPDATE ... SET count = count + 1 WHERE count < cap`` on a ``DailyIntake``
+row, inside the submission transaction, so a failed insert gives its slot
+back and no request ever counts the applications table. ``reconcile``
+rewrites the counters from the real table and is run by the
+``reconcile_intake`` command.
+"""
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Application, DailyIntake
+
+logger = logging.getLogger(__name__)
+
+TOTAL = ''
+
+
+class IntakeClosed(Exception):
+    def __init__(self, grade=TOTAL):
+        self.grade = grade
+        super().__init__(grade or 'all grades')
+
+
+def get_caps():
+    """``{counter: cap}`` for every capped counter; TOTAL is the overall cap"""
+    caps = {TOTAL: settings.MAX_APPLICATIONS_PER_DAY}
+    caps.update(getattr(settings, 'MAX_APPLICATIONS_PER_DAY_BY_GRADE', {}))
+    return {grade: cap for grade, cap in caps.items() if cap > 0}
+
+
+def intake_status(day=None):
+    """
+    ``(closed, full_grades)`` for ``day``: whether the overall cap is reached
+    and which capped grades are full. One query, used to render the form; a
+    failed read (e.g. a locked SQLite table) reports intake as open.
+    """
+    caps = get_caps()
+    if not caps:
+        return False, set()
+    try:
+        counts = dict(
+            DailyIntake.objects.filter(date=day or timezone.localdate(), grade__in=caps)
+            .values_list('grade', 'count')
+        )
+    except DatabaseError as e:
+        # The form can still be shown: claim_slot enforces the caps on submit
+        logger.warning(f'Could not read the daily intake counters: {e}')
+        return False, set()
+    full = {grade for grade, cap in caps.items() if counts.get(grade, 0) >= cap}
+    return TOTAL in full, full - {TOTAL}
+
+
+def claim_slot(grade, day=None):
+    """
+    Take one of today's slots overall and for ``grade``, or raise
+    ``IntakeClosed``. Must run inside the transaction that saves the
+    application.
+    """
+    day = day or timezone.localdate()
+    caps = get_caps()
+    for counter in (TOTAL, grade):
+        if counter in caps and not _increment(day, counter, caps[counter]):
+            raise IntakeClosed(counter)
+
+
+def _increment(day, counter, cap):
+    claimed = DailyIntake.objects.filter(date=day, grade=counter, count__lt=cap).update(count=F('count') + 1)
+    if claimed:
+        return True
+    # First submission of the day for this counter, or the cap is reached
+    DailyIntake.objects.bulk_create([DailyIntake(date=day, grade=counter)], ignore_conflicts=True)
+    return bool(
+        DailyIntake.objects.filter(date=day, grade=counter, count__lt=cap).update(count=F('count') + 1)
+    )
+
+
+def reconcile(day=None):
+    """
+    Set ``day``'s counters to the number of applications actually stored.
+    Returns ``{counter: (old, new)}`` for the counters that changed.
+    """
+    day = day or timezone.localdate()
+    actual = dict(
+        Application.all_years.filter(created_at__date=day)
+        .values_list('grade_applying_for')
+        .annotate(total=Count('pk'))
+        .order_by()
+    )
+    actual[TOTAL] = sum(actual.values())
+
+    changes = {}
+    with transaction.atomic():
+        counters = {intake.grade: intake for intake in DailyIntake.objects.select_for_update().filter(date=day)}
+        for counter in set(get_caps()) | set(counters):
+            intake = counters.get(counter) or DailyIntake(date=day, grade=counter)
+            count = actual.get(counter, 0)
+            if intake.count != count:
+                changes[counter] = (intake.count, count)
+            if intake.pk is None or intake.count != count:
+                intake.count = count
+                intake.save()
+    return changes
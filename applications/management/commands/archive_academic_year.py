@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from applications.documents import delete_document_files
+from applications.models import Application, ApplicationArchive, ApplicationDocument
+
+
+class Command(BaseCommand):
+    help = (
+        'Move a closed academic year\'s applications into the compressed archive table. '
+        'Document metadata is archived with them and the document files are deleted.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('academic_year', help='Academic year to archive, e.g. 2023/2024')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Applications moved per transaction (default: 500)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be archived without changing anything',
+        )
+        parser.add_argument(
+            '--restore',
+            action='store_true',
+            help='Move the year back from the archive into the applications table',
+        )
+
+    def handle(self, *args, **options):
+        academic_year = options['academic_year']
+        if academic_year == settings.ACADEMIC_YEAR and not options['restore']:
+            raise CommandError(f'{academic_year} is the current academic year and cannot be archived')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        if options['restore']:
+            source = ApplicationArchive.objects.filter(academic_year=academic_year)
+            move = self.restore_batch
+        else:
+            source = Application.all_years.filter(academic_year=academic_year).prefetch_related('documents')
+            move = self.archive_batch
+
+        total = source.count()
+        if options['dry_run']:
+            action = 'restore' if options['restore'] else 'archive'
+            self.stdout.write(f'Would {action} {total} applications from {academic_year}')
+            if not options['restore']:
+                documents = ApplicationDocument.objects.filter(application__academic_year=academic_year).count()
+                self.stdout.write(f'Would delete the files of {documents} documents')
+            return
+
+        moved = 0
+        while True:
+            with transaction.atomic():
+                batch = list(source.order_by('pk')[:options['batch_size']])
+                if not batch:
+                    break
+                move(batch)
+            moved += len(batch)
+            self.stdout.write(f'  {moved}/{total}')
+
+        verb = 'Restored' if options['restore'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(f'✅ {verb} {moved} applications from {academic_year}'))
+
+    def archive_batch(self, applications):
+        ApplicationArchive.objects.bulk_create(
+            [ApplicationArchive.from_application(application) for application in applications]
+        )
+        documents = [document for application in applications for document in application.documents.all()]
+        # Deleting the applications cascades to their documents; the files go once that has committed
+        Application.all_years.filter(pk__in=[application.pk for application in applications]).delete()
+        transaction.on_commit(lambda: delete_document_files(documents))
+
+    def restore_batch(self, archives):
+        applications = [archive.to_application() for archive in archives]
+        timestamps = [(application.created_at, application.updated_at) for application in applications]
+        Application.all_years.bulk_create(applications)
+        # bulk_create applies auto_now/auto_now_add, so put the originals back
+        for application, (created_at, updated_at) in zip(applications, timestamps):
+            application.created_at, application.updated_at = created_at, updated_at
+        Application.all_years.bulk_update(applications, ['created_at', 'updated_at'])
+        ApplicationDocument.objects.bulk_create([
+            document
+            for archive, application in zip(archives, applications)
+            for document in archive.to_documents(application)
+        ])
+        ApplicationArchive.objects.filter(pk__in=[archive.pk for archive in archives]).delete()
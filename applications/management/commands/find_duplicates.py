@@ -0,0 +1,64 @@
+import json
+
+from django.core.management.base import BaseCommand
+from applications.duplicates import cluster_near_duplicates
+from applications.models import Application
+
+
+class Command(BaseCommand):
+    help = 'Cluster existing near-duplicate applications for staff review'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--status',
+            nargs='+',
+            choices=[choice for choice, _ in Application.STATUS_CHOICES],
+            help='Only consider applications with these statuses',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print clusters as JSON',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Application.objects.all()
+        if options['status']:
+            queryset = queryset.filter(status__in=options['status'])
+
+        clusters = cluster_near_duplicates(queryset)
+
+        details = Application.objects.in_bulk(
+            [pk for cluster in clusters for pk in cluster]
+        )
+        report = [
+            [
+                {
+                    'id': pk,
+                    'reference_number': details[pk].reference_number,
+                    'student': details[pk].student_full_name,
+                    'date_of_birth': details[pk].student_date_of_birth.isoformat(),
+                    'guardian_email': details[pk].guardian_email,
+                    'status': details[pk].status,
+                }
+                for pk in cluster
+            ]
+            for cluster in clusters
+        ]
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        if not report:
+            self.stdout.write(self.style.SUCCESS('✅ No near-duplicate applications found'))
+            return
+
+        self.stdout.write(self.style.WARNING(f'⚠️  {len(report)} clusters of possible duplicates'))
+        for number, cluster in enumerate(report, start=1):
+            self.stdout.write(f'\nCluster {number}:')
+            for entry in cluster:
+                self.stdout.write(
+                    f"  {entry['reference_number']}  {entry['student']}  "
+                    f"{entry['date_of_birth']}  {entry['guardian_email']}  [{entry['status']}]"
+                )
@@ -0,0 +1,80 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from applications.documents import expire_uploads, process_document
+from applications.models import ApplicationDocument
+
+# How long a claimed document stays hidden from other workers if this one dies
+CLAIM_MINUTES = 10
+
+
+class Command(BaseCommand):
+    help = 'Checksum, validate and thumbnail uploaded documents (run from cron, or with --loop as a worker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20,
+            help='Documents claimed at a time (default: 20)',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, polling for new uploads',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds between polls when idle with --loop (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        expired = expire_uploads()
+        if expired:
+            self.stdout.write(f'Removed {expired} abandoned uploads')
+
+        ready = failed = 0
+        start = time.perf_counter()
+        while True:
+            batch = self.claim(options['batch_size'])
+            for document in batch:
+                if process_document(document):
+                    ready += 1
+                else:
+                    failed += 1
+            if batch:
+                self.stdout.write(f'  batch of {len(batch)}: {ready} ready, {failed} failed so far')
+            elif options['loop']:
+                time.sleep(options['interval'])
+            else:
+                break
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Processed {ready + failed} documents ({failed} failed) in {time.perf_counter() - start:.1f}s'
+        ))
+
+    def claim(self, size):
+        """Take the next pending documents and hide them from concurrent workers"""
+        now = timezone.now()
+        with transaction.atomic():
+            # Served by the partial document_pending_idx index
+            batch = list(
+                ApplicationDocument.objects.select_for_update()
+                .filter(Q(status='pending') | Q(status='processing', claimed_until__lt=now))
+                .order_by('uploaded_at')[:size]
+            )
+            if batch:
+                ApplicationDocument.objects.filter(pk__in=[d.pk for d in batch]).update(
+                    status='processing', claimed_until=now + timedelta(minutes=CLAIM_MINUTES),
+                )
+        return batch
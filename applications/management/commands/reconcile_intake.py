@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from applications.intake import reconcile
+
+
+class Command(BaseCommand):
+    help = 'Correct the daily intake counters from the applications actually stored'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=1,
+            help='Reconcile today and the previous days, this many in total (default: 1)',
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+
+        today = timezone.localdate()
+        for offset in range(options['days']):
+            day = today - timedelta(days=offset)
+            changes = reconcile(day)
+            for counter, (old, new) in sorted(changes.items()):
+                self.stdout.write(f'{day} {counter or "all grades"}: {old} → {new}')
+
+        self.stdout.write(self.style.SUCCESS('✅ Daily intake counters reconciled'))
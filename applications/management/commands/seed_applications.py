@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from applications.factories import seed_applications
+
+
+class Command(BaseCommand):
+    help = 'Bulk insert synthetic applications across grades, statuses and dates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, help='Number of applications to create')
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='Spread creation dates over this many past days (default: 365)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per INSERT statement (default: 1000)',
+        )
+        parser.add_argument(
+            '--academic-year',
+            help='Academic year the rows belong to, e.g. 2023/2024 (default: ACADEMIC_YEAR)',
+        )
+
+    def handle(self, *args, **options):
+        if options['count'] < 1:
+            raise CommandError('count must be at least 1')
+
+        created = seed_applications(
+            options['count'],
+            days=options['days'],
+            batch_size=options['batch_size'],
+            academic_year=options['academic_year'],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Created {len(created)} synthetic applications')
+        )
@@ -0,0 +1,157 @@
+import fcntl
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from applications.models import Application
+from core import email_log
+from core.email_service import EmailService
+
+# How long a claimed batch stays hidden from other runs if this one dies mid-send
+CLAIM_MINUTES = 30
+
+
+class Command(BaseCommand):
+    help = 'Send email verification reminders that are due (safe to run from cron every few minutes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Reminders sent per SMTP connection (default: 50)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=0,
+            help='Stop after this many reminders (default: all that are due)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many reminders are due',
+        )
+        parser.add_argument(
+            '--lock-file',
+            default=os.path.join(tempfile.gettempdir(), 'morning_star_send_reminders.lock'),
+            help='Lock file that stops overlapping runs on this host',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        if options['dry_run']:
+            self.stdout.write(f'{self.due().count()} reminders due')
+            return
+
+        with open(options['lock_file'], 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self.stdout.write('Another send_reminders run is in progress, skipping')
+                return
+            try:
+                sent, failed, elapsed = self.sweep(options['batch_size'], options['limit'])
+            finally:
+                email_log.flush()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Sent {sent} reminders ({failed} failed) in {elapsed:.1f}s'
+        ))
+
+    def due(self):
+        # Served by the partial application_reminder_due_idx index
+        return Application.all_years.filter(
+            next_reminder_at__lte=timezone.now(),
+            status='pending',
+            email_verified_at__isnull=True,
+        )
+
+    def sweep(self, batch_size, limit):
+        sent = failed = 0
+        start = time.perf_counter()
+        while not limit or sent + failed < limit:
+            size = min(batch_size, limit - sent - failed) if limit else batch_size
+            batch = self.claim(size)
+            if not batch:
+                break
+
+            results = self.send_batch(batch)
+
+            self.schedule_next(batch, results)
+            sent += sum(results.values())
+            failed += len(batch) - sum(results.values())
+            self.stdout.write(f'  batch of {len(batch)}: {sent} sent, {failed} failed so far')
+        return sent, failed, time.perf_counter() - start
+
+    def send_batch(self, batch):
+        """
+        Send one batch over a single connection; returns ``{pk: sent}``.
+        Backends that queue messages (core.email_backends) report each
+        outcome when the connection is flushed or closed.
+        """
+        results = {}
+
+        def reporter(application):
+            def on_delivery(ok):
+                results[application.pk] = ok
+            return on_delivery
+
+        connection = get_connection()
+        connection.open()
+        try:
+            for application in batch:
+                ok = EmailService.send_reminder_email(
+                    application, connection=connection, on_delivery=reporter(application)
+                )
+                results.setdefault(application.pk, ok)
+        finally:
+            try:
+                connection.close()
+            except Exception as e:
+                self.stderr.write(f'Closing the email connection failed: {e}')
+        return results
+
+    def claim(self, size):
+        """Take the next due batch and hide it from concurrent runs"""
+        with transaction.atomic():
+            batch = list(
+                self.due().select_for_update().order_by('next_reminder_at')[:size]
+            )
+            if batch:
+                Application.all_years.filter(pk__in=[a.pk for a in batch]).update(
+                    next_reminder_at=timezone.now() + timedelta(minutes=CLAIM_MINUTES)
+                )
+        return batch
+
+    def schedule_next(self, batch, results):
+        """
+        Schedule each application's next reminder. A failed send is retried
+        with exponential backoff; after REMINDER_MAX_FAILURES failures in a
+        row it is given up and counts as one of REMINDER_MAX_COUNT.
+        """
+        now = timezone.now()
+        for application in batch:
+            if not results[application.pk]:
+                application.reminder_failures += 1
+                if application.reminder_failures < settings.REMINDER_MAX_FAILURES:
+                    application.next_reminder_at = now + timedelta(
+                        minutes=settings.REMINDER_RETRY_MINUTES * 2 ** (application.reminder_failures - 1)
+                    )
+                    continue
+            application.reminders_sent += 1
+            application.reminder_failures = 0
+            application.next_reminder_at = (
+                now + timedelta(hours=settings.REMINDER_INTERVAL_HOURS)
+                if application.reminders_sent < settings.REMINDER_MAX_COUNT else None
+            )
+        Application.all_years.bulk_update(batch, ['reminders_sent', 'reminder_failures', 'next_reminder_at'])
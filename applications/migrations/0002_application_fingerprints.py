@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:06
+
+from django.db import migrations, models
+
+
+def backfill_fingerprints(apps, schema_editor):
+    from applications.duplicates import compute_fingerprints
+
+    Application = apps.get_model('applications', 'Application')
+    batch = []
+    for application in Application.objects.all().iterator(chunk_size=1000):
+        application.phone_fingerprint, application.email_fingerprint = compute_fingerprints(
+            application.student_first_name,
+            application.student_last_name,
+            application.student_date_of_birth,
+            application.guardian_phone,
+            application.guardian_email,
+        )
+        batch.append(application)
+        if len(batch) >= 1000:
+            Application.objects.bulk_update(batch, ['phone_fingerprint', 'email_fingerprint'])
+            batch = []
+    if batch:
+        Application.objects.bulk_update(batch, ['phone_fingerprint', 'email_fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='email_fingerprint',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='phone_fingerprint',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:13
+
+import applications.models
+import django.db.models.manager
+from django.db import migrations, models
+
+
+def backfill_academic_year(apps, schema_editor):
+    from django.conf import settings
+    from applications.models import academic_year_for_date
+
+    Application = apps.get_model('applications', 'Application')
+    batch = []
+    for application in Application.all_years.only('pk', 'created_at').iterator(chunk_size=1000):
+        # Nothing can belong to a year later than the configured current one
+        application.academic_year = min(academic_year_for_date(application.created_at), settings.ACADEMIC_YEAR)
+        batch.append(application)
+        if len(batch) >= 1000:
+            Application.all_years.bulk_update(batch, ['academic_year'])
+            batch = []
+    if batch:
+        Application.all_years.bulk_update(batch, ['academic_year'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_application_fingerprints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationArchive',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('academic_year', models.CharField(max_length=9)),
+                ('reference_number', models.CharField(max_length=20, unique=True)),
+                ('student_name', models.CharField(max_length=201)),
+                ('guardian_name', models.CharField(max_length=201)),
+                ('guardian_email', models.EmailField(max_length=254)),
+                ('grade_applying_for', models.CharField(max_length=50)),
+                ('status', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('payload', models.BinaryField()),
+            ],
+            options={
+                'verbose_name': 'Archived Application',
+                'verbose_name_plural': 'Archived Applications',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='application',
+            options={
+                'default_manager_name': 'all_years',
+                'ordering': ['-created_at'],
+                'verbose_name': 'Application',
+                'verbose_name_plural': 'Applications',
+            },
+        ),
+        migrations.AlterModelManagers(
+            name='application',
+            managers=[
+                ('all_years', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='academic_year',
+            field=models.CharField(
+                default=applications.models.current_academic_year,
+                editable=False,
+                max_length=9,
+            ),
+        ),
+        migrations.RunPython(backfill_academic_year, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(
+                fields=['academic_year', 'status'], name='application_year_status_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(
+                fields=['academic_year', 'grade_applying_for'],
+                name='application_year_grade_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(
+                fields=['academic_year', '-created_at'],
+                name='application_year_created_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='applicationarchive',
+            index=models.Index(
+                fields=['academic_year', 'student_name'],
+                name='archive_year_student_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='applicationarchive',
+            index=models.Index(
+                fields=['academic_year', 'guardian_email'],
+                name='archive_year_email_idx',
+            ),
+        ),
+    ]
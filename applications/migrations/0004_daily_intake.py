@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_academic_year_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyIntake',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('date', models.DateField()),
+                ('grade', models.CharField(blank=True, max_length=50)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Daily Intake',
+                'verbose_name_plural': 'Daily Intake',
+                'constraints': [
+                    models.UniqueConstraint(
+                        fields=('date', 'grade'), name='unique_daily_intake'
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:16
+
+import applications.models
+from django.db import migrations, models
+
+
+def backfill_waitlisted_at(apps, schema_editor):
+    # Best available guess for when existing waitlist entries joined the queue
+    Application = apps.get_model('applications', 'Application')
+    Application.all_years.filter(status='waitlist').update(waitlisted_at=models.F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_daily_intake'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeCapacity',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'academic_year',
+                    models.CharField(
+                        default=applications.models.current_academic_year, max_length=9
+                    ),
+                ),
+                (
+                    'grade',
+                    models.CharField(
+                        choices=[
+                            ('preschool', 'Preschool'),
+                            ('nursery_1', 'Nursery 1'),
+                            ('nursery_2', 'Nursery 2'),
+                            ('kindergarten_1', 'Kindergarten 1'),
+                            ('kindergarten_2', 'Kindergarten 2'),
+                            ('primary_1', 'Primary 1'),
+                            ('primary_2', 'Primary 2'),
+                            ('primary_3', 'Primary 3'),
+                            ('primary_4', 'Primary 4'),
+                            ('primary_5', 'Primary 5'),
+                            ('primary_6', 'Primary 6'),
+                            ('jhs_1', 'JHS 1'),
+                            ('jhs_2', 'JHS 2'),
+                            ('jhs_3', 'JHS 3'),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ('seats', models.PositiveIntegerField()),
+                ('seats_taken', models.PositiveIntegerField(default=0, editable=False)),
+            ],
+            options={
+                'verbose_name': 'Grade Capacity',
+                'verbose_name_plural': 'Grade Capacities',
+                'ordering': ['academic_year', 'grade'],
+            },
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='waitlisted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_waitlisted_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(
+                condition=models.Q(('status', 'waitlist')),
+                fields=['academic_year', 'grade_applying_for', 'waitlisted_at'],
+                name='application_waitlist_idx',
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='gradecapacity',
+            constraint=models.UniqueConstraint(
+                fields=('academic_year', 'grade'), name='unique_grade_capacity'
+            ),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_grade_capacity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailLog',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('email_type', models.CharField(max_length=50)),
+                ('recipient', models.EmailField(max_length=254)),
+                ('subject', models.CharField(max_length=255)),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[('sent', 'Sent'), ('failed', 'Failed')], max_length=10
+                    ),
+                ),
+                ('error', models.TextField(blank=True)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('sent_at', models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    'application',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='email_logs',
+                        to='applications.application',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Email Log',
+                'verbose_name_plural': 'Email Logs',
+                'ordering': ['-sent_at'],
+                'indexes': [
+                    models.Index(
+                        fields=['application', '-sent_at'],
+                        name='emaillog_application_idx',
+                    ),
+                    models.Index(fields=['sent_at', 'status'], name='emaillog_day_idx'),
+                ],
+            },
+        ),
+    ]
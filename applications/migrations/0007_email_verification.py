@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_email_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='email_verified_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='verified_email_hash',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+    ]
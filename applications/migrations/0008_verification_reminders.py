@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0007_email_verification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='next_reminder_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='reminders_sent',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(
+                condition=models.Q(('next_reminder_at__isnull', False)),
+                fields=['next_reminder_at'],
+                name='application_reminder_due_idx',
+            ),
+        ),
+    ]
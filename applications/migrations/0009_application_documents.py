@@ -0,0 +1,113 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:35
+
+import applications.models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0008_verification_reminders'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationDocument',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'upload_id',
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                (
+                    'document_type',
+                    models.CharField(
+                        choices=[
+                            ('birth_certificate', 'Birth Certificate'),
+                            ('report_card', 'Report Card'),
+                            ('photo', 'Passport Photo'),
+                            ('other', 'Other'),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ('original_name', models.CharField(max_length=255)),
+                ('content_type', models.CharField(max_length=100)),
+                (
+                    'size',
+                    models.PositiveIntegerField(help_text='Declared size in bytes'),
+                ),
+                (
+                    'file',
+                    models.FileField(
+                        blank=True, upload_to=applications.models.document_upload_path
+                    ),
+                ),
+                (
+                    'thumbnail',
+                    models.FileField(blank=True, upload_to='documents/thumbnails/'),
+                ),
+                (
+                    'checksum',
+                    models.CharField(
+                        blank=True, help_text='SHA-256 of the file', max_length=64
+                    ),
+                ),
+                ('page_count', models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('uploading', 'Uploading'),
+                            ('pending', 'Waiting for Processing'),
+                            ('processing', 'Processing'),
+                            ('ready', 'Ready'),
+                            ('failed', 'Failed'),
+                        ],
+                        default='uploading',
+                        max_length=20,
+                    ),
+                ),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('uploaded_at', models.DateTimeField(blank=True, null=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('claimed_until', models.DateTimeField(blank=True, null=True)),
+                (
+                    'application',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='documents',
+                        to='applications.application',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Application Document',
+                'verbose_name_plural': 'Application Documents',
+                'ordering': ['created_at'],
+                'indexes': [
+                    models.Index(
+                        fields=['application', 'created_at'],
+                        name='document_application_idx',
+                    ),
+                    models.Index(
+                        condition=models.Q(('status__in', ['pending', 'processing'])),
+                        fields=['uploaded_at'],
+                        name='document_pending_idx',
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('applications', '0009_application_documents'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='reminder_failures',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+def backfill_waitlisted_at(apps, schema_editor):
+    # Waitlisted without a timestamp (admin edits, bulk updates) since 0005
+    Application = apps.get_model('applications', 'Application')
+    Application.all_years.filter(status='waitlist', waitlisted_at__isnull=True).update(
+        waitlisted_at=models.F('updated_at')
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('applications', '0010_reminder_failures'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_waitlisted_at, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,33 @@
 from django.db import models
+from django.conf import settings
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+import json
+import os
 import uuid
+import zlib
+from datetime import timedelta
+from .validators import MODEL_PHONE_RE
+from .duplicates import compute_fingerprints
+
+
+def current_academic_year():
+    return settings.ACADEMIC_YEAR
+
+
+def academic_year_for_date(value):
+    """Academic year (e.g. '2024/2025') that a date falls in"""
+    start_month = getattr(settings, 'ACADEMIC_YEAR_START_MONTH', 9)
+    start_year = value.year if value.month >= start_month else value.year - 1
+    return f"{start_year}/{start_year + 1}"
+
+
+class CurrentYearManager(models.Manager):
+    """Applications in the current admissions cycle (settings.ACADEMIC_YEAR)"""
+    
+    def get_queryset(self):
+        return super().get_queryset().filter(academic_year=settings.ACADEMIC_YEAR)
+
 
 class Application(models.Model):
     STATUS_CHOICES = [
@@ -45,9 +71,19 @@ class Application(models.Model):
     
     # Reference and tracking
     reference_number = models.CharField(max_length=20, unique=True, blank=True)
+    academic_year = models.CharField(max_length=9, default=current_academic_year, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Position in the grade's waitlist queue (see applications.seats)
+    waitlisted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Set by the signed-token verify view (see applications.tokens)
+    email_verified_at = models.DateTimeField(null=True, blank=True, editable=False)
+    verified_email_hash = models.CharField(max_length=16, blank=True, editable=False)
+    # Verification reminders (see the send_reminders command)
+    next_reminder_at = models.DateTimeField(null=True, blank=True, editable=False)
+    reminders_sent = models.PositiveSmallIntegerField(default=0, editable=False)
+    reminder_failures = models.PositiveSmallIntegerField(default=0, editable=False)
     
     # Student Information
     student_first_name = models.CharField(max_length=100, verbose_name="Student's First Name")
@@ -79,10 +115,37 @@ class Application(models.Model):
     special_requirements = models.TextField(blank=True, verbose_name="Special Educational Requirements (if any)")
     additional_notes = models.TextField(blank=True, verbose_name="Additional Notes")
     
+    # Duplicate detection (see applications.duplicates)
+    phone_fingerprint = models.CharField(max_length=40, blank=True, db_index=True, editable=False)
+    email_fingerprint = models.CharField(max_length=40, blank=True, db_index=True, editable=False)
+    
+    objects = CurrentYearManager()
+    all_years = models.Manager()
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Application"
         verbose_name_plural = "Applications"
+        # Admin, related lookups and dumpdata see every year
+        default_manager_name = 'all_years'
+        indexes = [
+            models.Index(fields=['academic_year', 'status'], name='application_year_status_idx'),
+            models.Index(fields=['academic_year', 'grade_applying_for'], name='application_year_grade_idx'),
+            models.Index(fields=['academic_year', '-created_at'], name='application_year_created_idx'),
+            models.Index(
+                fields=['academic_year', 'grade_applying_for', 'waitlisted_at'],
+                condition=models.Q(status='waitlist'),
+                name='application_waitlist_idx',
+            ),
+            models.Index(
+                fields=['next_reminder_at'],
+                condition=models.Q(next_reminder_at__isnull=False),
+                name='application_reminder_due_idx',
+            ),
+        ]
+    
+    # Fields ApplicationForm.save() has just validated; save() skips re-validating them
+    certified_fields = frozenset()
     
     def __str__(self):
         return f"{self.reference_number} - {self.student_first_name} {self.student_last_name}"
@@ -91,8 +154,11 @@ class Application(models.Model):
         """Custom model validation"""
         super().clean()
         
+        certified = self.certified_fields
+        
         # Validate that student is not too old/young for the grade
-        if self.student_date_of_birth and self.grade_applying_for:
+        if (self.student_date_of_birth and self.grade_applying_for
+                and not {'student_date_of_birth', 'grade_applying_for'} <= certified):
             age = self.age_at_application
             if age < 3:
                 raise ValidationError("Student must be at least 3 years old for preschool.")
@@ -100,21 +166,37 @@ class Application(models.Model):
                 raise ValidationError("Student cannot be older than 18 years for basic education.")
         
         # Validate phone number format (basic validation)
-        if self.guardian_phone and not self.guardian_phone.replace('+', '').replace(' ', '').replace('-', '').isdigit():
+        if (self.guardian_phone and 'guardian_phone' not in certified
+                and not MODEL_PHONE_RE.fullmatch(self.guardian_phone)):
             raise ValidationError("Guardian phone number must contain only digits, spaces, hyphens, and plus sign.")
     
     def save(self, *args, **kwargs):
+        exclude = set(self.certified_fields)
         if not self.reference_number:
             self.reference_number = self.generate_reference_number()
-        self.full_clean()  # Run validation before saving
+            # A generated number needs no uniqueness query; the unique index still guards it
+            exclude.add('reference_number')
+        if self._state.adding and self.next_reminder_at is None and not self.email_verified_at:
+            self.next_reminder_at = timezone.now() + timedelta(hours=settings.REMINDER_FIRST_DELAY_HOURS)
+        self.update_fingerprints()
+        self.full_clean(exclude=exclude)  # Run validation before saving
         super().save(*args, **kwargs)
     
+    def update_fingerprints(self):
+        self.phone_fingerprint, self.email_fingerprint = compute_fingerprints(
+            self.student_first_name,
+            self.student_last_name,
+            self.student_date_of_birth,
+            self.guardian_phone,
+            self.guardian_email,
+        )
+    
     def generate_reference_number(self):
         """Generate unique reference number like MSA2024001"""
         year = timezone.now().year
-        # Get the count of applications this year
-        year_applications = Application.objects.filter(
-            created_at__year=year
+        # Count this year's applications, including archived ones, in one query
+        year_applications = Application.all_years.filter(created_at__year=year).values('pk').order_by().union(
+            ApplicationArchive.objects.filter(created_at__year=year).values('pk').order_by(), all=True,
         ).count()
         
         # Generate reference number
@@ -129,6 +211,11 @@ class Application(models.Model):
     def guardian_full_name(self):
         return f"{self.guardian_first_name} {self.guardian_last_name}"
     
+    @property
+    def email_verified(self):
+        from .tokens import email_hash
+        return bool(self.email_verified_at) and self.verified_email_hash == email_hash(self.guardian_email)
+    
     @property
     def status_display(self):
         return dict(self.STATUS_CHOICES)[self.status]
@@ -140,3 +227,249 @@ class Application(models.Model):
         return today.year - self.student_date_of_birth.year - (
             (today.month, today.day) < (self.student_date_of_birth.month, self.student_date_of_birth.day)
         )
+
+
+
+def snapshot(instance, fields):
+    """JSON-ready ``{attname: string}`` of ``instance``, with None kept as null"""
+    return {
+        field.attname: None if field.value_from_object(instance) is None else field.value_to_string(instance)
+        for field in fields
+    }
+
+
+def snapshot_value(field, value):
+    """Python value of a snapshot entry (older snapshots stored None as ``''``)"""
+    if value is None or (value == '' and field.null):
+        return None
+    return field.to_python(value)
+
+
+class ApplicationArchive(models.Model):
+    """
+    Application from a closed academic year, stored as a compressed snapshot.
+    The columns staff search on are kept alongside the payload. Supporting
+    documents are kept as metadata only; their files are deleted on archiving.
+    """
+    academic_year = models.CharField(max_length=9)
+    reference_number = models.CharField(max_length=20, unique=True)
+    student_name = models.CharField(max_length=201)
+    guardian_name = models.CharField(max_length=201)
+    guardian_email = models.EmailField()
+    grade_applying_for = models.CharField(max_length=50)
+    status = models.CharField(max_length=20)
+    created_at = models.DateTimeField(db_index=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    payload = models.BinaryField()
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Archived Application"
+        verbose_name_plural = "Archived Applications"
+        indexes = [
+            models.Index(fields=['academic_year', 'student_name'], name='archive_year_student_idx'),
+            models.Index(fields=['academic_year', 'guardian_email'], name='archive_year_email_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.reference_number} - {self.student_name} ({self.academic_year})"
+    
+    # Same names as Application, for templates listing either
+    @property
+    def student_full_name(self):
+        return self.student_name
+    
+    @property
+    def guardian_full_name(self):
+        return self.guardian_name
+    
+    def get_grade_applying_for_display(self):
+        return dict(Application.GRADE_CHOICES).get(self.grade_applying_for, self.grade_applying_for)
+    
+    def get_status_display(self):
+        return dict(Application.STATUS_CHOICES).get(self.status, self.status)
+    
+    @classmethod
+    def from_application(cls, application):
+        data = snapshot(application, Application._meta.concrete_fields)
+        document_fields = [
+            field for field in ApplicationDocument._meta.concrete_fields
+            if field.attname not in ('id', 'application_id', 'file', 'thumbnail', 'claimed_until')
+        ]
+        data['documents'] = [snapshot(document, document_fields) for document in application.documents.all()]
+        return cls(
+            academic_year=application.academic_year,
+            reference_number=application.reference_number,
+            student_name=application.student_full_name,
+            guardian_name=application.guardian_full_name,
+            guardian_email=application.guardian_email,
+            grade_applying_for=application.grade_applying_for,
+            status=application.status,
+            created_at=application.created_at,
+            payload=zlib.compress(json.dumps(data).encode('utf-8'), 9),
+        )
+    
+    @property
+    def data(self):
+        """Every Application field of the archived snapshot"""
+        return json.loads(zlib.decompress(bytes(self.payload)))
+    
+    def to_application(self):
+        """Unsaved Application rebuilt from the snapshot"""
+        data = self.data
+        return Application(**{
+            field.attname: snapshot_value(field, data[field.attname])
+            for field in Application._meta.concrete_fields
+            if field.attname in data
+        })
+    
+    def to_documents(self, application):
+        """Unsaved ApplicationDocuments for the archived document metadata, without their files"""
+        documents = []
+        for data in self.data.get('documents', []):
+            document = ApplicationDocument(application=application, **{
+                field.attname: snapshot_value(field, data[field.attname])
+                for field in ApplicationDocument._meta.concrete_fields
+                if field.attname in data
+            })
+            document.status = 'failed'
+            document.error = f'The file was deleted when {self.academic_year} was archived'
+            documents.append(document)
+        return documents
+
+
+class GradeCapacity(models.Model):
+    """
+    Seats available in one grade for one academic year. ``seats_taken``
+    counts approved applications and is only changed with this row locked.
+    """
+    academic_year = models.CharField(max_length=9, default=current_academic_year)
+    grade = models.CharField(max_length=50, choices=Application.GRADE_CHOICES)
+    seats = models.PositiveIntegerField()
+    seats_taken = models.PositiveIntegerField(default=0, editable=False)
+    
+    class Meta:
+        ordering = ['academic_year', 'grade']
+        verbose_name = "Grade Capacity"
+        verbose_name_plural = "Grade Capacities"
+        constraints = [
+            models.UniqueConstraint(fields=['academic_year', 'grade'], name='unique_grade_capacity'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_grade_display()} {self.academic_year}: {self.seats_taken}/{self.seats}"
+    
+    @property
+    def seats_available(self):
+        return max(self.seats - self.seats_taken, 0)
+
+
+class DailyIntake(models.Model):
+    """
+    Running count of applications received on one day, overall (blank
+    grade) or for a single grade. Incremented in the submission transaction
+    so caps are enforced without counting the applications table.
+    """
+    date = models.DateField()
+    grade = models.CharField(max_length=50, blank=True)
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = "Daily Intake"
+        verbose_name_plural = "Daily Intake"
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'grade'], name='unique_daily_intake'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.grade or 'all grades'}: {self.count}"
+
+
+class EmailLog(models.Model):
+    """One email sent (or attempted) by core.email_service.EmailService"""
+    STATUS_CHOICES = [
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    application = models.ForeignKey(
+        Application, on_delete=models.SET_NULL, null=True, blank=True, related_name='email_logs'
+    )
+    email_type = models.CharField(max_length=50)
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    error = models.TextField(blank=True)
+    duration_ms = models.PositiveIntegerField(default=0)
+    sent_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-sent_at']
+        verbose_name = "Email Log"
+        verbose_name_plural = "Email Logs"
+        indexes = [
+            models.Index(fields=['application', '-sent_at'], name='emaillog_application_idx'),
+            models.Index(fields=['sent_at', 'status'], name='emaillog_day_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.email_type} to {self.recipient} ({self.status})"
+
+
+def document_upload_path(instance, filename):
+    return f"documents/{instance.created_at:%Y/%m}/{instance.upload_id}{os.path.splitext(filename)[1].lower()}"
+
+
+class ApplicationDocument(models.Model):
+    """
+    A supporting document uploaded in chunks (see applications.documents).
+    ``process_documents`` fills in the checksum, page count and thumbnail.
+    """
+    DOCUMENT_TYPE_CHOICES = [
+        ('birth_certificate', 'Birth Certificate'),
+        ('report_card', 'Report Card'),
+        ('photo', 'Passport Photo'),
+        ('other', 'Other'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('pending', 'Waiting for Processing'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+    
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='documents')
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    document_type = models.CharField(max_length=20, choices=DOCUMENT_TYPE_CHOICES)
+    original_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveIntegerField(help_text="Declared size in bytes")
+    file = models.FileField(upload_to=document_upload_path, blank=True)
+    thumbnail = models.FileField(upload_to='documents/thumbnails/', blank=True)
+    checksum = models.CharField(max_length=64, blank=True, help_text="SHA-256 of the file")
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    uploaded_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    claimed_until = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = "Application Document"
+        verbose_name_plural = "Application Documents"
+        indexes = [
+            models.Index(fields=['application', 'created_at'], name='document_application_idx'),
+            # The worker's queue: only documents still to be processed
+            models.Index(
+                fields=['uploaded_at'],
+                name='document_pending_idx',
+                condition=models.Q(status__in=['pending', 'processing']),
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_document_type_display()} for {self.application.reference_number}"
@@ -0,0 +1,178 @@
+"""
+Grade capacity and seat allocation
+
+Approving an application takes a seat from its grade's ``GradeCapacity``
+row; moving it out of ``approved`` gives the seat back and promotes the
+longest-waiting ``waitlist`` application of the same grade and year, and
+moving an approved application to another grade moves its seat. Every
+change happens with the capacity row locked (``SELECT ... FOR UPDATE``, or
+the ``BEGIN IMMEDIATE`` write lock on SQLite), so concurrent approvals
+cannot oversubscribe a grade. The waitlist queue is read through the
+partial ``application_waitlist_idx`` index ordered by ``waitlisted_at``.
+
+Grades without a ``GradeCapacity`` row are unlimited.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Application, GradeCapacity
+
+logger = logging.getLogger(__name__)
+
+
+class SeatsFull(Exception):
+    def __init__(self, capacity):
+        self.capacity = capacity
+        super().__init__(str(capacity))
+
+
+def change_status(application, new_status):
+    """
+    Move ``application`` to ``new_status``, allocating or releasing a seat.
+
+    Returns ``(old_status, promoted)`` where ``promoted`` lists the waitlisted
+    applications approved into a freed seat. Their status emails are sent
+    once the transaction commits. Raises ``SeatsFull`` if the grade has no
+    seat left for an approval.
+    """
+    with transaction.atomic():
+        capacity = _lock_capacity(application.academic_year, application.grade_applying_for)
+        # Re-read under the lock so two staff members changing the same
+        # application count its seat once
+        current = Application.all_years.select_for_update().get(pk=application.pk)
+        old_status = current.status
+
+        if old_status != 'approved' and new_status == 'approved' and capacity:
+            if capacity.seats_taken >= capacity.seats:
+                raise SeatsFull(capacity)
+            capacity.seats_taken += 1
+        elif old_status == 'approved' and new_status != 'approved' and capacity:
+            capacity.seats_taken = max(capacity.seats_taken - 1, 0)
+
+        application.status = new_status
+        if new_status == 'waitlist' and old_status != 'waitlist':
+            application.waitlisted_at = timezone.now()
+        elif new_status != 'waitlist':
+            application.waitlisted_at = None
+        application.save()
+
+        # The application never refills the seat it just gave up
+        promoted = _promote_waitlisted(capacity, exclude_pk=application.pk) if capacity else []
+        if capacity:
+            capacity.save(update_fields=['seats_taken'])
+
+    return old_status, promoted
+
+
+def change_grade(application, new_grade):
+    """
+    Save ``application`` (with any other edits made to it) in ``new_grade``.
+
+    An approved application takes its seat with it: the new grade must have
+    one free (``SeatsFull`` otherwise) and the old grade's freed seat goes to
+    its waitlist. Returns the promoted applications.
+    """
+    old_grade = Application.all_years.values_list('grade_applying_for', flat=True).get(pk=application.pk)
+    with transaction.atomic():
+        # Both grades are locked in a fixed order so two opposite moves cannot deadlock
+        capacities = {
+            grade: _lock_capacity(application.academic_year, grade)
+            for grade in sorted({old_grade, new_grade})
+        }
+        current = Application.all_years.select_for_update().get(pk=application.pk)
+        if current.grade_applying_for not in capacities:
+            # Moved by someone else before the lock; start again from its grade now
+            return change_grade(application, new_grade)
+        application.grade_applying_for = new_grade
+        if current.status != 'approved' or current.grade_applying_for == new_grade:
+            application.save()
+            return []
+
+        new_capacity = capacities.get(new_grade)
+        if new_capacity:
+            if new_capacity.seats_taken >= new_capacity.seats:
+                raise SeatsFull(new_capacity)
+            new_capacity.seats_taken += 1
+            new_capacity.save(update_fields=['seats_taken'])
+        application.save()
+
+        old_capacity = capacities.get(current.grade_applying_for)
+        promoted = []
+        if old_capacity:
+            old_capacity.seats_taken = max(old_capacity.seats_taken - 1, 0)
+            promoted = _promote_waitlisted(old_capacity)
+            old_capacity.save(update_fields=['seats_taken'])
+
+    return promoted
+
+
+def fill_seats(academic_year, grade):
+    """Promote waitlisted applications into any free seats; returns them"""
+    with transaction.atomic():
+        capacity = _lock_capacity(academic_year, grade)
+        if capacity is None:
+            return []
+        promoted = _promote_waitlisted(capacity)
+        capacity.save(update_fields=['seats_taken'])
+    return promoted
+
+
+def recount_seats(capacity):
+    """Reset ``seats_taken`` from the approved applications actually stored"""
+    with transaction.atomic():
+        capacity = GradeCapacity.objects.select_for_update().get(pk=capacity.pk)
+        capacity.seats_taken = Application.all_years.filter(
+            academic_year=capacity.academic_year,
+            grade_applying_for=capacity.grade,
+            status='approved',
+        ).count()
+        capacity.save(update_fields=['seats_taken'])
+    return capacity
+
+
+def waitlist_queue(academic_year, grade):
+    """
+    Waitlisted applications for a grade, longest-waiting first. One without
+    a ``waitlisted_at`` (set outside change_status) queues behind them.
+    """
+    return Application.all_years.filter(
+        academic_year=academic_year,
+        grade_applying_for=grade,
+        status='waitlist',
+    ).order_by(F('waitlisted_at').asc(nulls_last=True), 'pk')
+
+
+def _lock_capacity(academic_year, grade):
+    return GradeCapacity.objects.select_for_update().filter(academic_year=academic_year, grade=grade).first()
+
+
+def _promote_waitlisted(capacity, exclude_pk=None):
+    free = capacity.seats - capacity.seats_taken
+    if free <= 0:
+        return []
+
+    queue = waitlist_queue(capacity.academic_year, capacity.grade)
+    if exclude_pk is not None:
+        queue = queue.exclude(pk=exclude_pk)
+    promoted = list(queue.select_for_update()[:free])
+    for application in promoted:
+        application.status = 'approved'
+        application.waitlisted_at = None
+        application.save()
+        transaction.on_commit(lambda application=application: _send_promotion_email(application))
+        logger.info(f'Application {application.reference_number} promoted from the waitlist')
+    capacity.seats_taken += len(promoted)
+    return promoted
+
+
+def _send_promotion_email(application):
+    from core.email_service import EmailService
+
+    try:
+        if not EmailService.send_status_update(application, 'waitlist', 'approved'):
+            logger.warning(f'Failed to send promotion email for application {application.reference_number}')
+    except Exception as e:
+        logger.error(f'Error sending promotion email for {application.reference_number}: {e}')
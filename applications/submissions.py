@@ -0,0 +1,67 @@
+"""
+Idempotent application submission
+
+The apply form carries a ``submission_key`` issued when the form is
+rendered. The first POST with a key claims it in the cache; once the
+application is saved the key maps to its reference number for
+``SUBMISSION_KEY_TTL`` seconds. A repeated POST with the same key (a
+double-click, or a browser retrying on a slow connection) is answered with
+the original redirect, without validating, saving or emailing again. A
+repeat that arrives while the first POST is still running waits up to
+``SUBMISSION_WAIT_SECONDS`` for its outcome. A submission that fails
+releases its key, so the corrected form can be sent again.
+
+Keys live in the default cache, so repeats that reach another worker are
+only recognised when that cache is shared (``REDIS_URL``).
+"""
+import re
+import secrets
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_PREFIX = 'applications.submission:'
+IN_PROGRESS = 'in-progress'
+POLL_INTERVAL = 0.1
+
+KEY_RE = re.compile(r'^[A-Za-z0-9_-]{16,64}$')
+
+
+def new_submission_key():
+    return secrets.token_urlsafe(24)
+
+
+def valid_key(key):
+    return bool(key and KEY_RE.match(key))
+
+
+def claim(key):
+    """True when this request is the first to submit ``key``"""
+    return cache.add(CACHE_PREFIX + key, IN_PROGRESS, settings.SUBMISSION_KEY_TTL)
+
+
+def wait_for_outcome(key):
+    """
+    The recorded outcome for ``key``, ``IN_PROGRESS`` if the first
+    submission is still running after ``SUBMISSION_WAIT_SECONDS``, or
+    ``None`` if it was released or has expired.
+    """
+    deadline = time.monotonic() + settings.SUBMISSION_WAIT_SECONDS
+    while True:
+        outcome = cache.get(CACHE_PREFIX + key)
+        if outcome != IN_PROGRESS or time.monotonic() >= deadline:
+            return outcome
+        time.sleep(POLL_INTERVAL)
+
+
+def record(key, application, message):
+    cache.set(
+        CACHE_PREFIX + key,
+        {'pk': application.pk, 'reference_number': application.reference_number, 'message': message},
+        settings.SUBMISSION_KEY_TTL,
+    )
+
+
+def release(key):
+    cache.delete(CACHE_PREFIX + key)
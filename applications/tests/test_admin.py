@@ -0,0 +1,50 @@
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.urls import reverse
+
+from applications.factories import ApplicationFactory
+from applications.models import Application, GradeCapacity
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def admin_client(client, django_user_model):
+    user = django_user_model.objects.create_superuser(username='admin', password='password', email='a@example.com')
+    client.force_login(user)
+    return client
+
+
+def run_action(client, action, applications):
+    return client.post(reverse('admin:applications_application_changelist'), {
+        'action': action,
+        ACTION_CHECKBOX_NAME: [application.pk for application in applications],
+    })
+
+
+def test_status_is_not_editable_in_the_change_form(admin_client):
+    application = ApplicationFactory(status='pending')
+
+    response = admin_client.get(reverse('admin:applications_application_change', args=[application.pk]))
+
+    assert 'status' not in response.context['adminform'].form.fields
+
+
+def test_approve_action_respects_capacity_and_a_freed_seat_goes_to_the_waitlist(admin_client):
+    capacity = GradeCapacity.objects.create(grade='primary_1', seats=1)
+    applications = ApplicationFactory.create_batch(2, status='pending', grade_applying_for='primary_1')
+
+    run_action(admin_client, 'mark_approved', applications)
+
+    capacity.refresh_from_db()
+    assert capacity.seats_taken == 1
+    approved = Application.all_years.get(status='approved')
+    refused = Application.all_years.get(status='pending')
+
+    run_action(admin_client, 'mark_waitlist', [refused])
+    assert Application.all_years.get(pk=refused.pk).waitlisted_at is not None
+    run_action(admin_client, 'mark_rejected', [approved])
+
+    assert Application.all_years.get(pk=refused.pk).status == 'approved'
+    capacity.refresh_from_db()
+    assert capacity.seats_taken == 1
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+from django.core.management import call_command
+
+from applications.documents import ALLOWED_TYPES, complete_upload, partial_path
+from applications.factories import ApplicationFactory
+from applications.models import Application, ApplicationArchive, ApplicationDocument
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+YEAR = '2020/2021'
+
+
+@pytest.fixture
+def document(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    application = ApplicationFactory()
+    Application.all_years.filter(pk=application.pk).update(academic_year=YEAR)
+    document = ApplicationDocument.objects.create(
+        application=application, document_type='report_card', original_name='report.pdf',
+        content_type='application/pdf', size=5, checksum='abc',
+    )
+    os.makedirs(os.path.dirname(partial_path(document)))
+    with open(partial_path(document), 'wb') as handle:
+        handle.write(b'%PDF-')
+    complete_upload(document)
+    assert document.file.name.endswith(ALLOWED_TYPES['application/pdf'])
+    return document
+
+
+def test_archiving_keeps_document_metadata_and_deletes_the_files(document):
+    path = document.file.path
+
+    call_command('archive_academic_year', YEAR, stdout=open(os.devnull, 'w'))
+
+    assert not os.path.exists(path)
+    assert not ApplicationDocument.objects.exists()
+    archived, = ApplicationArchive.objects.get(academic_year=YEAR).data['documents']
+    assert archived['upload_id'] == str(document.upload_id)
+    assert archived['original_name'] == 'report.pdf'
+    assert archived['checksum'] == 'abc'
+
+
+def test_restore_brings_documents_back_without_files(document):
+    call_command('archive_academic_year', YEAR, stdout=open(os.devnull, 'w'))
+    call_command('archive_academic_year', YEAR, '--restore', stdout=open(os.devnull, 'w'))
+
+    restored = ApplicationDocument.objects.get()
+    assert restored.upload_id == document.upload_id
+    assert restored.application.reference_number == document.application.reference_number
+    assert restored.status == 'failed'
+    assert not restored.file
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from django.urls import reverse
+
+from applications.factories import ApplicationFactory
+from applications.tokens import make_upload_token
+from applications.views import SUBMITTED_SESSION_KEY
+
+pytestmark = pytest.mark.django_db
+
+DOCUMENT = {'document_type': 'birth_certificate', 'filename': 'birth.pdf', 'size': 1024, 'content_type': 'application/pdf'}
+
+
+@pytest.fixture
+def application():
+    return ApplicationFactory()
+
+
+def submit_from(client, application):
+    session = client.session
+    session[SUBMITTED_SESSION_KEY] = [application.pk]
+    session.save()
+
+
+def start(client, application):
+    return client.post(
+        reverse('applications:start_document_upload', args=[make_upload_token(application)]),
+        json.dumps(DOCUMENT),
+        content_type='application/json',
+    )
+
+
+def test_success_page_hides_documents_from_other_sessions(client, application):
+    response = client.get(reverse('applications:success', args=[application.reference_number]))
+
+    assert response.status_code == 200
+    assert 'upload_token' not in response.context
+    assert 'documents' not in response.context
+
+
+def test_submitting_session_gets_the_upload_panel(client, application):
+    submit_from(client, application)
+
+    response = client.get(reverse('applications:success', args=[application.reference_number]))
+
+    assert response.context['upload_token']
+    assert response.context['documents'] == []
+
+
+def test_upload_token_is_refused_outside_the_submitting_session(client, application):
+    response = start(client, application)
+
+    assert response.status_code == 403
+    assert not application.documents.exists()
+
+
+def test_submitting_session_can_start_an_upload(client, application):
+    submit_from(client, application)
+
+    response = start(client, application)
+
+    assert response.status_code == 201
+    assert application.documents.count() == 1
@@ -0,0 +1,32 @@
+import pytest
+from django.core.exceptions import ValidationError
+
+from applications.factories import ApplicationFactory
+from applications.forms import ApplicationForm
+from core.benchmarks import application_form_data
+
+pytestmark = pytest.mark.django_db
+
+
+def valid_form():
+    form = ApplicationForm(data=application_form_data(ApplicationFactory.build()))
+    assert form.is_valid(), form.errors
+    return form
+
+
+def test_saved_instance_is_validated_again_after_a_change():
+    application = valid_form().save()
+    assert application.certified_fields == frozenset()
+
+    application.guardian_phone = 'not a phone'
+    with pytest.raises(ValidationError):
+        application.save()
+
+
+def test_uncommitted_instance_is_validated_in_full():
+    application = valid_form().save(commit=False)
+    assert application.certified_fields == frozenset()
+
+    application.guardian_phone = 'not a phone'
+    with pytest.raises(ValidationError):
+        application.save()
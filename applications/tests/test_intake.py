@@ -0,0 +1,42 @@
+import pytest
+from django.db import OperationalError
+from django.urls import reverse
+
+from applications import intake
+from applications.factories import ApplicationFactory
+from applications.models import Application, DailyIntake
+from core.benchmarks import application_form_data
+from core.loadtest import intake_closed
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def capped(settings):
+    settings.MAX_APPLICATIONS_PER_DAY = 2
+    settings.MAX_APPLICATIONS_PER_DAY_BY_GRADE = {}
+    settings.QUERY_BUDGET_MODE = 'raise'
+
+
+def submit(client):
+    return client.post(reverse('applications:apply'), application_form_data(ApplicationFactory.build()))
+
+
+def test_submissions_stop_at_the_cap_within_the_query_budget(client, capped):
+    assert submit(client).status_code == 302
+    assert submit(client).status_code == 302
+
+    response = submit(client)
+
+    assert response.status_code == 200
+    assert intake_closed(response.content.decode())
+    assert Application.objects.count() == 2
+    assert DailyIntake.objects.get(grade=intake.TOTAL).count == 2
+
+
+def test_unreadable_counters_leave_the_form_open(capped, monkeypatch):
+    def locked(*args, **kwargs):
+        raise OperationalError('database table is locked: applications_dailyintake')
+    monkeypatch.setattr(DailyIntake.objects, 'filter', locked)
+
+    assert intake.intake_status() == (False, set())
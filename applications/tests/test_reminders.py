@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from applications.factories import ApplicationFactory
+from applications.management.commands.send_reminders import Command
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def application(settings):
+    settings.REMINDER_RETRY_MINUTES = 30
+    settings.REMINDER_MAX_FAILURES = 3
+    settings.REMINDER_INTERVAL_HOURS = 48
+    settings.REMINDER_MAX_COUNT = 2
+    return ApplicationFactory(status='pending', email_verified_at=None)
+
+
+def attempt(application, ok):
+    before = timezone.now()
+    Command().schedule_next([application], {application.pk: ok})
+    application.refresh_from_db()
+    return application.next_reminder_at and application.next_reminder_at - before
+
+
+def test_failed_reminders_back_off_then_count_toward_the_maximum(application):
+    assert timedelta(minutes=30) <= attempt(application, False) < timedelta(minutes=31)
+    assert timedelta(minutes=60) <= attempt(application, False) < timedelta(minutes=61)
+    assert application.reminders_sent == 0
+
+    assert timedelta(hours=48) <= attempt(application, False) < timedelta(hours=48, minutes=1)
+    assert (application.reminders_sent, application.reminder_failures) == (1, 0)
+
+    for _ in range(3):
+        attempt(application, False)
+    assert application.reminders_sent == 2
+    assert application.next_reminder_at is None
+
+
+def test_a_sent_reminder_clears_earlier_failures(application):
+    attempt(application, False)
+    attempt(application, True)
+
+    assert (application.reminders_sent, application.reminder_failures) == (1, 0)
@@ -0,0 +1,96 @@
+import pytest
+
+from applications.factories import ApplicationFactory
+from applications.models import Application, GradeCapacity
+from applications.seats import SeatsFull, change_grade, change_status, waitlist_queue
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def capacity():
+    return GradeCapacity.objects.create(grade='primary_1', seats=1)
+
+
+def make_application(status, **kwargs):
+    return ApplicationFactory(status=status, grade_applying_for='primary_1', **kwargs)
+
+
+def test_approval_takes_a_seat_and_refuses_when_full(capacity):
+    first = make_application('pending')
+    second = make_application('pending')
+
+    change_status(first, 'approved')
+    with pytest.raises(SeatsFull):
+        change_status(second, 'approved')
+
+    capacity.refresh_from_db()
+    assert capacity.seats_taken == 1
+    assert Application.all_years.get(pk=second.pk).status == 'pending'
+
+
+def test_approved_to_waitlist_with_empty_waitlist_does_not_promote_itself(capacity):
+    application = make_application('pending')
+    change_status(application, 'approved')
+
+    old_status, promoted = change_status(application, 'waitlist')
+
+    assert (old_status, promoted) == ('approved', [])
+    assert Application.all_years.get(pk=application.pk).status == 'waitlist'
+    capacity.refresh_from_db()
+    assert capacity.seats_taken == 0
+
+
+def test_freed_seat_goes_to_the_longest_waiting_application(capacity):
+    approved = make_application('pending')
+    change_status(approved, 'approved')
+    waiting = make_application('pending')
+    change_status(waiting, 'waitlist')
+
+    old_status, promoted = change_status(approved, 'waitlist')
+
+    assert [application.pk for application in promoted] == [waiting.pk]
+    assert Application.all_years.get(pk=waiting.pk).status == 'approved'
+    assert Application.all_years.get(pk=approved.pk).status == 'waitlist'
+    capacity.refresh_from_db()
+    assert capacity.seats_taken == 1
+
+
+def test_grade_change_moves_the_seat_and_fills_the_old_one(capacity):
+    other = GradeCapacity.objects.create(grade='primary_2', seats=1)
+    approved = make_application('pending')
+    change_status(approved, 'approved')
+    waiting = make_application('pending')
+    change_status(waiting, 'waitlist')
+
+    promoted = change_grade(approved, 'primary_2')
+
+    assert [application.pk for application in promoted] == [waiting.pk]
+    capacity.refresh_from_db()
+    other.refresh_from_db()
+    assert (capacity.seats_taken, other.seats_taken) == (1, 1)
+
+
+def test_grade_change_refused_when_the_new_grade_is_full(capacity):
+    GradeCapacity.objects.create(grade='primary_2', seats=0)
+    approved = make_application('pending')
+    change_status(approved, 'approved')
+
+    with pytest.raises(SeatsFull):
+        change_grade(approved, 'primary_2')
+
+    assert Application.all_years.get(pk=approved.pk).grade_applying_for == 'primary_1'
+
+
+def test_waitlisted_without_a_timestamp_queues_last(capacity):
+    approved = make_application('pending')
+    change_status(approved, 'approved')
+    waiting = make_application('pending')
+    change_status(waiting, 'waitlist')
+    untimed = make_application('pending')
+    Application.all_years.filter(pk=untimed.pk).update(status='waitlist')
+
+    assert list(waitlist_queue(capacity.academic_year, 'primary_1')) == [waiting, untimed]
+
+    old_status, promoted = change_status(approved, 'rejected')
+    assert [application.pk for application in promoted] == [waiting.pk]
@@ -0,0 +1,38 @@
+import pytest
+from django.urls import reverse
+
+from applications.factories import ApplicationFactory
+from applications.models import Application
+from applications.tokens import make_verification_token
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def enforce_budgets(settings):
+    settings.QUERY_BUDGET_MODE = 'raise'
+
+
+def verify(client, token):
+    return client.get(reverse('applications:verify_email', args=[token]))
+
+
+def test_second_click_reports_already_verified(client):
+    token = make_verification_token(ApplicationFactory(email_verified_at=None))
+
+    assert verify(client, token).context['result'] == 'verified'
+    response = verify(client, token)
+
+    assert response.status_code == 200
+    assert response.context['result'] == 'already_verified'
+
+
+def test_link_for_a_deleted_application_is_invalid(client):
+    application = ApplicationFactory(email_verified_at=None)
+    token = make_verification_token(application)
+    Application.all_years.filter(pk=application.pk).delete()
+
+    response = verify(client, token)
+
+    assert response.status_code == 404
+    assert response.context['result'] == 'invalid'
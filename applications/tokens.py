@@ -0,0 +1,53 @@
+"""
+Signed email verification tokens
+
+A token is the application ID and a hash of the guardian email, signed and
+timestamped with ``django.core.signing``. Nothing is stored when a token is
+issued, and checking one needs no database read: the verify view writes the
+verification with a single UPDATE, recording the email hash it confirmed so
+a later change of email address is not treated as verified.
+
+Document upload tokens work the same way: the success page signs the
+application ID, and the upload views accept it for
+``DOCUMENT_UPLOAD_MAX_AGE_HOURS``.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core import signing
+
+SALT = 'applications.email-verification'
+UPLOAD_SALT = 'applications.document-upload'
+
+
+def email_hash(email):
+    return hashlib.sha256((email or '').strip().lower().encode('utf-8')).hexdigest()[:16]
+
+
+def make_verification_token(application):
+    return signing.dumps({'a': application.pk, 'e': email_hash(application.guardian_email)}, salt=SALT)
+
+
+def read_verification_token(token):
+    """
+    ``(application_id, email_hash)`` for a valid token. Raises
+    ``signing.SignatureExpired`` or ``signing.BadSignature`` otherwise.
+    """
+    payload = signing.loads(token, salt=SALT, max_age=settings.EMAIL_VERIFICATION_MAX_AGE_HOURS * 3600)
+    try:
+        return int(payload['a']), str(payload['e'])
+    except (KeyError, TypeError, ValueError):
+        raise signing.BadSignature('Malformed verification token')
+
+
+def make_upload_token(application):
+    return signing.dumps({'a': application.pk}, salt=UPLOAD_SALT)
+
+
+def read_upload_token(token):
+    """The application ID for a valid document upload token"""
+    payload = signing.loads(token, salt=UPLOAD_SALT, max_age=settings.DOCUMENT_UPLOAD_MAX_AGE_HOURS * 3600)
+    try:
+        return int(payload['a'])
+    except (KeyError, TypeError, ValueError):
+        raise signing.BadSignature('Malformed upload token')
@@ -11,4 +11,7 @@ urlpatterns = [
     path('success/<str:ref_number>/', views.ApplicationSuccessView.as_view(), name='success'),
     path('download/', views.DownloadApplicationView.as_view(), name='download'),
     path('view/<str:ref_number>/', views.view_application, name='view_application'),
+    path('verify-email/<str:token>/', views.verify_email, name='verify_email'),
+    path('documents/<str:token>/', views.start_document_upload, name='start_document_upload'),
+    path('documents/upload/<uuid:upload_id>/', views.document_upload, name='document_upload'),
 ]
\ No newline at end of file
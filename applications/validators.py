@@ -0,0 +1,72 @@
+"""
+Field validation rules for applications
+
+Patterns are compiled once at import and applied per field from
+``FIELD_VALIDATORS``. ``ApplicationForm`` attaches these rules to its fields,
+and ``validate_rows`` applies the same table to plain dicts so bulk imports
+can be checked without building form instances.
+"""
+import re
+
+from django.core.exceptions import ValidationError
+
+NAME_RE = re.compile(r"^[A-Za-z\s\-']+$")
+PHONE_SEPARATORS_RE = re.compile(r'[\s\-\(\)]')
+PHONE_DIGITS_RE = re.compile(r'^\+?\d+$')
+# Model-level rule: digits with optional spaces, hyphens and plus signs
+MODEL_PHONE_RE = re.compile(r'[+ \-]*\d[\d+ \-]*')
+
+NAME_MESSAGE = "Name should only contain letters, spaces, hyphens, and apostrophes."
+PHONE_LENGTH_MESSAGE = "Please enter a valid phone number with at least 10 digits."
+PHONE_DIGITS_MESSAGE = "Phone number should only contain digits and possibly a leading + symbol."
+
+
+def validate_name(value):
+    if not NAME_RE.match(value):
+        raise ValidationError(NAME_MESSAGE)
+
+
+def validate_phone(value):
+    phone_digits = PHONE_SEPARATORS_RE.sub('', value)
+
+    if len(phone_digits) < 10 or len(phone_digits) > 15:
+        raise ValidationError(PHONE_LENGTH_MESSAGE)
+
+    if not PHONE_DIGITS_RE.match(phone_digits):
+        raise ValidationError(PHONE_DIGITS_MESSAGE)
+
+
+FIELD_VALIDATORS = {
+    'student_first_name': validate_name,
+    'student_last_name': validate_name,
+    'guardian_first_name': validate_name,
+    'guardian_last_name': validate_name,
+    'emergency_contact_name': validate_name,
+    'guardian_phone': validate_phone,
+    'emergency_contact_phone': validate_phone,
+}
+
+
+def validate_row(row):
+    """Apply ``FIELD_VALIDATORS`` to a dict of raw values; return ``{field: [messages]}``"""
+    errors = {}
+    for field, validator in FIELD_VALIDATORS.items():
+        value = row.get(field)
+        if value in (None, ''):
+            errors[field] = ['This field is required.']
+            continue
+        try:
+            validator(str(value))
+        except ValidationError as e:
+            errors[field] = e.messages
+    return errors
+
+
+def validate_rows(rows):
+    """Validate many rows; return ``[(index, errors)]`` for the rows that failed"""
+    failures = []
+    for index, row in enumerate(rows):
+        errors = validate_row(row)
+        if errors:
+            failures.append((index, errors))
+    return failures
@@ -2,27 +2,127 @@ import logging
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import CreateView, TemplateView, FormView
 from django.contrib import messages
+from django.conf import settings
+from django.core import signing
 from django.urls import reverse
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError, DatabaseError
-from django.http import Http404, HttpResponse
-from django.views.decorators.http import require_POST
+from django.db import IntegrityError, DatabaseError, transaction
+import json
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods, require_POST
 from django import forms
-from .models import Application
+from .models import Application, ApplicationDocument
 from .forms import ApplicationForm, ApplicationDownloadForm
+from .documents import UploadError, OffsetMismatch, append_chunk, current_offset, start_upload
+from .intake import IntakeClosed, claim_slot, get_caps, intake_status
+from . import submissions
+from .tokens import make_upload_token, read_upload_token, read_verification_token
 from core.email_service import EmailService
+from core.query_budget import QueryBudgetMixin, query_budget
 
 logger = logging.getLogger(__name__)
 
+# Applications submitted from this browser session; only these can add documents
+SUBMITTED_SESSION_KEY = 'submitted_applications'
 
-class ApplicationCreateView(CreateView):
+
+def remember_submission(request, application_id):
+    submitted = request.session.get(SUBMITTED_SESSION_KEY, [])
+    if application_id not in submitted:
+        request.session[SUBMITTED_SESSION_KEY] = submitted + [application_id]
+
+
+def submitted_in_session(request, application_id):
+    return application_id in request.session.get(SUBMITTED_SESSION_KEY, [])
+
+
+class ApplicationCreateView(QueryBudgetMixin, CreateView):
     model = Application
     form_class = ApplicationForm
     template_name = 'applications/apply.html'
+    # Duplicate check, reference count, insert, email log and session; see dispatch
+    query_budget = 5
+    
+    def dispatch(self, request, *args, **kwargs):
+        # Each capped intake counter claims a slot: one UPDATE, or three when
+        # the day's counter row is created by the first claim
+        self.query_budget = type(self).query_budget + 3 * len(get_caps())
+        self.submission_key = None
+        if request.method == 'POST':
+            repeated = self.claim_submission(request.POST.get('submission_key'))
+            if repeated:
+                return repeated
+        try:
+            self.intake_closed, self.full_grades = intake_status()
+            if self.intake_closed:
+                return self.render_closed()
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # Anything short of a saved application frees the key for a resubmission
+            if self.submission_key:
+                submissions.release(self.submission_key)
+    
+    def claim_submission(self, key):
+        """Claim the form's submission key; returns the response for a repeated POST"""
+        if not submissions.valid_key(key):
+            return None
+        if submissions.claim(key):
+            self.submission_key = key
+            return None
+        
+        outcome = submissions.wait_for_outcome(key)
+        if isinstance(outcome, dict):
+            logger.info(f'Repeated submission answered with application {outcome["reference_number"]}')
+            # The first response, and with it the session cookie, may never have arrived
+            remember_submission(self.request, outcome['pk'])
+            messages.success(self.request, outcome['message'])
+            return redirect('applications:success', ref_number=outcome['reference_number'])
+        if outcome is None and submissions.claim(key):
+            # The first attempt failed and released the key
+            self.submission_key = key
+            return None
+        
+        logger.warning('Repeated submission while the first is still being processed')
+        messages.info(
+            self.request,
+            'Your application is still being submitted. Please check your email for a confirmation '
+            'in a few minutes before submitting again.'
+        )
+        return redirect('applications:apply')
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # A re-rendered form keeps its key; the failed attempt has released it
+        key = self.request.POST.get('submission_key')
+        context['submission_key'] = key if submissions.valid_key(key) else submissions.new_submission_key()
+        return context
+    
+    def render_closed(self):
+        return self.response_class(
+            request=self.request,
+            template=[self.template_name],
+            context={'intake_closed': True, 'max_per_day': settings.MAX_APPLICATIONS_PER_DAY},
+            using=self.template_engine,
+        )
+    
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        if self.full_grades:
+            grade_field = form.fields['grade_applying_for']
+            grade_field.choices = [
+                (value, label) for value, label in grade_field.choices
+                if value not in self.full_grades
+            ]
+        return form
     
     def form_valid(self, form):
         try:
-            application = form.save()
+            # One write transaction (BEGIN IMMEDIATE on SQLite) for the
+            # intake slot, the reference number lookup and the insert
+            with transaction.atomic():
+                claim_slot(form.cleaned_data['grade_applying_for'])
+                application = form.save()
             
             logger.info(
                 f'Application submitted successfully: {application.reference_number} '
@@ -42,13 +142,28 @@ class ApplicationCreateView(CreateView):
                 logger.error(f'Error sending confirmation email for {application.reference_number}: {e}')
                 email_message = ' However, there was an error sending the confirmation email.'
             
-            messages.success(
-                self.request, 
+            success_message = (
                 f'Application submitted successfully! Your reference number is {application.reference_number}.{email_message}'
             )
+            messages.success(self.request, success_message)
+            remember_submission(self.request, application.pk)
+            if self.submission_key:
+                submissions.record(self.submission_key, application, success_message)
+                self.submission_key = None
             
             return redirect('applications:success', ref_number=application.reference_number)
             
+        except IntakeClosed as e:
+            logger.info(f'Daily application limit reached for {e}')
+            if not e.grade:
+                return self.render_closed()
+            form.add_error(
+                'grade_applying_for',
+                'We have received the maximum number of applications for this class today. '
+                'Please apply again tomorrow or choose another class.'
+            )
+            return self.form_invalid(form)
+            
         except ValidationError as e:
             logger.warning(f'Application validation error: {e}')
             messages.error(
@@ -89,8 +204,9 @@ class ApplicationCreateView(CreateView):
         return super().form_invalid(form)
 
 
-class ApplicationSuccessView(TemplateView):
+class ApplicationSuccessView(QueryBudgetMixin, TemplateView):
     template_name = 'applications/success.html'
+    query_budget = 4
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -99,9 +215,16 @@ class ApplicationSuccessView(TemplateView):
         
         if ref_number:
             try:
-                application = get_object_or_404(Application, reference_number=ref_number)
+                application = get_object_or_404(Application.all_years, reference_number=ref_number)
                 context['application'] = application
                 context['reference_number'] = ref_number
+                # Reference numbers are sequential: documents are only shown
+                # to, and uploaded by, the session that submitted the application
+                if submitted_in_session(self.request, application.pk):
+                    context['documents'] = list(application.documents.all())
+                    context['upload_token'] = make_upload_token(application)
+                    context['document_types'] = ApplicationDocument.DOCUMENT_TYPE_CHOICES
+                    context['document_chunk_size'] = settings.DOCUMENT_CHUNK_SIZE
                 
                 logger.info(f'Success page accessed for application: {ref_number}')
                 
@@ -118,23 +241,126 @@ class ApplicationSuccessView(TemplateView):
         return context
 
 
-class DownloadApplicationView(FormView):
+class DownloadApplicationView(QueryBudgetMixin, FormView):
     """View for downloading application forms by reference number."""
     template_name = 'applications/download.html'
     form_class = ApplicationDownloadForm
+    query_budget = 3
     
     def form_valid(self, form):
         reference_number = form.cleaned_data['reference_number']
         return redirect('applications:view_application', ref_number=reference_number)
 
 
+@query_budget(3)
 def view_application(request, ref_number):
     """View application details by reference number."""
     try:
-        application = get_object_or_404(Application, reference_number=ref_number)
+        application = get_object_or_404(Application.all_years, reference_number=ref_number)
         return render(request, 'applications/view_application.html', {'application': application})
         
     except Exception as e:
         logger.error(f"Error viewing application {ref_number}: {str(e)}")
         messages.error(request, "An error occurred while retrieving the application. Please try again later.")
         return redirect('applications:download')
+
+
+@query_budget(3)
+def verify_email(request, token):
+    """Confirm a guardian email address from a signed verification link."""
+    try:
+        application_id, verified_hash = read_verification_token(token)
+    except signing.SignatureExpired:
+        logger.info('Expired email verification link used')
+        return render(request, 'applications/email_verified.html', {'result': 'expired'}, status=400)
+    except signing.BadSignature:
+        logger.warning('Invalid email verification token')
+        return render(request, 'applications/email_verified.html', {'result': 'invalid'}, status=400)
+    
+    # The signature already proves the link; the write is the only query.
+    # A row already verified for this same email address is left untouched.
+    verified = Application.all_years.filter(pk=application_id).exclude(
+        email_verified_at__isnull=False, verified_email_hash=verified_hash,
+    ).update(email_verified_at=timezone.now(), verified_email_hash=verified_hash, next_reminder_at=None)
+    
+    if verified:
+        logger.info(f'Guardian email verified for application {application_id}')
+    elif not Application.all_years.filter(pk=application_id).exists():
+        # A genuine link whose application has since been deleted or archived
+        logger.info(f'Email verification link used for missing application {application_id}')
+        return render(request, 'applications/email_verified.html', {'result': 'invalid'}, status=404)
+    return render(request, 'applications/email_verified.html', {'result': 'verified' if verified else 'already_verified'})
+
+
+
+def upload_headers(response, document):
+    response['Upload-Offset'] = str(current_offset(document))
+    response['Upload-Length'] = str(document.size)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+@query_budget(4)
+@require_POST
+def start_document_upload(request, token):
+    """Start a resumable upload from JSON ``{document_type, filename, size, content_type}``."""
+    try:
+        application_id = read_upload_token(token)
+    except signing.BadSignature:
+        return JsonResponse({'error': 'This upload link has expired. Please reload the page.'}, status=403)
+    if not submitted_in_session(request, application_id):
+        return JsonResponse({'error': 'Documents can only be added from the browser that submitted the application.'}, status=403)
+    application = get_object_or_404(Application.all_years, pk=application_id)
+    
+    try:
+        data = json.loads(request.body)
+        document = start_upload(
+            application,
+            document_type=data.get('document_type'),
+            filename=data.get('filename'),
+            size=data.get('size'),
+            content_type=data.get('content_type'),
+        )
+    except ValueError:
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    except UploadError as e:
+        return JsonResponse({'error': str(e)}, status=e.status)
+    
+    upload_url = reverse('applications:document_upload', args=[document.upload_id])
+    response = JsonResponse({'upload_url': upload_url, 'chunk_size': settings.DOCUMENT_CHUNK_SIZE}, status=201)
+    response['Location'] = upload_url
+    return upload_headers(response, document)
+
+
+@query_budget(3)
+@require_http_methods(['HEAD', 'PATCH'])
+def document_upload(request, upload_id):
+    """
+    ``HEAD`` reports how much of the upload has arrived; ``PATCH`` appends
+    the request body at the ``Upload-Offset`` header's position. The body is
+    streamed to disk, never read into memory.
+    """
+    document = get_object_or_404(ApplicationDocument, upload_id=upload_id)
+    if request.method == 'HEAD':
+        response = HttpResponse(status=200)
+        response['Upload-Status'] = document.status
+        return upload_headers(response, document)
+    
+    try:
+        offset = int(request.headers['Upload-Offset'])
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'Upload-Offset and Content-Length headers are required'}, status=400)
+    if length > settings.DOCUMENT_CHUNK_SIZE:
+        return JsonResponse({'error': 'Chunk too large'}, status=413)
+    
+    try:
+        append_chunk(document, offset, request, length)
+    except OffsetMismatch as e:
+        return upload_headers(JsonResponse({'error': str(e)}, status=e.status), document)
+    except UploadError as e:
+        return JsonResponse({'error': str(e)}, status=e.status)
+    
+    response = HttpResponse(status=204)
+    response['Upload-Status'] = document.status
+    return upload_headers(response, document)
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from . import checks  # noqa: F401
+
+        interval = getattr(settings, 'DB_CONNECTION_METRICS_INTERVAL', 0)
+        if interval:
+            from . import db_metrics
+            db_metrics.install(interval)
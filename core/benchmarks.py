@@ -0,0 +1,173 @@
+"""
+Benchmark suite for the admissions hot paths
+
+Each benchmark is registered with ``@benchmark(name)`` and receives a
+``BenchmarkContext``; it returns the zero-argument callable that is timed.
+Run the suite with ``python manage.py benchmark``.
+"""
+import itertools
+import statistics
+import time
+
+from django.template.loader import render_to_string
+from django.test import Client
+from django.urls import reverse
+
+from .query_budget import count_queries
+
+BENCHMARKS = {}
+
+# The harnesses measure submissions, so they run with the daily intake caps off
+UNCAPPED_INTAKE = {'MAX_APPLICATIONS_PER_DAY': 0, 'MAX_APPLICATIONS_PER_DAY_BY_GRADE': {}}
+
+
+def benchmark(name):
+    """Register a benchmark setup function under ``name``"""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+class BenchmarkContext:
+    """Shared fixtures for benchmarks: clients and a sample application"""
+
+    def __init__(self, staff_user, application):
+        self.staff_user = staff_user
+        self.application = application
+        self.client = Client()
+        self.staff_client = Client()
+        self.staff_client.force_login(staff_user)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_benchmark(name, context, iterations, warmup=3):
+    """Time ``iterations`` calls of a benchmark and count its queries"""
+    func = BENCHMARKS[name](context)
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    queries = []
+    for _ in range(iterations):
+        with count_queries() as counter:
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(counter.count)
+
+    return {
+        'iterations': iterations,
+        'mean_ms': round(statistics.mean(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'min_ms': round(min(timings), 3),
+        'queries': max(queries),
+    }
+
+
+def application_form_data(application):
+    """POST data for ApplicationForm built from an unsaved application"""
+    from applications.forms import ApplicationForm
+
+    data = {field: getattr(application, field) for field in ApplicationForm.Meta.fields}
+    data['student_date_of_birth'] = application.student_date_of_birth.isoformat()
+    return data
+
+
+@benchmark('apply_submit')
+def bench_apply_submit(context):
+    from applications.factories import ApplicationFactory
+
+    url = reverse('applications:apply')
+    sequence = iter(range(10 ** 9))
+
+    def submit():
+        index = next(sequence)
+        data = application_form_data(ApplicationFactory.build())
+        # A fresh client address per submission keeps RateLimitMiddleware out of the way
+        response = context.client.post(
+            url, data, REMOTE_ADDR=f'10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}'
+        )
+        assert response.status_code == 302, f'apply_submit returned {response.status_code}'
+    return submit
+
+
+@benchmark('reference_number')
+def bench_reference_number(context):
+    from applications.models import Application
+
+    application = Application()
+    return application.generate_reference_number
+
+
+@benchmark('dashboard')
+def bench_dashboard(context):
+    url = reverse('administration:dashboard')
+    return lambda: context.staff_client.get(url)
+
+
+@benchmark('application_list_filtered')
+def bench_application_list_filtered(context):
+    url = reverse('administration:application_list')
+    return lambda: context.staff_client.get(url, {'status': 'pending', 'grade': 'primary_1'})
+
+
+@benchmark('application_list_search')
+def bench_application_list_search(context):
+    url = reverse('administration:application_list')
+    search = context.application.student_last_name[:4]
+    return lambda: context.staff_client.get(url, {'search': search})
+
+
+@benchmark('application_detail')
+def bench_application_detail(context):
+    url = reverse('administration:application_detail', args=[context.application.pk])
+    return lambda: context.staff_client.get(url)
+
+
+@benchmark('application_status_update')
+def bench_application_status_update(context):
+    # The POST, then the redirected page that shows its flash message
+    url = reverse('administration:application_detail', args=[context.application.pk])
+    statuses = itertools.cycle(['approved', 'pending'])
+
+    def update():
+        response = context.staff_client.post(url, {'status': next(statuses)}, follow=True)
+        assert response.status_code == 200, f'application_status_update returned {response.status_code}'
+    return update
+
+
+@benchmark('email_confirmation')
+def bench_email_confirmation(context):
+    from .email_service import EmailService
+
+    return lambda: EmailService.send_application_confirmation(context.application)
+
+
+@benchmark('email_status_update')
+def bench_email_status_update(context):
+    from .email_service import EmailService
+
+    return lambda: EmailService.send_status_update(context.application, 'pending', 'approved')
+
+
+@benchmark('application_pdf')
+def bench_application_pdf(context):
+    # There is no PDF view yet: render the PDF template and, when weasyprint
+    # and its system libraries are available, convert it as the view would.
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError):
+        HTML = None
+
+    def render():
+        html = render_to_string('applications/application_pdf.html', {'application': context.application})
+        if HTML is not None:
+            HTML(string=html).write_pdf()
+    return render
@@ -0,0 +1,23 @@
+"""
+System checks for settings that work on one process but not on several
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Duplicate submission keys only reach every worker through a shared cache"""
+    if settings.DEBUG or settings.CACHES['default']['BACKEND'] not in PER_PROCESS_CACHES:
+        return []
+    return [Warning(
+        'The default cache is per process, so a repeated apply POST that reaches another '
+        'worker is not recognised and creates a second application.',
+        hint='Set REDIS_URL when running more than one worker.',
+        id='core.W001',
+    )]
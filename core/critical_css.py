@@ -0,0 +1,205 @@
+"""
+Critical CSS for the main public pages
+
+``build_critical_css`` renders each page in ``PAGES``, keeps the part a
+visitor sees first (the navigation, overlays and the first section of
+``<main>``) and selects the rules of the site stylesheets that match it,
+using the tinycss2/cssselect2 parsers WeasyPrint already depends on. Custom
+properties and ``@property`` rules that nothing kept refers to are dropped.
+The result goes to ``theme/critical/<page>.css``; the ``critical_css``
+template tag inlines it and loads the full stylesheets asynchronously.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+# Stylesheets every page links, in cascade order
+STYLESHEETS = ('css/dist/styles.css', 'css/images.css')
+
+# Pages with inlined critical CSS: name -> (url name, url kwargs)
+PAGES = {
+    'home': ('core:home', {}),
+    'apply': ('applications:apply', {}),
+    'success': ('applications:success', {'ref_number': None}),
+}
+
+# How many children of <main> count as above the fold
+FOLD_SECTIONS = 1
+
+MANIFEST_NAME = 'manifest.json'
+VAR_RE = re.compile(r'var\(\s*(--[\w-]+)')
+
+
+def critical_root():
+    return os.path.join(settings.BASE_DIR, settings.TAILWIND_APP_NAME, 'critical')
+
+
+def critical_path(page):
+    return os.path.join(critical_root(), f'{page}.css')
+
+
+def manifest_path():
+    return os.path.join(critical_root(), MANIFEST_NAME)
+
+
+def load_manifest():
+    try:
+        with open(manifest_path()) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+_stylesheet_paths = {}
+
+
+def find_stylesheet(name):
+    """Path of a static stylesheet, or None; the finders are only asked once per name"""
+    if name not in _stylesheet_paths:
+        _stylesheet_paths[name] = finders.find(name)
+    return _stylesheet_paths[name]
+
+
+def stylesheet_path(name):
+    path = find_stylesheet(name)
+    if not path:
+        raise FileNotFoundError(f'Stylesheet {name} not found by the staticfiles finders')
+    return path
+
+
+def stylesheets_hash():
+    """Hash of the full stylesheets the critical CSS was cut from"""
+    digest = hashlib.sha256()
+    for name in STYLESHEETS:
+        with open(stylesheet_path(name), 'rb') as handle:
+            digest.update(handle.read())
+    return digest.hexdigest()
+
+
+def gzip_size(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return len(gzip.compress(data, compresslevel=9))
+
+
+def above_the_fold(html, sections=FOLD_SECTIONS):
+    """Parse a rendered page and drop everything below the first ``sections`` children of <main>"""
+    import html5lib
+
+    root = html5lib.parse(html, namespaceHTMLElements=False)
+    body = root.find('body')
+    for parent in body.iter():
+        for child in list(parent):
+            if child.tag in ('footer', 'script', 'style'):
+                parent.remove(child)
+    main = body.find('.//main')
+    if main is not None:
+        for child in list(main)[sections:]:
+            main.remove(child)
+    return root
+
+
+def matches(prelude, elements):
+    """Whether a selector list matches any kept element. Unparseable selectors are kept."""
+    import cssselect2
+
+    try:
+        selectors = cssselect2.compile_selector_list(prelude)
+    except cssselect2.SelectorError:
+        return True
+    return any(selector.test(element) for selector in selectors for element in elements)
+
+
+def select_rules(rules, elements):
+    """Serialized rules that apply to ``elements``, recursing into @layer/@media/@supports"""
+    import tinycss2
+
+    kept = []
+    for rule in rules:
+        if rule.type == 'qualified-rule':
+            if matches(rule.prelude, elements):
+                kept.append(tinycss2.serialize([rule]))
+        elif rule.type == 'at-rule':
+            prelude = tinycss2.serialize(rule.prelude).strip()
+            if rule.content is None:
+                # @layer ordering statements, @import, @charset
+                kept.append(f'@{rule.at_keyword} {prelude};')
+            elif rule.at_keyword in ('layer', 'media', 'supports', 'container'):
+                inner = select_rules(
+                    tinycss2.parse_rule_list(rule.content, skip_comments=True, skip_whitespace=True),
+                    elements,
+                )
+                if inner:
+                    kept.append(f'@{rule.at_keyword} {prelude}{{{"".join(inner)}}}')
+            elif rule.at_keyword == 'property':
+                kept.append(tinycss2.serialize([rule]))
+            # @keyframes and @font-face are left to the full stylesheet
+    return kept
+
+
+def prune_custom_properties(css):
+    """Drop custom property declarations and @property rules nothing refers to"""
+    declaration_re = re.compile(r'(?<![\w-])(--[\w-]+)\s*:([^;{}]*)(;|(?=}))')
+    property_re = re.compile(r'@property\s+(--[\w-]+)\s*\{[^}]*\}')
+
+    # Fixed point: a custom property is used if a normal declaration refers to
+    # it, or a used custom property does
+    definitions = {}
+    for name, value, _ in declaration_re.findall(css):
+        definitions.setdefault(name, []).append(value)
+    without_custom = declaration_re.sub('', property_re.sub('', css))
+    used = set(VAR_RE.findall(without_custom))
+    pending = list(used)
+    while pending:
+        for value in definitions.get(pending.pop(), ()):
+            for name in VAR_RE.findall(value):
+                if name not in used:
+                    used.add(name)
+                    pending.append(name)
+
+    css = declaration_re.sub(lambda match: match.group(0) if match.group(1) in used else '', css)
+    css = property_re.sub(lambda match: match.group(0) if match.group(1) in used else '', css)
+    # Rules emptied by the pruning
+    empty_re = re.compile(r'[^{};]+\{\s*\}')
+    while empty_re.search(css):
+        css = empty_re.sub('', css)
+    return css
+
+
+def minify(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def extract(html, sections=FOLD_SECTIONS):
+    """The minified critical CSS for one rendered page"""
+    import cssselect2
+    import tinycss2
+
+    elements = list(cssselect2.ElementWrapper.from_html_root(above_the_fold(html, sections)).iter_subtree())
+    kept = []
+    for name in STYLESHEETS:
+        with open(stylesheet_path(name), encoding='utf-8') as handle:
+            rules = tinycss2.parse_stylesheet(handle.read(), skip_comments=True, skip_whitespace=True)
+        kept.extend(select_rules(rules, elements))
+    return minify(prune_custom_properties(minify(''.join(kept))))
+
+
+def write(results):
+    """Save ``{page: css}`` with a manifest recording the stylesheets they came from"""
+    os.makedirs(critical_root(), exist_ok=True)
+    manifest = {'stylesheets': stylesheets_hash(), 'pages': {}}
+    for page, css in results.items():
+        with open(critical_path(page), 'w', encoding='utf-8') as handle:
+            handle.write(css)
+        manifest['pages'][page] = {'bytes': len(css.encode('utf-8')), 'gzip': gzip_size(css)}
+    with open(manifest_path(), 'w') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    return manifest
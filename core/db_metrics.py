@@ -0,0 +1,101 @@
+"""
+Database connection churn metrics
+
+Counts new database connections (``connection_created``) against finished
+requests and logs the ratio every ``DB_CONNECTION_METRICS_INTERVAL``
+requests, along with the pool statistics when a psycopg 3 pool is in use.
+With a pool, ``connection_created`` fires for every checkout, so those are
+counted as checkouts and the connections opened come from the pool's own
+``connections_num``.
+"""
+import logging
+import threading
+
+from django.core.signals import request_finished
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionChurnMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.interval = 0
+        self.requests = 0
+        self.connections_opened = 0
+        self.pool_checkouts = 0
+        self.pool_connections_before = 0
+
+    def on_connection_created(self, sender, connection, **kwargs):
+        with self.lock:
+            if uses_pool(connection):
+                self.pool_checkouts += 1
+            else:
+                self.connections_opened += 1
+
+    def on_request_finished(self, sender, **kwargs):
+        with self.lock:
+            self.requests += 1
+            due = self.interval and self.requests % self.interval == 0
+        if due:
+            self.log()
+
+    def snapshot(self):
+        pool_stats = get_pool_stats()
+        with self.lock:
+            opened = self.connections_opened
+            if pool_stats:
+                opened += pool_stats.get('connections_num', 0) - self.pool_connections_before
+            snapshot = {
+                'requests': self.requests,
+                'connections_opened': opened,
+                'connections_per_request': round(opened / self.requests, 3) if self.requests else 0,
+            }
+            if pool_stats:
+                snapshot['pool_checkouts'] = self.pool_checkouts
+                snapshot['pool'] = pool_stats
+        return snapshot
+
+    def log(self):
+        snapshot = self.snapshot()
+        message = (
+            f"DB connection churn: {snapshot['connections_opened']} connections opened over "
+            f"{snapshot['requests']} requests ({snapshot['connections_per_request']} per request)"
+        )
+        if 'pool' in snapshot:
+            message += f" - pool: {snapshot['pool']}"
+        logger.info(message)
+
+    def reset(self):
+        pool_stats = get_pool_stats() or {}
+        with self.lock:
+            self.requests = 0
+            self.connections_opened = 0
+            self.pool_checkouts = 0
+            self.pool_connections_before = pool_stats.get('connections_num', 0)
+
+
+metrics = ConnectionChurnMetrics()
+
+
+def uses_pool(connection):
+    return bool(connection.settings_dict.get('OPTIONS', {}).get('pool'))
+
+
+def get_pool_stats(alias='default'):
+    """psycopg_pool statistics for ``alias``, or None without a pool"""
+    connection = connections[alias]
+    if not uses_pool(connection):
+        return None
+    pool = getattr(connection, 'pool', None)
+    if pool is None or not hasattr(pool, 'get_stats'):
+        return None
+    return pool.get_stats()
+
+
+def install(interval):
+    """Start counting connections and log every ``interval`` requests"""
+    metrics.interval = interval
+    connection_created.connect(metrics.on_connection_created, dispatch_uid='core.db_metrics.created')
+    request_finished.connect(metrics.on_request_finished, dispatch_uid='core.db_metrics.finished')
@@ -0,0 +1,86 @@
+"""
+Read-replica routing for staff reporting
+
+Reads of application data are sent to the ``replica`` database only inside
+``replica_reads()``, which ``ReplicaReadMixin`` enters for staff GET
+requests. Everything else (parent submissions, sessions, auth, all writes)
+stays on ``default``. After a staff member changes data, ``pin_to_primary``
+keeps their reads on ``default`` for ``REPLICA_STICKY_SECONDS`` so they see
+their own writes before replication catches up.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+REPLICA_ALIAS = 'replica'
+REPLICA_APP_LABELS = {'applications'}
+PINNED_SESSION_KEY = 'db_pinned_until'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Route application reads in this block to the replica, if configured"""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_configured():
+    if REPLICA_ALIAS not in settings.DATABASES:
+        return False
+    # A test mirror points at the primary's database; reading it through a
+    # second connection would only miss uncommitted test data
+    return connections[REPLICA_ALIAS].settings_dict['NAME'] != connections['default'].settings_dict['NAME']
+
+
+def pin_to_primary(request):
+    """Keep this user's reads on the primary until replication has caught up"""
+    request.session[PINNED_SESSION_KEY] = time.time() + getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+
+
+def is_pinned(request):
+    session = getattr(request, 'session', None)
+    return session is not None and session.get(PINNED_SESSION_KEY, 0) > time.time()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (_replica_reads.get() and replica_configured()
+                and model._meta.app_label in REPLICA_APP_LABELS):
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Objects read from the replica must still be saved to the primary
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Serve GET/HEAD requests of a staff reporting view from the replica,
+    unless the user recently wrote and is pinned to the primary.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not replica_configured() or is_pinned(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        with replica_reads():
+            response = super().dispatch(request, *args, **kwargs)
+            # Lazy template responses run their queries at render time
+            if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                response.render()
+        return response
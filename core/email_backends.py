@@ -0,0 +1,355 @@
+"""
+HTTP email backend
+
+``BatchEmailBackend`` sends mail through a provider's HTTP API over one
+pooled keep-alive ``requests.Session`` per process. Throttling (429) and
+server errors (5xx) are retried with backoff, honouring ``Retry-After``.
+``EMAIL_API_PROVIDER`` picks the API:
+
+- ``batch``: a JSON batch endpoint taking ``EMAIL_BATCH_SIZE`` messages per
+  request, each batch with an ``Idempotency-Key`` so a retry cannot send
+  twice (``core.fake_email_provider`` implements it locally)
+- ``sendgrid``: SendGrid v3 ``/mail/send``, one request per message
+- ``mailgun``: Mailgun ``/v3/<domain>/messages``, one request per message
+
+Per-message APIs post a batch's messages concurrently, up to
+``EMAIL_API_POOL_SIZE`` at a time.
+
+A connection that is opened explicitly (``connection.open()``, as
+``send_reminders`` and the benchmarks do) queues messages and sends them
+when the batch is full and on ``close()``. A queued message has
+``delivery_status = 'queued'`` until then, and its final ``'sent'`` or
+``'failed'`` outcome (with ``delivery_error``) is reported through its
+``on_delivery(ok, error)`` callback when it has one. ``close()`` only
+raises for failed messages nobody is listening for. Without ``open()`` each
+``send()`` posts straight away and raises on failure, like the SMTP
+backend.
+
+Batch API request body::
+
+    {"messages": [{"from": ..., "to": [...], "cc": [...], "bcc": [...],
+                   "reply_to": [...], "subject": ..., "text": ..., "html": ...,
+                   "headers": {...}, "attachments": [...]}]}
+
+Response: ``{"results": [{"id": ..., "status": "queued" | "rejected", "error": ...}]}``,
+one result per message in order.
+"""
+import base64
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.mail.backends.base import BaseEmailBackend
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session_lock = threading.Lock()
+_session = {'pid': None, 'session': None}
+
+
+class EmailAPIError(Exception):
+    pass
+
+
+def get_session():
+    """The process-wide pooled session (rebuilt after a fork)"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    with _session_lock:
+        if _session['pid'] != os.getpid():
+            retry = Retry(
+                total=settings.EMAIL_API_RETRIES,
+                backoff_factor=settings.EMAIL_API_BACKOFF,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset({'POST'}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=settings.EMAIL_API_POOL_SIZE,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session.update(pid=os.getpid(), session=session)
+        return _session['session']
+
+
+def html_alternative(message):
+    return next(
+        (content for content, mimetype in getattr(message, 'alternatives', []) if mimetype == 'text/html'),
+        None,
+    )
+
+
+def message_attachments(message):
+    """``[(filename, bytes, mimetype)]`` for the message's attachments"""
+    attachments = []
+    for attachment in message.attachments:
+        if not isinstance(attachment, tuple):
+            raise EmailAPIError('Only (filename, content, mimetype) attachments can be sent through the API')
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        attachments.append((filename, content, mimetype))
+    return attachments
+
+
+def message_payload(message):
+    return {
+        'from': message.from_email,
+        'to': list(message.to),
+        'cc': list(message.cc),
+        'bcc': list(message.bcc),
+        'reply_to': list(message.reply_to),
+        'subject': message.subject,
+        'text': message.body,
+        'html': html_alternative(message),
+        'headers': dict(message.extra_headers),
+        'attachments': [
+            {'filename': filename, 'type': mimetype, 'content': base64.b64encode(content).decode('ascii')}
+            for filename, content, mimetype in message_attachments(message)
+        ],
+    }
+
+
+def error_text(response):
+    return f'Provider returned {response.status_code}: {response.text[:200]}'
+
+
+class BatchProvider:
+    """The JSON batch API: many messages per request, one result each"""
+
+    per_message = False
+    default_url = ''
+
+    def __init__(self, api_url, api_key):
+        self.api_url = api_url or self.default_url
+        self.api_key = api_key
+
+    def post(self, session, batch, timeout):
+        """``[(ok, error)]`` for each message in ``batch``"""
+        response = session.post(
+            self.api_url,
+            json={'messages': [message_payload(message) for message in batch]},
+            headers={
+                'Authorization': f'Bearer {self.api_key}',
+                'Idempotency-Key': uuid.uuid4().hex,
+            },
+            timeout=timeout,
+        )
+        if response.status_code >= 400:
+            raise EmailAPIError(error_text(response))
+        results = response.json().get('results', [])
+        if len(results) != len(batch):
+            raise EmailAPIError(f'Provider returned {len(results)} results for {len(batch)} messages')
+        return [
+            (True, '') if result.get('status') == 'queued' else (False, result.get('error') or 'Rejected')
+            for result in results
+        ]
+
+
+class SendGridProvider(BatchProvider):
+    per_message = True
+    default_url = 'https://api.sendgrid.com/v3/mail/send'
+
+    def payload(self, message):
+        def addresses(values):
+            return [{'email': address} for address in values]
+
+        personalization = {'to': addresses(message.to)}
+        if message.cc:
+            personalization['cc'] = addresses(message.cc)
+        if message.bcc:
+            personalization['bcc'] = addresses(message.bcc)
+        content = [{'type': 'text/plain', 'value': message.body}]
+        html = html_alternative(message)
+        if html:
+            content.append({'type': 'text/html', 'value': html})
+        payload = {
+            'personalizations': [personalization],
+            'from': {'email': message.from_email},
+            'subject': message.subject,
+            'content': content,
+        }
+        if message.reply_to:
+            payload['reply_to'] = {'email': message.reply_to[0]}
+        if message.extra_headers:
+            payload['headers'] = {name: str(value) for name, value in message.extra_headers.items()}
+        attachments = message_attachments(message)
+        if attachments:
+            payload['attachments'] = [
+                {'filename': filename, 'type': mimetype, 'content': base64.b64encode(content).decode('ascii')}
+                for filename, content, mimetype in attachments
+            ]
+        return payload
+
+    def post(self, session, batch, timeout):
+        message, = batch
+        response = session.post(
+            self.api_url,
+            json=self.payload(message),
+            headers={'Authorization': f'Bearer {self.api_key}'},
+            timeout=timeout,
+        )
+        if response.status_code in (401, 403) or response.status_code >= 500:
+            raise EmailAPIError(error_text(response))
+        if response.status_code >= 400:
+            return [(False, error_text(response))]
+        return [(True, '')]
+
+
+class MailgunProvider(BatchProvider):
+    """``EMAIL_API_URL`` is the domain's endpoint, e.g. https://api.mailgun.net/v3/mg.example.org/messages"""
+
+    per_message = True
+
+    def post(self, session, batch, timeout):
+        message, = batch
+        data = [
+            ('from', message.from_email),
+            ('subject', message.subject),
+            ('text', message.body),
+        ]
+        data += [('to', address) for address in message.to]
+        data += [('cc', address) for address in message.cc]
+        data += [('bcc', address) for address in message.bcc]
+        html = html_alternative(message)
+        if html:
+            data.append(('html', html))
+        if message.reply_to:
+            data.append(('h:Reply-To', ', '.join(message.reply_to)))
+        data += [(f'h:{name}', str(value)) for name, value in message.extra_headers.items()]
+        files = [('attachment', attachment) for attachment in message_attachments(message)]
+        response = session.post(
+            self.api_url,
+            data=data,
+            files=files or None,
+            auth=('api', self.api_key),
+            timeout=timeout,
+        )
+        if response.status_code in (401, 403) or response.status_code >= 500:
+            raise EmailAPIError(error_text(response))
+        if response.status_code >= 400:
+            return [(False, error_text(response))]
+        return [(True, '')]
+
+
+PROVIDERS = {
+    'batch': BatchProvider,
+    'sendgrid': SendGridProvider,
+    'mailgun': MailgunProvider,
+}
+
+
+class BatchEmailBackend(BaseEmailBackend):
+
+    def __init__(self, fail_silently=False, api_url=None, api_key=None, batch_size=None, timeout=None,
+                 provider=None, **kwargs):
+        super().__init__(fail_silently=fail_silently, **kwargs)
+        self.provider = PROVIDERS[provider or settings.EMAIL_API_PROVIDER](
+            api_url or settings.EMAIL_API_URL,
+            api_key or settings.EMAIL_API_KEY,
+        )
+        self.batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+        self.timeout = timeout or settings.EMAIL_API_TIMEOUT
+        self.queue = []
+        self.opened = False
+        self.lock = threading.RLock()
+
+    def open(self):
+        if self.opened:
+            return False
+        self.opened = True
+        return True
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.opened = False
+
+    def send_messages(self, email_messages):
+        messages = [message for message in email_messages if message.recipients()]
+        if not messages:
+            return 0
+        with self.lock:
+            if not self.opened:
+                return self.deliver(messages, queued=False)
+            for message in messages:
+                message.delivery_status = 'queued'
+                message.delivery_error = ''
+            self.queue.extend(messages)
+            if len(self.queue) >= self.batch_size:
+                self.flush()
+        return len(messages)
+
+    def flush(self):
+        """Send the queued messages; returns how many the provider accepted"""
+        with self.lock:
+            queued, self.queue = self.queue, []
+            return self.deliver(queued, queued=True)
+
+    def deliver(self, messages, queued):
+        """
+        Send ``messages`` and record each one's outcome. Raises for failures
+        unless ``fail_silently``, or, for queued messages, unless every failed
+        message has an ``on_delivery`` callback to report to.
+        """
+        if not messages:
+            return 0
+        outcomes = []
+        for batch, results in self.post_all(messages):
+            for message, (ok, error) in zip(batch, results):
+                message.delivery_status = 'sent' if ok else 'failed'
+                message.delivery_error = error
+                if not ok:
+                    logger.warning(f'Email to {", ".join(message.to)} failed: {error}')
+                callback = getattr(message, 'on_delivery', None)
+                if queued and callback is not None:
+                    callback(ok, error)
+                outcomes.append((message, ok))
+
+        unreported = [
+            message for message, ok in outcomes
+            if not ok and not (queued and getattr(message, 'on_delivery', None))
+        ]
+        if unreported and not self.fail_silently:
+            raise EmailAPIError(
+                f'{len(unreported)} of {len(messages)} messages failed: {unreported[0].delivery_error}'
+            )
+        return sum(1 for _, ok in outcomes if ok)
+
+    def post_all(self, messages):
+        """Yield ``(batch, [(ok, error)])`` for every request needed to send ``messages``"""
+        if self.provider.per_message:
+            batches = [[message] for message in messages]
+        else:
+            batches = [messages[start:start + self.batch_size] for start in range(0, len(messages), self.batch_size)]
+
+        if len(batches) > 1 and self.provider.per_message:
+            workers = min(len(batches), settings.EMAIL_API_POOL_SIZE)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                yield from zip(batches, executor.map(self.post, batches))
+        else:
+            for batch in batches:
+                yield batch, self.post(batch)
+
+    def post(self, batch):
+        """``[(ok, error)]`` for one request; transport and auth errors fail the whole request"""
+        if not self.provider.api_url:
+            return [(False, 'EMAIL_API_URL is not set')] * len(batch)
+        try:
+            return self.provider.post(get_session(), batch, self.timeout)
+        except Exception as e:
+            logger.error(f'Email request for {len(batch)} messages failed: {e}')
+            return [(False, str(e))] * len(batch)
@@ -0,0 +1,84 @@
+"""
+Buffered email delivery log
+
+``EmailService`` records every send here instead of writing to the database
+itself. Entries are kept in memory and written with one ``bulk_create`` when
+``EMAIL_LOG_BUFFER_SIZE`` entries are waiting, when the oldest has waited
+``EMAIL_LOG_FLUSH_SECONDS``, at the end of each request and at exit.
+
+The buffer remembers the database it was filled under: entries recorded
+against a throwaway test database (the benchmark and audit commands) are
+dropped rather than written to whatever database is configured when they are
+flushed. Those commands flush before destroying their database.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DatabaseError, connections, router
+
+logger = logging.getLogger(__name__)
+
+
+def database_name(model):
+    return connections[router.db_for_write(model)].settings_dict['NAME']
+
+
+class EmailLogBuffer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = []
+        self.oldest = None
+        self.database = None
+
+    def add(self, **fields):
+        from applications.models import EmailLog
+
+        with self.lock:
+            self.entries.append(EmailLog(**fields))
+            if self.oldest is None:
+                self.oldest = time.monotonic()
+                self.database = database_name(EmailLog)
+            due = (
+                len(self.entries) >= getattr(settings, 'EMAIL_LOG_BUFFER_SIZE', 20)
+                or time.monotonic() - self.oldest >= getattr(settings, 'EMAIL_LOG_FLUSH_SECONDS', 5)
+            )
+        if due:
+            self.flush()
+
+    def flush(self, **kwargs):
+        from applications.models import EmailLog
+
+        with self.lock:
+            entries, self.entries, self.oldest = self.entries, [], None
+            database, self.database = self.database, None
+        if not entries:
+            return 0
+        if database != database_name(EmailLog):
+            logger.warning(f"Dropped {len(entries)} email log entries recorded against {database}")
+            return 0
+        try:
+            EmailLog.objects.bulk_create(entries)
+        except DatabaseError as e:
+            # The emails themselves went out; losing their log must not break the caller
+            logger.error(f"Failed to write {len(entries)} email log entries: {e}")
+            return 0
+        return len(entries)
+
+
+buffer = EmailLogBuffer()
+
+
+def record(**fields):
+    buffer.add(**fields)
+
+
+def flush():
+    return buffer.flush()
+
+
+request_finished.connect(buffer.flush, dispatch_uid='core.email_log.flush')
+atexit.register(buffer.flush)
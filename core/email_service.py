@@ -1,13 +1,14 @@
 import logging
-import uuid
+import time
 from datetime import datetime, timedelta
 from django.core.mail import send_mail, EmailMultiAlternatives
-from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.conf import settings
 from django.urls import reverse
 from django.utils import timezone
-from applications.models import Application
+from applications.tokens import make_verification_token
+from core import email_log
+from core.email_templates import email_template
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +16,7 @@ logger = logging.getLogger(__name__)
 class EmailService:
     
     @staticmethod
-    def send_application_confirmation(application):
+    def send_application_confirmation(application, connection=None):
         try:
             subject = f"Application Received - Morning Star Academy (Ref: {application.reference_number})"
             
@@ -26,7 +27,7 @@ class EmailService:
                 'verification_url': EmailService._generate_verification_url(application),
             }
             
-            html_content = render_to_string('emails/application_confirmation.html', context)
+            html_content = EmailService._render('emails/application_confirmation.html', context)
             text_content = strip_tags(html_content)
             success = EmailService._send_email(
                 subject=subject,
@@ -34,7 +35,8 @@ class EmailService:
                 html_message=html_content,
                 recipient_list=[application.guardian_email],
                 email_type='confirmation',
-                application=application
+                application=application,
+                connection=connection
             )
             
             if success:
@@ -48,7 +50,7 @@ class EmailService:
             return False
     
     @staticmethod
-    def send_status_update(application, old_status, new_status):
+    def send_status_update(application, old_status, new_status, connection=None):
         try:
             status_templates = {
                 'approved': {
@@ -80,7 +82,7 @@ class EmailService:
                 'contact_phone': '+233 XX XXX XXXX',
             }
             
-            html_content = render_to_string(template_info['template'], context)
+            html_content = EmailService._render(template_info['template'], context)
             text_content = strip_tags(html_content)
             success = EmailService._send_email(
                 subject=template_info['subject'],
@@ -88,7 +90,8 @@ class EmailService:
                 html_message=html_content,
                 recipient_list=[application.guardian_email],
                 email_type=f'status_update_{new_status}',
-                application=application
+                application=application,
+                connection=connection
             )
             
             if success:
@@ -109,10 +112,10 @@ class EmailService:
                 'application': application,
                 'school_name': 'Morning Star Academy',
                 'verification_url': EmailService._generate_verification_url(application),
-                'expiry_hours': 24,
+                'expiry_hours': settings.EMAIL_VERIFICATION_MAX_AGE_HOURS,
             }
             
-            html_content = render_to_string('emails/email_verification.html', context)
+            html_content = EmailService._render('emails/email_verification.html', context)
             text_content = strip_tags(html_content)
             
             success = EmailService._send_email(
@@ -134,7 +137,7 @@ class EmailService:
             return False
     
     @staticmethod
-    def send_reminder_email(application):
+    def send_reminder_email(application, connection=None, on_delivery=None):
         try:
             subject = "Reminder: Please Verify Your Email - Morning Star Academy"
             
@@ -143,9 +146,11 @@ class EmailService:
                 'school_name': 'Morning Star Academy',
                 'verification_url': EmailService._generate_verification_url(application),
                 'days_since_submission': (timezone.now() - application.created_at).days,
+                'expiry_hours': settings.EMAIL_VERIFICATION_MAX_AGE_HOURS,
+                'school_email': settings.ADMIN_EMAIL,
             }
             
-            html_content = render_to_string('emails/email_reminder.html', context)
+            html_content = EmailService._render('emails/email_reminder.html', context)
             text_content = strip_tags(html_content)
             
             success = EmailService._send_email(
@@ -154,7 +159,9 @@ class EmailService:
                 html_message=html_content,
                 recipient_list=[application.guardian_email],
                 email_type='reminder',
-                application=application
+                application=application,
+                connection=connection,
+                on_delivery=on_delivery
             )
             
             if success:
@@ -167,58 +174,97 @@ class EmailService:
             return False
     
     @staticmethod
-    def _send_email(subject, message, recipient_list, html_message=None, email_type=None, application=None):
+    def _render(template_name, context):
+        # Prefers the CSS-inlined copy written by build_email_templates
+        return email_template(template_name).render(context)
+    
+    @staticmethod
+    def _send_email(subject, message, recipient_list, html_message=None, email_type=None, application=None,
+                    connection=None, on_delivery=None):
+        """
+        Send one email and log it. Returns whether it was sent; on a
+        connection that queues messages (see core.email_backends) it returns
+        True once queued, and the log entry and ``on_delivery(ok)`` follow
+        when the queue is flushed.
+        """
+        started = time.perf_counter()
+        outcome = []
+        
+        def delivered(success, error_message=''):
+            outcome.append(success)
+            EmailService._log_email(
+                application=application,
+                email_type=email_type,
+                recipient=recipient_list[0] if recipient_list else '',
+                subject=subject,
+                success=success,
+                error_message=error_message,
+                duration=time.perf_counter() - started
+            )
+            if on_delivery is not None:
+                on_delivery(success)
+        
         try:
             if html_message:
                 email = EmailMultiAlternatives(
                     subject=subject,
                     body=message,
                     from_email=settings.DEFAULT_FROM_EMAIL,
-                    to=recipient_list
+                    to=recipient_list,
+                    connection=connection
                 )
                 email.attach_alternative(html_message, "text/html")
+                email.on_delivery = delivered
                 email.send()
+                status = getattr(email, 'delivery_status', 'sent')
+                if outcome:
+                    # Queued and already flushed by this send
+                    return outcome[0]
+                if status == 'queued':
+                    # The backend calls delivered() when it flushes
+                    return True
+                if status == 'failed':
+                    delivered(False, email.delivery_error)
+                    return False
             else:
                 send_mail(
                     subject=subject,
                     message=message,
                     from_email=settings.DEFAULT_FROM_EMAIL,
                     recipient_list=recipient_list,
-                    fail_silently=False
+                    fail_silently=False,
+                    connection=connection
                 )
-            EmailService._log_email(
-                application=application,
-                email_type=email_type,
-                recipient=recipient_list[0] if recipient_list else '',
-                subject=subject,
-                success=True
-            )
-            
+            delivered(True)
             return True
             
         except Exception as e:
             logger.error(f"Failed to send email: {e}")
-            EmailService._log_email(
-                application=application,
-                email_type=email_type,
-                recipient=recipient_list[0] if recipient_list else '',
-                subject=subject,
-                success=False,
-                error_message=str(e)
-            )
-            
+            if not outcome:
+                delivered(False, str(e))
             return False
     
     @staticmethod
     def _generate_verification_url(application):
-        token = str(uuid.uuid4())
-        return f"http://localhost:8000/verify-email/{token}/"
+        token = make_verification_token(application)
+        path = reverse('applications:verify_email', args=[token])
+        return f"{settings.SITE_URL.rstrip('/')}{path}"
     
     @staticmethod
-    def _log_email(application, email_type, recipient, subject, success, error_message=''):
+    def _log_email(application, email_type, recipient, subject, success, error_message='', duration=0):
         logger.info(f"Email log: {email_type} to {recipient} - {'Success' if success else 'Failed'}")
         if error_message:
             logger.error(f"Email error: {error_message}")
+        # Buffered and bulk-inserted later, so sending costs no extra query
+        email_log.record(
+            application=application if application is not None and application.pk else None,
+            email_type=email_type or '',
+            recipient=recipient,
+            subject=subject[:255],
+            status='sent' if success else 'failed',
+            error=error_message,
+            duration_ms=round(duration * 1000),
+        )
 
 
 class EmailTemplateContext:
@@ -0,0 +1,301 @@
+"""
+Build-time CSS inlining for email templates
+
+Mail clients ignore most ``<style>`` blocks, so every email needs its
+styles on the elements themselves. ``build_email_templates`` does that
+once: it flattens each template in ``EMAIL_TEMPLATES`` into
+``emails/base.html``, copies the matching rules of the base stylesheet into
+``style`` attributes, strips indentation, and writes the result to
+``templates/emails/compiled/``. Template tags pass through untouched, so
+sending a message is an ordinary render of the compiled template. A
+manifest records the hash of the sources each copy was built from; a
+compiled copy whose source has been edited since is ignored (with a
+warning) and the source template is rendered instead.
+
+Only what can live in a ``style`` attribute is inlined: rules whose
+selectors are tag/class compounds, optionally with descendant combinators.
+``:hover`` and ``@media`` rules stay in a trimmed ``<style>`` block.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.template.loader import get_template
+
+logger = logging.getLogger(__name__)
+
+BASE_TEMPLATE = 'emails/base.html'
+COMPILED_DIR = 'compiled'
+MANIFEST_NAME = 'manifest.json'
+
+EMAIL_TEMPLATES = (
+    'emails/application_confirmation.html',
+    'emails/status_approved.html',
+    'emails/status_rejected.html',
+    'emails/status_waitlist.html',
+    'emails/email_verification.html',
+    'emails/email_reminder.html',
+)
+
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
+
+BLOCK_RE = re.compile(r'{%\s*block\s+(\w+)\s*%}(.*?){%\s*endblock(?:\s+\w+)?\s*%}', re.S)
+STYLE_BLOCK_RE = re.compile(r'<style[^>]*>(.*?)</style>', re.S)
+TAG_RE = re.compile(r'({{|{%)(.*?)(}}|%})', re.S)
+SIMPLE_SELECTOR_RE = re.compile(r'^[a-zA-Z][\w-]*$|^[a-zA-Z]*(?:\.[\w-]+)+$')
+
+
+def compiled_name(template_name):
+    directory, filename = os.path.split(template_name)
+    return f'{directory}/{COMPILED_DIR}/{filename}'
+
+
+def compiled_path(template_name):
+    return os.path.join(settings.BASE_DIR, 'templates', compiled_name(template_name))
+
+
+def source_path(template_name):
+    return os.path.join(settings.BASE_DIR, 'templates', template_name)
+
+
+def manifest_path():
+    return os.path.join(settings.BASE_DIR, 'templates', 'emails', COMPILED_DIR, MANIFEST_NAME)
+
+
+def source_hash(template_name):
+    """Hash of the files a compiled template is built from"""
+    digest = hashlib.sha256()
+    for name in (template_name, BASE_TEMPLATE):
+        with open(source_path(name), 'rb') as handle:
+            digest.update(handle.read())
+    return digest.hexdigest()
+
+
+def mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+_current = {}
+
+
+def compiled_is_current(template_name):
+    """Whether the compiled copy exists and was built from the sources as they are now"""
+    paths = [compiled_path(template_name), manifest_path(), source_path(template_name), source_path(BASE_TEMPLATE)]
+    stamps = tuple(mtime(path) for path in paths)
+    if _current.get(template_name, (None,))[0] != stamps:
+        current = False
+        if None not in stamps:
+            try:
+                with open(manifest_path()) as handle:
+                    built_from = json.load(handle).get('templates', {}).get(template_name)
+            except (OSError, ValueError):
+                built_from = None
+            current = built_from == source_hash(template_name)
+            if not current:
+                logger.warning(
+                    f'{compiled_name(template_name)} is out of date with its source; rendering '
+                    f'{template_name} until build_email_templates is run again'
+                )
+        _current[template_name] = (stamps, current)
+    return _current[template_name][1]
+
+
+def email_template(template_name):
+    """The compiled template when build_email_templates has produced a current one, else the source"""
+    if compiled_is_current(template_name):
+        return get_template(compiled_name(template_name))
+    return get_template(template_name)
+
+
+def template_source(template_name):
+    return get_template(template_name).template.source
+
+
+def flatten(child_source, base_source):
+    """Substitute the child's blocks into the base template's blocks"""
+    child_blocks = {name: body for name, body in BLOCK_RE.findall(child_source)}
+    loads = re.findall(r'{%\s*load\s+[^%]*%}', child_source)
+    flat = BLOCK_RE.sub(lambda match: child_blocks.get(match.group(1), match.group(2)), base_source)
+    return '\n'.join(loads + [flat])
+
+
+def parse_rules(css):
+    """
+    Split a stylesheet into inlinable ``(selector parts, specificity, order,
+    declarations)`` rules and the CSS text that has to stay in ``<style>``
+    """
+    import tinycss2
+
+    inline_rules = []
+    remaining = []
+    for order, rule in enumerate(tinycss2.parse_stylesheet(css, skip_comments=True, skip_whitespace=True)):
+        if rule.type == 'at-rule' and rule.at_keyword == 'media' and rule.content:
+            remaining.append(media_rule(rule))
+            continue
+        if rule.type != 'qualified-rule':
+            remaining.append(' '.join(tinycss2.serialize([rule]).split()))
+            continue
+        # Single quotes, so the declarations can sit inside style="..."
+        declarations = ' '.join(tinycss2.serialize(rule.content).split()).strip().rstrip(';').replace('"', "'")
+        kept_selectors = []
+        for selector in tinycss2.serialize(rule.prelude).split(','):
+            parts = selector.split()
+            if parts and all(SIMPLE_SELECTOR_RE.match(part) for part in parts):
+                specificity = (
+                    sum(part.count('.') for part in parts),
+                    sum(1 for part in parts if not part.startswith('.')),
+                )
+                inline_rules.append((parts, specificity, order, declarations))
+            else:
+                kept_selectors.append(selector.strip())
+        if kept_selectors:
+            remaining.append(f'{", ".join(kept_selectors)} {{ {important(rule.content)} }}')
+    inline_rules.sort(key=lambda rule: (rule[1], rule[2]))
+    return inline_rules, remaining
+
+
+def important(content):
+    """Declarations marked !important, so rules left in <style> still beat the inlined styles"""
+    import tinycss2
+
+    return '; '.join(
+        f'{declaration.name}: {tinycss2.serialize(declaration.value).strip()} !important'
+        for declaration in tinycss2.parse_declaration_list(content, skip_comments=True, skip_whitespace=True)
+        if declaration.type == 'declaration'
+    )
+
+
+def media_rule(rule):
+    import tinycss2
+
+    inner = [
+        f'{tinycss2.serialize(child.prelude).strip()} {{ {important(child.content)} }}'
+        for child in tinycss2.parse_rule_list(rule.content, skip_comments=True, skip_whitespace=True)
+        if child.type == 'qualified-rule'
+    ]
+    return f'@media {" ".join(tinycss2.serialize(rule.prelude).split())} {{ {" ".join(inner)} }}'
+
+
+def part_matches(part, tag, classes):
+    name, *required = part.split('.')
+    return (not name or name == tag) and all(cls in classes for cls in required)
+
+
+def selector_matches(parts, stack):
+    """Match ``parts`` against the element on top of ``stack`` and its ancestors"""
+    tag, classes = stack[-1]
+    if not part_matches(parts[-1], tag, classes):
+        return False
+    position = len(stack) - 1
+    for part in reversed(parts[:-1]):
+        position -= 1
+        while position >= 0 and not part_matches(part, *stack[position]):
+            position -= 1
+        if position < 0:
+            return False
+    return True
+
+
+class StyleInliner(HTMLParser):
+    """Record the ``style`` attribute each start tag in a template should get"""
+
+    def __init__(self, rules):
+        super().__init__(convert_charrefs=False)
+        self.rules = rules
+        self.stack = []
+        self.edits = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = set((attrs.get('class') or '').split())
+        self.stack.append((tag, classes))
+        declarations = [rule[3] for rule in self.rules if selector_matches(rule[0], self.stack)]
+        if declarations:
+            self.edits.append((self.getpos(), self.get_starttag_text(), declarations))
+        if tag in VOID_ELEMENTS:
+            self.stack.pop()
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                del self.stack[index:]
+                break
+
+
+def with_style(start_tag, declarations):
+    """Add inlined declarations to a start tag; its own ``style`` still wins"""
+    inlined = '; '.join(declarations)
+    existing = re.search(r'\sstyle=(["\'])(.*?)\1', start_tag, re.S)
+    if existing:
+        own = existing.group(2).strip().rstrip(';')
+        return (start_tag[:existing.start()] + f' style="{inlined}; {own}"' + start_tag[existing.end():])
+    closing = '/>' if start_tag.endswith('/>') else '>'
+    return f'{start_tag[:-len(closing)].rstrip()} style="{inlined}"{closing}'
+
+
+def inline_css(source):
+    """Move the template's ``<style>`` rules onto its elements"""
+    style = STYLE_BLOCK_RE.search(source)
+    if not style:
+        return source
+    inline_rules, remaining = parse_rules(style.group(1))
+    if remaining:
+        source = source[:style.start(1)] + ' '.join(remaining) + source[style.end(1):]
+    else:
+        source = source[:style.start()] + source[style.end():]
+
+    parser = StyleInliner(inline_rules)
+    parser.feed(source)
+    parser.close()
+
+    # HTMLParser reports (line, column) positions, counting lines by '\n'
+    line_offsets = [0]
+    for line in source.split('\n'):
+        line_offsets.append(line_offsets[-1] + len(line) + 1)
+    # Apply from the end so earlier offsets stay valid
+    for (line, column), start_tag, declarations in reversed(parser.edits):
+        offset = line_offsets[line - 1] + column
+        source = source[:offset] + with_style(start_tag, declarations) + source[offset + len(start_tag):]
+    return source
+
+
+def compact(source):
+    """Drop indentation, blank lines and HTML comments, keeping line breaks for the text part"""
+    source = re.sub(r'<!--.*?-->', '', source, flags=re.S)
+    # Django only parses tags on one line; rejoin tags an editor wrapped
+    source = TAG_RE.sub(lambda match: f'{match.group(1)} {" ".join(match.group(2).split())} {match.group(3)}', source)
+    lines = (line.strip() for line in source.splitlines())
+    return '\n'.join(line for line in lines if line) + '\n'
+
+
+def compile_template(template_name):
+    base = template_source(BASE_TEMPLATE)
+    return compact(inline_css(flatten(template_source(template_name), base)))
+
+
+def build():
+    """Write every compiled email template and the manifest; returns ``{template name: compiled path}``"""
+    written = {}
+    manifest = {'templates': {}}
+    for template_name in EMAIL_TEMPLATES:
+        path = compiled_path(template_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(compile_template(template_name))
+        manifest['templates'][template_name] = source_hash(template_name)
+        written[template_name] = path
+    with open(manifest_path(), 'w') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    return written
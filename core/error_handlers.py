@@ -2,6 +2,7 @@
 Custom error handlers for Morning Star Academy
 """
 import logging
+from django.conf import settings
 from django.shortcuts import render
 from django.http import HttpResponseNotFound, HttpResponseServerError, HttpResponseForbidden
 from django.template import TemplateDoesNotExist
@@ -9,6 +10,21 @@ from django.template.loader import get_template
 
 logger = logging.getLogger(__name__)
 
+# Error page bodies for anonymous visitors, rendered once per process
+_prerendered = {}
+
+
+def prerendered(template_name):
+    """
+    The error page as an anonymous visitor sees it. It does not depend on
+    the request, so it is rendered once and reused (every time in DEBUG, so
+    template edits show up).
+    """
+    body = _prerendered.get(template_name)
+    if body is None or settings.DEBUG:
+        body = _prerendered[template_name] = get_template(template_name).render({})
+    return body
+
 
 def custom_404_handler(request, exception):
     """
@@ -17,11 +33,7 @@ def custom_404_handler(request, exception):
     logger.warning(f'404 error: {request.path} - User: {request.user} - IP: {get_client_ip(request)}')
     
     try:
-        template = get_template('404.html')
-        return HttpResponseNotFound(template.render({
-            'request': request,
-            'exception': exception,
-        }))
+        return HttpResponseNotFound(prerendered('404.html'))
     except TemplateDoesNotExist:
         # Fallback to simple 404 response
         return HttpResponseNotFound('<h1>Page Not Found</h1>')
@@ -50,6 +62,9 @@ def custom_403_handler(request, exception):
     logger.warning(f'403 error: {request.path} - User: {request.user} - IP: {get_client_ip(request)}')
     
     try:
+        if not request.user.is_authenticated:
+            return HttpResponseForbidden(prerendered('403.html'))
+        # Signed-in users get their own navigation
         template = get_template('403.html')
         return HttpResponseForbidden(template.render({
             'request': request,
@@ -0,0 +1,221 @@
+"""
+Local stand-in for an HTTP email provider
+
+A threaded HTTP/1.1 server implementing the APIs that
+``core.email_backends.BatchEmailBackend`` speaks: the JSON batch API, and
+the single-message SendGrid (``/v3/mail/send``) and Mailgun
+(``/v3/<domain>/messages``) endpoints. It checks credentials, stores
+accepted messages in ``outbox``, answers repeated ``Idempotency-Key``
+values with the original response, and counts connections, requests and
+messages. ``delay`` imitates provider latency per request and
+``fail_every`` answers every Nth request with 429 or 503, to exercise the
+backend's retries.
+"""
+import base64
+import email
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+BATCH_PATH = '/v1/messages/batch'
+SENDGRID_PATH = '/v3/mail/send'
+MAILGUN_PATH = '/v3/mg.example.org/messages'
+
+
+class ProviderStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.messages = 0
+        self.bytes = 0
+        self.throttled = 0
+        self.duplicates = 0
+
+    def add(self, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+            return self.requests
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'connections': self.connections,
+                'requests': self.requests,
+                'messages': self.messages,
+                'bytes': self.bytes,
+                'throttled': self.throttled,
+                'duplicates': self.duplicates,
+            }
+
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.stats.add(connections=1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def authorized(self):
+        expected = {
+            BATCH_PATH: f'Bearer {self.server.api_key}',
+            SENDGRID_PATH: f'Bearer {self.server.api_key}',
+            MAILGUN_PATH: 'Basic ' + base64.b64encode(f'api:{self.server.api_key}'.encode()).decode(),
+        }
+        return self.headers.get('Authorization') == expected[self.path]
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        count = server.stats.add(requests=1, bytes=len(body))
+
+        if self.path not in (BATCH_PATH, SENDGRID_PATH, MAILGUN_PATH):
+            return self.respond(404, {'error': 'Unknown endpoint'})
+        if not self.authorized():
+            return self.respond(401, {'error': 'Invalid API key'})
+        if server.fail_every and count % server.fail_every == 0:
+            server.stats.add(throttled=1)
+            if (count // server.fail_every) % 2:
+                return self.respond(429, {'error': 'Too many requests'}, {'Retry-After': '0'})
+            return self.respond(503, {'error': 'Service unavailable'})
+
+        if server.delay:
+            time.sleep(server.delay)
+        if self.path == SENDGRID_PATH:
+            return self.single(self.sendgrid_message(body))
+        if self.path == MAILGUN_PATH:
+            return self.single(self.mailgun_message(body))
+
+        key = self.headers.get('Idempotency-Key')
+        with server.lock:
+            if key and key in server.responses:
+                server.stats.add(duplicates=1)
+                return self.respond(200, server.responses[key])
+
+        try:
+            messages = json.loads(body)['messages']
+        except (ValueError, KeyError, TypeError):
+            return self.respond(400, {'error': 'Expected {"messages": [...]}'})
+        if len(messages) > server.max_batch:
+            return self.respond(413, {'error': f'At most {server.max_batch} messages per request'})
+
+        results = []
+        accepted = []
+        for message in messages:
+            if message.get('to') and message.get('from') and (message.get('text') or message.get('html')):
+                results.append({'id': uuid.uuid4().hex, 'status': 'queued'})
+                accepted.append(message)
+            else:
+                results.append({'id': None, 'status': 'rejected', 'error': 'Missing from, to or content'})
+        response = {'results': results}
+        with server.lock:
+            server.outbox.extend(accepted)
+            if key:
+                server.responses[key] = response
+        server.stats.add(messages=len(accepted))
+        self.respond(200, response)
+
+    def single(self, message):
+        """Answer a one-message API: 400 for an invalid message, as both providers do"""
+        if not (message.get('to') and message.get('from') and (message.get('text') or message.get('html'))):
+            return self.respond(400, {'errors': [{'message': 'Missing from, to or content'}]})
+        with self.server.lock:
+            self.server.outbox.append(message)
+        self.server.stats.add(messages=1)
+        if self.path == SENDGRID_PATH:
+            return self.respond(202, {})
+        return self.respond(200, {'id': f'<{uuid.uuid4().hex}@mg.example.org>', 'message': 'Queued. Thank you.'})
+
+    def sendgrid_message(self, body):
+        try:
+            data = json.loads(body)
+            personalization = data['personalizations'][0]
+            content = {part['type']: part['value'] for part in data.get('content', [])}
+            return {
+                'from': data.get('from', {}).get('email'),
+                'to': [address['email'] for address in personalization.get('to', [])],
+                'subject': data.get('subject'),
+                'text': content.get('text/plain'),
+                'html': content.get('text/html'),
+                'attachments': data.get('attachments', []),
+            }
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+            return {}
+
+    def mailgun_message(self, body):
+        content_type = self.headers.get('Content-Type', '')
+        fields = []
+        attachments = []
+        if content_type.startswith('multipart/form-data'):
+            parsed = email.message_from_bytes(f'Content-Type: {content_type}\r\n\r\n'.encode() + body)
+            for part in parsed.get_payload():
+                name = part.get_param('name', header='content-disposition')
+                if part.get_filename():
+                    attachments.append({'filename': part.get_filename(), 'type': part.get_content_type()})
+                else:
+                    fields.append((name, part.get_payload(decode=True).decode('utf-8')))
+        else:
+            fields = parse_qsl(body.decode('utf-8'))
+        values = {}
+        for name, value in fields:
+            values.setdefault(name, []).append(value)
+        return {
+            'from': values.get('from', [None])[0],
+            'to': values.get('to', []),
+            'subject': values.get('subject', [None])[0],
+            'text': values.get('text', [None])[0],
+            'html': values.get('html', [None])[0],
+            'attachments': attachments,
+        }
+
+
+class FakeEmailProvider(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0, api_key='test-key', delay=0, fail_every=0, max_batch=500):
+        super().__init__((host, port), FakeProviderHandler)
+        self.api_key = api_key
+        self.delay = delay
+        self.fail_every = fail_every
+        self.max_batch = max_batch
+        self.stats = ProviderStats()
+        self.lock = threading.Lock()
+        self.outbox = []
+        self.responses = {}
+        self.thread = None
+
+    def url_for(self, provider='batch'):
+        host, port = self.server_address[:2]
+        path = {'batch': BATCH_PATH, 'sendgrid': SENDGRID_PATH, 'mailgun': MAILGUN_PATH}[provider]
+        return f'http://{host}:{port}{path}'
+
+    @property
+    def url(self):
+        return self.url_for('batch')
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
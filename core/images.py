@@ -0,0 +1,165 @@
+"""
+Responsive image derivatives
+
+``build_images`` resizes every JPEG/PNG under ``theme/static/images`` to the
+widths in ``RESPONSIVE_IMAGE_WIDTHS``, as WebP and in the source format,
+using one process per core. The derivatives go to
+``theme/static/images/derived/`` (so collectstatic hashes and compresses
+them like any other asset) with a ``manifest.json`` recording the source
+hash, so unchanged sources are skipped on the next build. The
+``responsive_image`` template tag reads the manifest to emit ``<picture>``
+markup with ``srcset``.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+DERIVED_DIR = 'derived'
+MANIFEST_NAME = 'manifest.json'
+
+
+def images_root():
+    return os.path.join(settings.STATICFILES_DIRS[0], 'images')
+
+
+def derived_root():
+    return os.path.join(images_root(), DERIVED_DIR)
+
+
+def manifest_path():
+    return os.path.join(derived_root(), MANIFEST_NAME)
+
+
+def load_manifest():
+    try:
+        with open(manifest_path()) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def source_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def target_widths(original_width, widths):
+    """Configured widths narrower than the source, plus the source width itself"""
+    return sorted({width for width in widths if width < original_width} | {original_width})
+
+
+def render_derivative(source, target, width, image_format, quality):
+    """Run in a worker process: write one resized copy of ``source``"""
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.LANCZOS)
+        if image_format in ('JPEG', 'WEBP') and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        options = {'quality': quality}
+        if image_format == 'JPEG':
+            options.update(optimize=True, progressive=True)
+        elif image_format == 'WEBP':
+            options.update(method=6)
+        image.save(target, image_format, **options)
+    return target, os.path.getsize(target)
+
+
+def build(force=False, workers=None):
+    """
+    Generate missing or stale derivatives and rewrite the manifest.
+    Returns ``(built, skipped)`` counts of source images.
+    """
+    from PIL import Image
+
+    widths = settings.RESPONSIVE_IMAGE_WIDTHS
+    quality = settings.RESPONSIVE_IMAGE_QUALITY
+    os.makedirs(derived_root(), exist_ok=True)
+    previous = load_manifest()
+    manifest = {}
+    tasks = []
+
+    for filename in sorted(os.listdir(images_root())):
+        stem, extension = os.path.splitext(filename)
+        if extension.lower() not in SOURCE_EXTENSIONS:
+            continue
+        source = os.path.join(images_root(), filename)
+        name = f'images/{filename}'
+        digest = source_hash(source)
+
+        entry = previous.get(name)
+        if (not force and entry and entry['hash'] == digest and entry['widths'] == widths
+                and all(os.path.exists(os.path.join(settings.STATICFILES_DIRS[0], variant['path']))
+                        for variants in entry['variants'].values() for variant in variants)):
+            manifest[name] = entry
+            continue
+
+        with Image.open(source) as image:
+            original_width, original_height = image.size
+            # EXIF orientations 5-8 are rotated by 90 degrees when rendered
+            if image.getexif().get(0x0112) in (5, 6, 7, 8):
+                original_width, original_height = original_height, original_width
+        source_format = 'png' if extension.lower() == '.png' else 'jpeg'
+        entry = {
+            'hash': digest,
+            'widths': widths,
+            'width': original_width,
+            'height': original_height,
+            'bytes': os.path.getsize(source),
+            'variants': {'webp': [], source_format: []},
+        }
+        for width in target_widths(original_width, widths):
+            for variant_format in ('webp', source_format):
+                variant_extension = 'jpg' if variant_format == 'jpeg' else variant_format
+                path = f'images/{DERIVED_DIR}/{stem}-{digest[:8]}-{width}.{variant_extension}'
+                entry['variants'][variant_format].append({'width': width, 'path': path})
+                tasks.append((
+                    name, variant_format, width,
+                    (source, os.path.join(settings.STATICFILES_DIRS[0], path), width,
+                     variant_format.upper(), quality),
+                ))
+        manifest[name] = entry
+
+    sizes = {}
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [(task[:3], executor.submit(render_derivative, *task[3])) for task in tasks]
+            for (name, variant_format, width), future in futures:
+                _, size = future.result()
+                sizes[(name, variant_format, width)] = size
+
+    for name, entry in manifest.items():
+        for variant_format, variants in entry['variants'].items():
+            for variant in variants:
+                if (name, variant_format, variant['width']) in sizes:
+                    variant['bytes'] = sizes[(name, variant_format, variant['width'])]
+
+    remove_stale_files(manifest)
+    with open(manifest_path(), 'w') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+
+    built = len({task[0] for task in tasks})
+    return built, len(manifest) - built
+
+
+def remove_stale_files(manifest):
+    keep = {
+        os.path.basename(variant['path'])
+        for entry in manifest.values()
+        for variants in entry['variants'].values()
+        for variant in variants
+    }
+    keep.add(MANIFEST_NAME)
+    for filename in os.listdir(derived_root()):
+        if filename not in keep:
+            os.remove(os.path.join(derived_root(), filename))
@@ -0,0 +1,202 @@
+"""
+Load-test harness for admissions deadline traffic
+
+Each virtual parent follows the deadline-day script: GET the apply form,
+POST it with its CSRF token, refresh the success page a few times and, for
+a share of parents, look the application up again through the download form.
+Requests go over plain HTTP with ``requests`` against either an embedded
+threaded server or a running instance.
+"""
+import random
+import re
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .benchmarks import application_form_data, percentile
+
+CSRF_TOKEN_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+SUCCESS_PATH_RE = re.compile(r'/apply/success/([^/]+)/')
+RATE_LIMIT_MARKER = 'Rate limit exceeded'
+# Message ApplicationCreateView shows when the insert raises IntegrityError
+INTEGRITY_ERROR_MARKER = 'A technical error occurred. Please try submitting your application again.'
+# ...and when it raises any other DatabaseError (e.g. "database is locked")
+DATABASE_ERROR_MARKER = 'We are experiencing technical difficulties.'
+# The daily intake cap is reached, overall or for the chosen grade
+INTAKE_CLOSED_MARKERS = (
+    'Applications are closed for today',
+    'We have received the maximum number of applications for this class today.',
+)
+
+
+def intake_closed(text):
+    return any(marker in text for marker in INTAKE_CLOSED_MARKERS)
+
+
+class LoadTestStats:
+    """Thread-safe collector for request latencies and outcomes"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.status_codes = defaultdict(lambda: defaultdict(int))
+        self.rate_limited = 0
+        self.integrity_errors = 0
+        self.database_errors = 0
+        self.intake_closed = 0
+        self.submissions = 0
+        self.failed_parents = 0
+        self.errors = defaultdict(int)
+
+    def record(self, kind, response, elapsed_ms):
+        with self.lock:
+            self.latencies[kind].append(elapsed_ms)
+            self.status_codes[kind][response.status_code] += 1
+            if response.status_code == 403 and RATE_LIMIT_MARKER in response.text:
+                self.rate_limited += 1
+
+    def record_error(self, kind, error):
+        with self.lock:
+            self.errors[f'{kind}: {type(error).__name__}'] += 1
+
+    def increment(self, attribute):
+        with self.lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+
+    def summary(self, elapsed_seconds):
+        all_latencies = [value for values in self.latencies.values() for value in values]
+        requests_total = len(all_latencies)
+
+        def describe(samples):
+            return {
+                'count': len(samples),
+                'mean_ms': round(statistics.mean(samples), 2),
+                'p50_ms': round(percentile(samples, 0.50), 2),
+                'p90_ms': round(percentile(samples, 0.90), 2),
+                'p95_ms': round(percentile(samples, 0.95), 2),
+                'p99_ms': round(percentile(samples, 0.99), 2),
+                'max_ms': round(max(samples), 2),
+            }
+
+        return {
+            'elapsed_s': round(elapsed_seconds, 2),
+            'requests': requests_total,
+            'throughput_rps': round(requests_total / elapsed_seconds, 2) if elapsed_seconds else 0,
+            'submissions': self.submissions,
+            'submissions_per_s': round(self.submissions / elapsed_seconds, 2) if elapsed_seconds else 0,
+            'rate_limited': self.rate_limited,
+            'integrity_errors': self.integrity_errors,
+            'database_errors': self.database_errors,
+            'intake_closed': self.intake_closed,
+            'failed_parents': self.failed_parents,
+            'errors': dict(self.errors),
+            'overall': describe(all_latencies) if all_latencies else {},
+            'by_request': {
+                kind: dict(describe(samples), status_codes=dict(self.status_codes[kind]))
+                for kind, samples in self.latencies.items()
+            },
+        }
+
+
+class VirtualParent:
+    """One parent's session: apply, refresh the success page, look it up"""
+
+    def __init__(self, base_url, stats, index, refreshes, lookup, forwarded_for=True, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.stats = stats
+        self.refreshes = refreshes
+        self.lookup = lookup
+        self.timeout = timeout
+        self.session = requests.Session()
+        if forwarded_for:
+            # Parents arrive from many addresses; RateLimitMiddleware keys on this header
+            self.session.headers['X-Forwarded-For'] = (
+                f'10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}'
+            )
+
+    def request(self, kind, method, path, **kwargs):
+        start = time.perf_counter()
+        response = self.session.request(
+            method, self.base_url + path, timeout=self.timeout, allow_redirects=False, **kwargs
+        )
+        self.stats.record(kind, response, (time.perf_counter() - start) * 1000)
+        return response
+
+    def csrf_post(self, kind, form_page, path, data):
+        token = CSRF_TOKEN_RE.search(form_page.text)
+        if not token:
+            raise ValueError(f'No CSRF token on {kind} form page')
+        data = dict(data, csrfmiddlewaretoken=token.group(1))
+        return self.request(kind, 'post', path, data=data, headers={'Referer': self.base_url + path})
+
+    def run(self):
+        from applications.factories import ApplicationFactory
+
+        try:
+            form_page = self.request('apply_get', 'get', '/apply/')
+            if intake_closed(form_page.text):
+                self.stats.increment('intake_closed')
+                return
+            response = self.csrf_post(
+                'apply_post', form_page, '/apply/', application_form_data(ApplicationFactory.build())
+            )
+
+            if response.status_code != 302:
+                if intake_closed(response.text):
+                    # Turned away by the daily cap, not a failure of the site
+                    self.stats.increment('intake_closed')
+                    return
+                if INTEGRITY_ERROR_MARKER in response.text:
+                    self.stats.increment('integrity_errors')
+                elif DATABASE_ERROR_MARKER in response.text:
+                    self.stats.increment('database_errors')
+                self.stats.increment('failed_parents')
+                return
+
+            self.stats.increment('submissions')
+            match = SUCCESS_PATH_RE.search(response.headers.get('Location', ''))
+            if not match:
+                self.stats.increment('failed_parents')
+                return
+            reference_number = match.group(1)
+
+            for _ in range(self.refreshes):
+                self.request('success', 'get', f'/apply/success/{reference_number}/')
+
+            if self.lookup:
+                download_page = self.request('download_get', 'get', '/apply/download/')
+                self.csrf_post(
+                    'download_post', download_page, '/apply/download/',
+                    {'reference_number': reference_number},
+                )
+        except (requests.RequestException, ValueError) as e:
+            self.stats.record_error('parent', e)
+            self.stats.increment('failed_parents')
+        finally:
+            self.session.close()
+
+
+def run_load_test(base_url, parents, concurrency, refreshes=3, lookup_ratio=0.3,
+                  forwarded_for=True, seed=None):
+    """Drive ``parents`` virtual parents through the site, ``concurrency`` at a time"""
+    rng = random.Random(seed)
+    stats = LoadTestStats()
+    virtual_parents = [
+        VirtualParent(
+            base_url, stats, index,
+            refreshes=rng.randint(1, refreshes * 2 - 1) if refreshes > 1 else refreshes,
+            lookup=rng.random() < lookup_ratio,
+            forwarded_for=forwarded_for,
+        )
+        for index in range(parents)
+    ]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for parent in virtual_parents:
+            executor.submit(parent.run)
+    return stats.summary(time.perf_counter() - start)
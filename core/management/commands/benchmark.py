@@ -0,0 +1,136 @@
+import json
+import platform
+import subprocess
+from datetime import datetime
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from core import email_log
+from core.benchmarks import BENCHMARKS, UNCAPPED_INTAKE, BenchmarkContext, run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Run the admissions benchmark suite against a seeded throwaway database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=5000,
+            help='Synthetic applications to seed before running (default: 5000)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Timed iterations per benchmark (default: 50)',
+        )
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            choices=sorted(BENCHMARKS),
+            help='Run only the named benchmarks',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write JSON results to this file',
+        )
+        parser.add_argument(
+            '--compare',
+            help='Previous JSON results to compare against',
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as handle:
+                    baseline = json.load(handle)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Could not read baseline results: {e}')
+
+        names = options['only'] or list(BENCHMARKS)
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(**UNCAPPED_INTAKE):
+                results = self.run_suite(names, options['rows'], options['iterations'])
+        finally:
+            email_log.flush()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'meta': self.get_meta(options['rows']),
+            'results': results,
+        }
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'✅ Results written to {options["output"]}'))
+        else:
+            self.stdout.write(json.dumps(report, indent=2))
+
+        if baseline:
+            self.print_comparison(baseline.get('results', {}), results)
+
+    def run_suite(self, names, rows, iterations):
+        from applications.factories import seed_applications
+
+        self.stderr.write(f'🌱 Seeding {rows} applications...')
+        applications = seed_applications(rows)
+        staff_user = get_user_model().objects.create_user(
+            username='benchmark-staff', password='benchmark-password', is_staff=True
+        )
+        context = BenchmarkContext(staff_user, applications[-1])
+
+        results = {}
+        for name in names:
+            self.stderr.write(f'⏱️  {name}')
+            results[name] = run_benchmark(name, context, iterations)
+        return results
+
+    def get_meta(self, rows):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+
+        return {
+            'commit': commit,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'rows': rows,
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        }
+
+    def print_comparison(self, baseline, results):
+        self.stdout.write('')
+        self.stdout.write(f'{"benchmark":<28} {"before":>10} {"after":>10} {"change":>9} {"queries":>9}')
+        for name, result in results.items():
+            before = baseline.get(name)
+            if not before:
+                self.stdout.write(f'{name:<28} {"-":>10} {result["median_ms"]:>10.2f}')
+                continue
+
+            change = (result['median_ms'] - before['median_ms']) / before['median_ms'] * 100
+            line = (
+                f'{name:<28} {before["median_ms"]:>10.2f} {result["median_ms"]:>10.2f} '
+                f'{change:>+8.1f}% {before["queries"]:>4}->{result["queries"]:<4}'
+            )
+            if change > 10 or result['queries'] > before['queries']:
+                self.stdout.write(self.style.WARNING(line))
+            else:
+                self.stdout.write(line)
@@ -0,0 +1,120 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from applications.models import Application
+from core.benchmarks import percentile
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request, persistent and pooled database connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Simulated requests per mode (default: 500)',
+        )
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to benchmark (default: default)',
+        )
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        connection = connections[alias]
+        original = {
+            'CONN_MAX_AGE': connection.settings_dict['CONN_MAX_AGE'],
+            'CONN_HEALTH_CHECKS': connection.settings_dict['CONN_HEALTH_CHECKS'],
+            'OPTIONS': dict(connection.settings_dict.get('OPTIONS', {})),
+        }
+
+        modes = {
+            'per-request': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False},
+            'persistent': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True},
+        }
+        if connection.vendor == 'postgresql' and self.pool_available():
+            modes['pool'] = {
+                'CONN_MAX_AGE': 0,
+                'CONN_HEALTH_CHECKS': False,
+                'POOL': {'min_size': 1, 'max_size': 4},
+            }
+        else:
+            self.stdout.write(
+                self.style.WARNING('💡 Pool mode needs PostgreSQL with psycopg 3 and psycopg_pool; skipping')
+            )
+
+        self.stdout.write(f'🔌 Benchmarking {connection.vendor} ({alias}), {options["requests"]} requests per mode')
+        results = {}
+        try:
+            for mode, config in modes.items():
+                results[mode] = self.run_mode(alias, config, options['requests'])
+        finally:
+            connection.close()
+            connection.settings_dict.update(original)
+
+        baseline = results['per-request']['mean_ms']
+        self.stdout.write(f'\n{"mode":<12} {"mean":>9} {"p50":>9} {"p95":>9} {"opened":>8} {"saving/request":>16}')
+        for mode, result in results.items():
+            self.stdout.write(
+                f'{mode:<12} {result["mean_ms"]:>9.3f} {result["p50_ms"]:>9.3f} {result["p95_ms"]:>9.3f} '
+                f'{result["connections_opened"]:>8} {baseline - result["mean_ms"]:>13.3f} ms'
+            )
+
+    def pool_available(self):
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def run_mode(self, alias, config, requests):
+        connection = connections[alias]
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = config['CONN_MAX_AGE']
+        connection.settings_dict['CONN_HEALTH_CHECKS'] = config['CONN_HEALTH_CHECKS']
+        options = dict(connection.settings_dict.get('OPTIONS', {}))
+        options.pop('pool', None)
+        if 'POOL' in config:
+            options['pool'] = config['POOL']
+        connection.settings_dict['OPTIONS'] = options
+
+        opened = []
+
+        def count(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        connection_created.connect(count)
+        timings = []
+        try:
+            for _ in range(requests):
+                # The same signals Django sends around every request drive
+                # close_old_connections() and therefore connection reuse
+                start = time.perf_counter()
+                request_started.send(sender=self.__class__, environ={})
+                Application.objects.using(alias).exists()
+                request_finished.send(sender=self.__class__)
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection_created.disconnect(count)
+            connection.close()
+
+        if 'POOL' in config:
+            # connection_created fires for every checkout; the pool knows how
+            # many server connections it really opened
+            opened_count = connection.pool.get_stats().get('connections_num', 0)
+            connection.close_pool()
+        else:
+            opened_count = opened.count(alias)
+        return {
+            'mean_ms': statistics.mean(timings),
+            'p50_ms': percentile(timings, 0.50),
+            'p95_ms': percentile(timings, 0.95),
+            'connections_opened': opened_count,
+        }
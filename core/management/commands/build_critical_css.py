@@ -0,0 +1,106 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection as db_connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from core import critical_css, email_log
+
+
+class Command(BaseCommand):
+    help = 'Extract and save the above-the-fold CSS of the main pages, then report their first-render bytes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sections',
+            type=int,
+            default=critical_css.FOLD_SECTIONS,
+            help=f'Children of <main> treated as above the fold (default: {critical_css.FOLD_SECTIONS})',
+        )
+        parser.add_argument(
+            '--budget',
+            type=float,
+            default=14,
+            help='First-render budget per page in KB of gzipped HTML and blocking CSS (default: 14)',
+        )
+        parser.add_argument(
+            '--report-only',
+            action='store_true',
+            help='Report the current first-render bytes without rebuilding',
+        )
+
+    def handle(self, *args, **options):
+        if options['sections'] < 1:
+            raise CommandError('--sections must be at least 1')
+
+        start = time.perf_counter()
+        # Pages are rendered against a throwaway database with one application for the success page
+        old_name = db_connection.settings_dict['NAME']
+        db_connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        setup_test_environment()
+        try:
+            with override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'):
+                urls = self.page_urls()
+                if not options['report_only']:
+                    blocking = {page: self.render(url) for page, url in urls.items()}
+                    critical_css.write({
+                        page: critical_css.extract(html, options['sections'])
+                        for page, html in blocking.items()
+                    })
+                rendered = {page: self.render(url) for page, url in urls.items()}
+        finally:
+            teardown_test_environment()
+            email_log.flush()
+            db_connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.report(rendered, options['budget'] * 1024)
+        self.stdout.write(self.style.SUCCESS(f'✅ Done in {time.perf_counter() - start:.1f}s'))
+
+    def page_urls(self):
+        from applications.factories import ApplicationFactory
+
+        urls = {}
+        for page, (url_name, kwargs) in critical_css.PAGES.items():
+            if 'ref_number' in kwargs:
+                kwargs = {**kwargs, 'ref_number': ApplicationFactory().reference_number}
+            urls[page] = reverse(url_name, kwargs=kwargs)
+        return urls
+
+    def render(self, url):
+        response = Client().get(url)
+        if response.status_code != 200:
+            raise CommandError(f'{url} returned {response.status_code}')
+        return response.content.decode('utf-8')
+
+    def report(self, rendered, budget):
+        stylesheets = ''.join(
+            open(critical_css.stylesheet_path(name), encoding='utf-8').read()
+            for name in critical_css.STYLESHEETS
+        )
+        blocking_gzip = critical_css.gzip_size(stylesheets)
+        manifest = critical_css.load_manifest().get('pages', {})
+
+        self.stdout.write(
+            f'{"Page":<10} {"Critical":>10} {"HTML":>10} {"Blocking CSS":>13} {"First render":>13} {"Before":>10}'
+        )
+        over = []
+        for page, html in rendered.items():
+            inlined = '<style>' in html and page in manifest
+            html_gzip = critical_css.gzip_size(html)
+            # Without inlined CSS the page cannot render until the stylesheets arrive
+            first_render = html_gzip if inlined else html_gzip + blocking_gzip
+            before = html_gzip - (manifest[page]['gzip'] if inlined else 0) + blocking_gzip
+            if first_render > budget:
+                over.append(page)
+            self.stdout.write(
+                f'{page:<10} {manifest[page]["gzip"] if inlined else "-":>10} {html_gzip:>10} '
+                f'{0 if inlined else blocking_gzip:>13} {first_render:>13} {before:>10}'
+            )
+        self.stdout.write('(gzipped bytes)')
+
+        if over:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  Over the {budget / 1024:g} KB first-render budget: {", ".join(over)}'
+            ))
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.images import build, load_manifest
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive WebP and resized derivatives of theme/static/images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild every image even if its source is unchanged',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Worker processes (default: one per core)',
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        built, skipped = build(force=options['force'], workers=options['workers'])
+        elapsed = time.perf_counter() - start
+
+        for name, entry in sorted(load_manifest().items()):
+            smallest = min(
+                (variant for variant in entry['variants']['webp'] if 'bytes' in variant),
+                key=lambda variant: variant['width'],
+                default=None,
+            )
+            if smallest:
+                self.stdout.write(
+                    f'{name:<35} {entry["bytes"]:>8} bytes → {smallest["bytes"]:>7} bytes '
+                    f'(WebP {smallest["width"]}w)'
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {built} images built, {skipped} unchanged, in {elapsed:.1f}s'
+        ))
@@ -1,7 +1,13 @@
-from django.core.management.base import BaseCommand
-from django.core.mail import send_mail
+from django.core.management.base import BaseCommand, CommandError
+from django.core.mail import send_mail, get_connection
 from django.conf import settings
+from django.db import connection as db_connection
+from django.test.utils import override_settings
+import logging
 import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 
 
@@ -14,8 +20,50 @@ class Command(BaseCommand):
             action='store_true',
             help='Test SMTP connection directly',
         )
+        parser.add_argument(
+            '--benchmark',
+            action='store_true',
+            help='Measure EmailService throughput against a local SMTP sink',
+        )
+        parser.add_argument(
+            '--messages',
+            type=int,
+            default=200,
+            help='Emails sent per benchmark run (default: 200)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Parallel senders in the benchmark (default: 4)',
+        )
+        parser.add_argument(
+            '--sink-delay',
+            type=float,
+            default=0,
+            help='Milliseconds the sink waits per message (per request with an HTTP provider) (default: 0)',
+        )
+        parser.add_argument(
+            '--provider',
+            choices=('smtp', 'http', 'sendgrid', 'mailgun'),
+            default='smtp',
+            help='Benchmark the SMTP backend, or the HTTP backend with the batch, SendGrid or Mailgun API '
+                 'against a fake provider (default: smtp)',
+        )
+        parser.add_argument(
+            '--fail-every',
+            type=int,
+            default=0,
+            help='With an HTTP provider, answer every Nth request with 429/503 to exercise retries',
+        )
 
     def handle(self, *args, **options):
+        if options['benchmark']:
+            return self.run_benchmark(
+                options['messages'], options['concurrency'], options['sink_delay'],
+                options['provider'], options['fail_every'],
+            )
+
         self.stdout.write(
             self.style.SUCCESS('🔍 Checking Email Configuration...')
         )
@@ -108,4 +156,137 @@ class Command(BaseCommand):
         except Exception as e:
             self.stdout.write(
                 self.style.ERROR(f'❌ Connection failed: {e}')
-            )
\ No newline at end of file
+            )
+
+    def run_benchmark(self, messages, concurrency, sink_delay, provider='smtp', fail_every=0):
+        """Send rendered emails through EmailService to a local sink, with and without connection reuse"""
+        from core import email_log
+        from core.fake_email_provider import FakeEmailProvider
+        from core.smtp_sink import SMTPSink
+
+        if messages < 1 or concurrency < 1:
+            raise CommandError('--messages and --concurrency must be at least 1')
+
+        if provider != 'smtp':
+            api = 'batch' if provider == 'http' else provider
+            sink = FakeEmailProvider(delay=sink_delay / 1000, fail_every=fail_every).start()
+            backend_settings = {
+                'EMAIL_BACKEND': 'core.email_backends.BatchEmailBackend',
+                'EMAIL_API_PROVIDER': api,
+                'EMAIL_API_URL': sink.url_for(api),
+                'EMAIL_API_KEY': sink.api_key,
+                'EMAIL_API_BACKOFF': 0,
+            }
+            banner = f'🌐 Fake {api} provider at {sink.url_for(api)}'
+        else:
+            sink = SMTPSink(delay=sink_delay / 1000).start()
+            backend_settings = {
+                'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+                'EMAIL_HOST': '127.0.0.1',
+                'EMAIL_PORT': sink.port,
+                'EMAIL_USE_TLS': False,
+                'EMAIL_USE_SSL': False,
+                'EMAIL_HOST_USER': '',
+                'EMAIL_HOST_PASSWORD': '',
+            }
+            banner = f'📬 SMTP sink on port {sink.port}'
+        # EmailLog rows are written once per run, outside the timings
+        backend_settings.update(EMAIL_LOG_BUFFER_SIZE=messages + 1, EMAIL_LOG_FLUSH_SECONDS=3600)
+        # Per-email INFO lines would dominate both the output and the timings
+        service_logger = logging.getLogger('core.email_service')
+        old_level = service_logger.level
+        service_logger.setLevel(logging.WARNING)
+        # EmailLog entries go to a throwaway database
+        old_name = db_connection.settings_dict['NAME']
+        db_connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(**backend_settings):
+                self.stdout.write(self.style.SUCCESS(
+                    f'{banner}: {messages} emails, {concurrency} senders, {sink_delay:g}ms sink delay'
+                ))
+                for reuse in (False, True):
+                    before = sink.stats.snapshot()
+                    result = self.benchmark_run(messages, concurrency, reuse)
+                    after = sink.stats.snapshot()
+                    email_log.flush()
+                    self.print_benchmark(result, {key: after[key] - before[key] for key in after}, reuse)
+        finally:
+            sink.stop()
+            email_log.flush()
+            db_connection.creation.destroy_test_db(old_name, verbosity=0)
+            service_logger.setLevel(old_level)
+
+    def benchmark_run(self, messages, concurrency, reuse):
+        from applications.factories import ApplicationFactory
+        from core.email_service import EmailService
+
+        applications = ApplicationFactory.build_batch(min(messages, 50))
+        for index, application in enumerate(applications):
+            application.reference_number = f'MSA{index:07d}'
+
+        local = threading.local()
+        connections = []
+        lock = threading.Lock()
+
+        def send(index):
+            connection = None
+            if reuse:
+                connection = getattr(local, 'connection', None)
+                if connection is None:
+                    connection = local.connection = get_connection()
+                    connection.open()
+                    with lock:
+                        connections.append(connection)
+            application = applications[index % len(applications)]
+            started = time.perf_counter()
+            # Alternate the two templates the admissions flow sends most
+            if index % 2:
+                ok = EmailService.send_status_update(application, 'pending', 'approved', connection=connection)
+            else:
+                ok = EmailService.send_application_confirmation(application, connection=connection)
+            return ok, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(send, range(messages)))
+        # Batching backends send what is still queued on close
+        for connection in connections:
+            connection.close()
+        elapsed = time.perf_counter() - started
+
+        return {
+            'elapsed': elapsed,
+            'sent': sum(1 for ok, _ in outcomes if ok),
+            'failed': sum(1 for ok, _ in outcomes if not ok),
+            'latencies': sorted(latency for _, latency in outcomes),
+        }
+
+    def print_benchmark(self, result, sink, reuse):
+        from core.benchmarks import percentile
+
+        latencies = result['latencies']
+        if 'requests' in sink:
+            label = 'Batched per sender' if reuse else 'One request per email'
+        else:
+            label = 'Reused connection per sender' if reuse else 'New connection per email'
+        self.stdout.write(f'\n{label}')
+        self.stdout.write(f'  Sent / failed:       {result["sent"]} / {result["failed"]}')
+        self.stdout.write(f'  Throughput:          {result["sent"] / result["elapsed"]:.1f} msgs/sec')
+        self.stdout.write(
+            f'  New connections:     {sink["connections"]} '
+            f'({sink["messages"] / max(sink["connections"], 1):.1f} messages per connection)'
+        )
+        if 'requests' in sink:
+            self.stdout.write(
+                f'  HTTP requests:       {sink["requests"]} '
+                f'({sink["messages"] / max(sink["requests"], 1):.1f} messages per request, '
+                f'{sink["throttled"]} answered 429/503 and retried)'
+            )
+        self.stdout.write(f'  Bytes received:      {sink["bytes"]}')
+        self.stdout.write(
+            '  Latency (ms):        '
+            + '  '.join(
+                f'p{int(fraction * 100)} {percentile(latencies, fraction) * 1000:.1f}'
+                for fraction in (0.5, 0.95, 0.99)
+            )
+        )
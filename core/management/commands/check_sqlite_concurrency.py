@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from core.benchmarks import UNCAPPED_INTAKE
+from core.loadtest import DATABASE_ERROR_MARKER, INTEGRITY_ERROR_MARKER, intake_closed
+
+
+def submit_applications(worker, count):
+    """Run in a forked worker process: POST ``count`` applications through the view"""
+    from django.test import Client
+    from applications.factories import ApplicationFactory
+    from core.benchmarks import application_form_data
+
+    # Never share the parent's SQLite handle across a fork
+    connections.close_all()
+    client = Client()
+    outcomes = {'submitted': 0, 'integrity_errors': 0, 'database_errors': 0, 'intake_closed': 0, 'other_failures': 0}
+
+    for index in range(count):
+        data = application_form_data(ApplicationFactory.build(guardian_email=f'w{worker}-{index}@example.com'))
+        response = client.post('/apply/', data, REMOTE_ADDR=f'10.1.{worker}.{index % 250}')
+        content = response.content.decode()
+        if response.status_code == 302:
+            outcomes['submitted'] += 1
+        elif INTEGRITY_ERROR_MARKER in content:
+            outcomes['integrity_errors'] += 1
+        elif DATABASE_ERROR_MARKER in content:
+            outcomes['database_errors'] += 1
+        elif intake_closed(content):
+            outcomes['intake_closed'] += 1
+        else:
+            outcomes['other_failures'] += 1
+
+    connections.close_all()
+    return outcomes
+
+
+class Command(BaseCommand):
+    help = 'Submit applications from parallel processes against a scratch SQLite database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Parallel worker processes, like gunicorn workers (default: 8)',
+        )
+        parser.add_argument(
+            '--submissions',
+            type=int,
+            default=25,
+            help='Applications submitted by each worker (default: 25)',
+        )
+        parser.add_argument(
+            '--profile',
+            choices=['tuned', 'default'],
+            default='tuned',
+            help='tuned: the configured SQLite profile; default: plain rollback-journal SQLite',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections['default']
+        if connection.vendor != 'sqlite':
+            raise CommandError('check_sqlite_concurrency only applies to SQLite databases')
+
+        original = {
+            'NAME': connection.settings_dict['NAME'],
+            'OPTIONS': dict(connection.settings_dict.get('OPTIONS', {})),
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            connection.close()
+            connection.settings_dict['NAME'] = os.path.join(directory, 'concurrency.sqlite3')
+            if options['profile'] == 'default':
+                connection.settings_dict['OPTIONS'] = {
+                    key: value for key, value in original['OPTIONS'].items()
+                    if key not in ('init_command', 'transaction_mode')
+                }
+
+            setup_test_environment()
+            try:
+                # Forked workers inherit the override
+                with override_settings(**UNCAPPED_INTAKE):
+                    outcomes, elapsed, stored = self.run_workers(options['workers'], options['submissions'])
+            finally:
+                teardown_test_environment()
+                connections.close_all()
+                connection.settings_dict.update(original)
+
+        attempted = options['workers'] * options['submissions']
+        self.stdout.write(
+            f'🧪 {options["workers"]} workers × {options["submissions"]} submissions '
+            f'({options["profile"]} profile) in {elapsed:.2f}s'
+        )
+        self.stdout.write(f'Submitted:        {outcomes["submitted"]}/{attempted}')
+        self.stdout.write(f'Rows stored:      {stored}')
+        self.stdout.write(f'IntegrityErrors:  {outcomes["integrity_errors"]}')
+        self.stdout.write(f'Database errors:  {outcomes["database_errors"]}')
+        self.stdout.write(f'Intake closed:    {outcomes["intake_closed"]}')
+        self.stdout.write(f'Other failures:   {outcomes["other_failures"]}')
+
+        if outcomes['submitted'] == attempted and stored == attempted:
+            self.stdout.write(self.style.SUCCESS('✅ All parallel submissions succeeded'))
+        else:
+            raise CommandError('Some parallel submissions failed')
+
+    def run_workers(self, workers, submissions):
+        from applications.models import Application
+
+        call_command('migrate', verbosity=0)
+        connections.close_all()
+
+        totals = {}
+        start = time.perf_counter()
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [executor.submit(submit_applications, worker, submissions) for worker in range(workers)]
+            for future in futures:
+                for key, value in future.result().items():
+                    totals[key] = totals.get(key, 0) + value
+        elapsed = time.perf_counter() - start
+
+        stored = Application.objects.count()
+        return totals, elapsed, stored
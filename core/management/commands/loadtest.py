@@ -0,0 +1,160 @@
+import json
+import os
+import tempfile
+import threading
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from core import email_log
+from core.benchmarks import UNCAPPED_INTAKE
+from core.loadtest import run_load_test
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Simulate admissions deadline traffic against an embedded server or a running site'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--parents',
+            type=int,
+            default=200,
+            help='Number of virtual parents submitting applications (default: 200)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=20,
+            help='Parents active at the same time (default: 20)',
+        )
+        parser.add_argument(
+            '--refreshes',
+            type=int,
+            default=3,
+            help='Average success-page refreshes per parent (default: 3)',
+        )
+        parser.add_argument(
+            '--lookup-ratio',
+            type=float,
+            default=0.3,
+            help='Share of parents who look up their application afterwards (default: 0.3)',
+        )
+        parser.add_argument(
+            '--url',
+            help='Base URL of a running site; by default an embedded server on a test database is used',
+        )
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1000,
+            help='Applications to seed into the embedded test database (default: 1000)',
+        )
+        parser.add_argument(
+            '--single-ip',
+            action='store_true',
+            help='Send every request from one address instead of one X-Forwarded-For per parent',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            help='Random seed for the traffic mix',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write JSON results to this file',
+        )
+
+    def handle(self, *args, **options):
+        if options['parents'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--parents and --concurrency must be at least 1')
+
+        load_options = {
+            'parents': options['parents'],
+            'concurrency': options['concurrency'],
+            'refreshes': options['refreshes'],
+            'lookup_ratio': options['lookup_ratio'],
+            'forwarded_for': not options['single_ip'],
+            'seed': options['seed'],
+        }
+
+        if options['url']:
+            summary = run_load_test(options['url'], **load_options)
+        else:
+            summary = self.run_embedded(options['rows'], load_options)
+
+        self.print_summary(summary)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(summary, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'✅ Results written to {options["output"]}'))
+
+    def run_embedded(self, rows, load_options):
+        from applications.factories import seed_applications
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        old_test_name = test_settings.get('NAME')
+        directory = None
+        if connection.vendor == 'sqlite' and not old_test_name:
+            # A file, not the shared-cache in-memory test database, which fails
+            # concurrent writers with "table is locked" instead of waiting
+            directory = tempfile.TemporaryDirectory()
+            test_settings['NAME'] = os.path.join(directory.name, 'loadtest.sqlite3')
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        server = None
+        try:
+            if rows:
+                seed_applications(rows)
+
+            server = ThreadedWSGIServer(('127.0.0.1', 0), QuietWSGIRequestHandler)
+            server.set_app(WSGIHandler())
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            host, port = server.server_address
+            self.stderr.write(f'🚀 Embedded server on http://{host}:{port}/')
+
+            with override_settings(**UNCAPPED_INTAKE):
+                return run_load_test(f'http://{host}:{port}', **load_options)
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+            email_log.flush()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            test_settings['NAME'] = old_test_name
+            if directory is not None:
+                directory.cleanup()
+            teardown_test_environment()
+
+    def print_summary(self, summary):
+        self.stdout.write(self.style.SUCCESS('📊 Load test results'))
+        self.stdout.write(f'Elapsed:          {summary["elapsed_s"]}s')
+        self.stdout.write(f'Requests:         {summary["requests"]} ({summary["throughput_rps"]} req/s)')
+        self.stdout.write(f'Submissions:      {summary["submissions"]} ({summary["submissions_per_s"]}/s)')
+        self.stdout.write(f'Rate limited:     {summary["rate_limited"]}')
+        self.stdout.write(f'IntegrityErrors:  {summary["integrity_errors"]}')
+        self.stdout.write(f'Database errors:  {summary["database_errors"]}')
+        self.stdout.write(f'Intake closed:    {summary["intake_closed"]}')
+        self.stdout.write(f'Failed parents:   {summary["failed_parents"]}')
+        for error, count in summary['errors'].items():
+            self.stdout.write(self.style.ERROR(f'  {error}: {count}'))
+
+        self.stdout.write('')
+        self.stdout.write(f'{"request":<14} {"count":>6} {"p50":>8} {"p90":>8} {"p95":>8} {"p99":>8} {"max":>8}  status codes')
+        rows = dict(summary['by_request'], overall=summary['overall'])
+        for kind, stats in rows.items():
+            if not stats:
+                continue
+            codes = ', '.join(f'{code}×{count}' for code, count in sorted(stats.get('status_codes', {}).items()))
+            self.stdout.write(
+                f'{kind:<14} {stats["count"]:>6} {stats["p50_ms"]:>8.1f} {stats["p90_ms"]:>8.1f} '
+                f'{stats["p95_ms"]:>8.1f} {stats["p99_ms"]:>8.1f} {stats["max_ms"]:>8.1f}  {codes}'
+            )
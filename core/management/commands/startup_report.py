@@ -0,0 +1,135 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: load the WSGI application and serve one request
+CHILD_SCRIPT = '''
+import io, json, sys, time
+started = time.perf_counter()
+from morning_star_academy.wsgi import application
+loaded = time.perf_counter()
+from wsgiref.util import setup_testing_defaults
+environ = {'PATH_INFO': sys.argv[1], 'HTTP_HOST': sys.argv[2], 'wsgi.errors': io.StringIO()}
+setup_testing_defaults(environ)
+status = []
+body = b''.join(application(environ, lambda code, headers, exc_info=None: status.append(code)))
+done = time.perf_counter()
+print(json.dumps({
+    'load_ms': (loaded - started) * 1000,
+    'request_ms': (done - loaded) * 1000,
+    'status': status[0],
+    'modules': len(sys.modules),
+}))
+'''
+
+
+def parse_importtime(stderr):
+    """``[(module, self µs, cumulative µs, depth)]`` from ``-X importtime`` output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Report worker start-up cost: import time by package and time to first request'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile',
+            choices=['development', 'production'],
+            default=settings.SETTINGS_PROFILE,
+            help='SETTINGS_PROFILE for the measured process (default: the current one)',
+        )
+        parser.add_argument(
+            '--path',
+            default='/',
+            help='Path of the first request (default: /)',
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=5,
+            help='Fresh processes to time (default: 5)',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=15,
+            help='Packages and modules to list (default: 15)',
+        )
+
+    def handle(self, *args, **options):
+        env = dict(
+            os.environ,
+            SETTINGS_PROFILE=options['profile'],
+            DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'morning_star_academy.settings'),
+        )
+        host = next((host for host in settings.ALLOWED_HOSTS if host not in ('*', '') and not host.startswith('.')),
+                    'localhost')
+        command = [sys.executable, '-c', CHILD_SCRIPT, options['path'], host]
+
+        self.stdout.write(f'🚀 Start-up of the {options["profile"]} profile, first request GET {options["path"]}')
+        runs = []
+        for _ in range(max(options['runs'], 1)):
+            started = time.perf_counter()
+            result = subprocess.run(command, env=env, cwd=settings.BASE_DIR, capture_output=True, text=True)
+            wall_ms = (time.perf_counter() - started) * 1000
+            if result.returncode:
+                raise CommandError(f'Start-up failed:\n{result.stderr[-2000:]}')
+            run = json.loads(result.stdout.strip().splitlines()[-1])
+            run['wall_ms'] = wall_ms
+            runs.append(run)
+
+        if runs[0]['status'][:3] not in ('200', '301', '302'):
+            self.stdout.write(self.style.WARNING(f'First request answered {runs[0]["status"]}'))
+        self.stdout.write(
+            f'Median of {len(runs)} runs: application load {self.median(runs, "load_ms"):.0f} ms, '
+            f'first request {self.median(runs, "request_ms"):.0f} ms, '
+            f'process start to response {self.median(runs, "wall_ms"):.0f} ms '
+            f'({runs[0]["modules"]} modules loaded)'
+        )
+
+        traced = subprocess.run(
+            [sys.executable, '-X', 'importtime'] + command[1:],
+            env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        self.report_imports(parse_importtime(traced.stderr), options['top'])
+
+    def median(self, runs, key):
+        return statistics.median(run[key] for run in runs)
+
+    def report_imports(self, rows, top):
+        total_us = sum(row[1] for row in rows)
+        by_package = defaultdict(lambda: [0, 0])
+        for name, self_us, _, _ in rows:
+            package = by_package[name.split('.')[0]]
+            package[0] += self_us
+            package[1] += 1
+
+        self.stdout.write(f'\nImport time {total_us / 1000:.0f} ms over {len(rows)} modules (single traced run)')
+        self.stdout.write(f'{"package":<28} {"ms":>8} {"share":>7} {"modules":>8}')
+        for package, (self_us, count) in sorted(by_package.items(), key=lambda item: -item[1][0])[:top]:
+            self.stdout.write(f'{package:<28} {self_us / 1000:>8.1f} {self_us / total_us:>6.1%} {count:>8}')
+
+        self.stdout.write(f'\n{"slowest modules (self)":<48} {"ms":>8} {"cumulative":>11}')
+        for name, self_us, cumulative_us, _ in sorted(rows, key=lambda row: -row[1])[:top]:
+            self.stdout.write(f'{name:<48} {self_us / 1000:>8.1f} {cumulative_us / 1000:>11.1f}')
+
+        # What each of the project's own modules drags in
+        project = ('core', 'applications', 'administration', 'morning_star_academy', 'theme')
+        own = [row for row in rows if row[0].split('.')[0] in project]
+        self.stdout.write(f'\n{"project modules (cumulative)":<48} {"ms":>8}')
+        for name, _, cumulative_us, _ in sorted(own, key=lambda row: -row[2])[:top]:
+            self.stdout.write(f'{name:<48} {cumulative_us / 1000:>8.1f}')
@@ -0,0 +1,77 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Report the bytes saved by the hashed, precompressed static files written by collectstatic'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the report as JSON',
+        )
+
+    def handle(self, *args, **options):
+        root = str(settings.STATIC_ROOT)
+        manifest_path = os.path.join(root, 'staticfiles.json')
+        try:
+            with open(manifest_path) as handle:
+                manifest = json.load(handle)['paths']
+        except (OSError, ValueError, KeyError):
+            raise CommandError(
+                f'No static manifest at {manifest_path}. Run collectstatic with STATIC_MANIFEST=True first.'
+            )
+
+        rows = []
+        for name, hashed_name in sorted(manifest.items()):
+            path = os.path.join(root, hashed_name)
+            original = file_size(path)
+            if original is None:
+                continue
+            rows.append({
+                'name': name,
+                'hashed_name': hashed_name,
+                'bytes': original,
+                'gzip': file_size(path + '.gz'),
+                'brotli': file_size(path + '.br'),
+            })
+
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+
+        self.stdout.write(f'{"Asset":<45} {"Original":>10} {"gzip":>10} {"Brotli":>10} {"Saved":>8}')
+        total_original = total_served = 0
+        for row in rows:
+            variants = [size for size in (row['gzip'], row['brotli']) if size is not None]
+            served = min([row['bytes']] + variants)
+            total_original += row['bytes']
+            total_served += served
+            self.stdout.write(
+                f'{row["name"][:45]:<45} {row["bytes"]:>10} '
+                f'{row["gzip"] if row["gzip"] is not None else "-":>10} '
+                f'{row["brotli"] if row["brotli"] is not None else "-":>10} '
+                f'{saved_percent(row["bytes"], served):>8}'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ {len(rows)} assets: {total_original} bytes, {total_served} bytes with the best encoding '
+            f'({saved_percent(total_original, total_served)} saved)'
+        ))
+
+
+def saved_percent(original, served):
+    if not original:
+        return '0%'
+    return f'{(original - served) / original:.0%}'
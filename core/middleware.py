@@ -2,15 +2,38 @@
 Security middleware for Morning Star Academy
 """
 import logging
-from django.http import HttpResponseForbidden
+from django.http import HttpResponseForbidden, HttpResponseNotFound
 from django.core.cache import cache
 from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 from django.contrib.auth.models import AnonymousUser
 
+from .scanners import SCANNER_PATTERNS, compile_patterns, scanner_log
+
 logger = logging.getLogger('django.security')
 
 
+class ScannerFilterMiddleware:
+    """
+    Answer known vulnerability-scanner probes with a tiny static 404 before
+    any other middleware or URL resolution runs (see core.scanners)
+    """
+    
+    body = b'Not Found'
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pattern = compile_patterns(SCANNER_PATTERNS + tuple(getattr(settings, 'SCANNER_EXTRA_PATTERNS', ())))
+    
+    def __call__(self, request):
+        if self.pattern.search(request.path_info):
+            scanner_log.add(request.path_info[:200], request.META.get('REMOTE_ADDR'))
+            response = HttpResponseNotFound(self.body, content_type='text/plain')
+            response['X-Content-Type-Options'] = 'nosniff'
+            return response
+        return self.get_response(request)
+
+
 class SecurityHeadersMiddleware(MiddlewareMixin):
     """
     Add additional security headers to responses
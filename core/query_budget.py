@@ -0,0 +1,108 @@
+"""
+Query budgets for Morning Star Academy views
+
+A view declares the maximum number of database queries it may issue per
+request, either with the ``query_budget`` decorator (function views) or the
+``QueryBudgetMixin`` (class-based views). When ``QUERY_BUDGET_MODE`` is
+``'log'`` or ``'raise'`` the queries issued while the view runs (including
+template rendering) are counted and overflows are reported.
+"""
+import logging
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in ``'raise'`` mode when a view issues more queries than allowed"""
+
+
+class QueryCounter:
+    """Database execute wrapper that counts the queries passing through it"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    """Count queries issued on every configured database connection"""
+    counter = QueryCounter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        yield counter
+
+
+def get_budget_mode():
+    return getattr(settings, 'QUERY_BUDGET_MODE', 'off')
+
+
+def check_budget(view_name, budget, used):
+    """Log or raise when ``used`` exceeds ``budget`` according to the mode"""
+    if used <= budget:
+        return
+    message = f'Query budget exceeded for {view_name}: {used} queries (budget {budget})'
+    if get_budget_mode() == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def _run_counted(view_name, budget, func, *args, **kwargs):
+    with count_queries() as counter:
+        response = func(*args, **kwargs)
+        # Lazy template responses run their queries at render time
+        if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+            response.render()
+    check_budget(view_name, budget, counter.count)
+    return response
+
+
+def query_budget(max_queries):
+    """Decorator declaring the maximum number of queries for a function view"""
+    def decorator(view_func):
+        view_name = f'{view_func.__module__}.{view_func.__name__}'
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if get_budget_mode() == 'off':
+                return view_func(request, *args, **kwargs)
+            return _run_counted(view_name, max_queries, view_func, request, *args, **kwargs)
+
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
+
+
+class QueryBudgetMixin:
+    """
+    Class-based view mixin declaring the maximum number of queries per request
+    """
+    query_budget = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.query_budget is None or get_budget_mode() == 'off':
+            return super().dispatch(request, *args, **kwargs)
+        view_name = f'{self.__class__.__module__}.{self.__class__.__name__}'
+        return _run_counted(
+            view_name, self.query_budget, super().dispatch, request, *args, **kwargs
+        )
+
+
+def get_view_budget(callback):
+    """Return the query budget declared by a resolved URL callback, if any"""
+    budget = getattr(callback, 'query_budget', None)
+    if budget is not None:
+        return budget
+    view_class = getattr(callback, 'view_class', None)
+    if view_class is not None:
+        return getattr(view_class, 'query_budget', None)
+    return None
@@ -0,0 +1,80 @@
+"""
+Fast path for scanner traffic
+
+Bots probe every site for WordPress logins, ``.env`` files, PHP admin tools
+and the like. ``ScannerFilterMiddleware`` matches each path against one
+compiled regular expression before sessions, authentication or URL
+resolution run, and answers a match with a fixed plain-text 404. Hits are
+counted in memory and logged as one summary line every
+``SCANNER_LOG_INTERVAL`` seconds (and at exit) instead of one line each.
+
+``SCANNER_EXTRA_PATTERNS`` adds site-specific patterns. Every pattern must
+stay clear of the project's real URLs and static files, which
+``core/tests/test_scanners.py`` checks.
+"""
+import atexit
+import logging
+import re
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+logger = logging.getLogger('django.security')
+
+SCANNER_PATTERNS = (
+    # Scripts and config files this site never serves
+    r'\.(?:php\d?|aspx?|jsp|cgi|env|ini|sql|bak|old|swp)$',
+    # Dotfiles and dot-directories: .env, .git/, .aws/, .DS_Store
+    r'/\.(?!well-known/)',
+    r'^/(?:wp-admin|wp-content|wp-includes|wp-json|wordpress|phpmyadmin|pma|myadmin|adminer|xmlrpc)(?:/|$)',
+    r'^/(?:cgi-bin|vendor|actuator|boaform|HNAP1|owa|ecp|solr|autodiscover)(?:/|$)',
+    r'/etc/passwd|\.\./',
+)
+MAX_TRACKED_PATHS = 500
+
+
+def compile_patterns(patterns):
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
+class ScannerLog:
+    """Per-process tally of scanner hits, logged as periodic summaries"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.paths = Counter()
+        self.addresses = set()
+        self.started = time.monotonic()
+
+    def add(self, path, address):
+        with self.lock:
+            self.hits += 1
+            if path in self.paths or len(self.paths) < MAX_TRACKED_PATHS:
+                self.paths[path] += 1
+            self.addresses.add(address)
+            due = time.monotonic() - self.started >= getattr(settings, 'SCANNER_LOG_INTERVAL', 60)
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            hits, paths, addresses, started = self.hits, self.paths, self.addresses, self.started
+            self.reset()
+        if not hits:
+            return 0
+        top = ', '.join(f'{path} x{count}' for path, count in paths.most_common(5))
+        logger.warning(
+            f'Scanner probes answered with 404: {hits} in {time.monotonic() - started:.0f}s '
+            f'from {len(addresses)} addresses; top paths: {top}'
+        )
+        return hits
+
+
+scanner_log = ScannerLog()
+atexit.register(scanner_log.flush)
@@ -0,0 +1,36 @@
+"""
+Session engines for Morning Star Academy
+
+``SESSION_STORE`` chooses one of the modules in this package as
+``SESSION_ENGINE``:
+
+- ``db``: Django's database sessions
+- ``cached_db``: reads come from the cache and fall back to the database;
+  writes go to both
+- ``cache``: cache only, for a shared cache such as Redis where losing
+  sessions on a cache flush is acceptable
+
+Each engine also skips the write when a request marked the session
+modified but left its contents as they were loaded, such as re-assigning
+an unchanged value.
+"""
+
+
+class SkipUnchangedSaveMixin:
+    """Don't write a loaded session back when its data is unchanged"""
+
+    loaded_state = None
+
+    def snapshot(self):
+        return self.serializer().dumps(self._session)
+
+    def load(self):
+        data = super().load()
+        self.loaded_state = self.serializer().dumps(data) if self._session_key else None
+        return data
+
+    def save(self, must_create=False):
+        if not must_create and self.loaded_state is not None and self.snapshot() == self.loaded_state:
+            return
+        super().save(must_create=must_create)
+        self.loaded_state = self.snapshot()
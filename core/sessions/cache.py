@@ -0,0 +1,7 @@
+from django.contrib.sessions.backends import cache
+
+from . import SkipUnchangedSaveMixin
+
+
+class SessionStore(SkipUnchangedSaveMixin, cache.SessionStore):
+    pass
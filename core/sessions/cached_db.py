@@ -0,0 +1,7 @@
+from django.contrib.sessions.backends import cached_db
+
+from . import SkipUnchangedSaveMixin
+
+
+class SessionStore(SkipUnchangedSaveMixin, cached_db.SessionStore):
+    pass
@@ -0,0 +1,7 @@
+from django.contrib.sessions.backends import db
+
+from . import SkipUnchangedSaveMixin
+
+
+class SessionStore(SkipUnchangedSaveMixin, db.SessionStore):
+    pass
@@ -0,0 +1,92 @@
+"""
+Local SMTP sink for email benchmarks
+
+A small threaded SMTP server that accepts and discards every message while
+counting connections and messages. It speaks just enough SMTP (EHLO/HELO,
+MAIL, RCPT, DATA, RSET, NOOP, QUIT) for Django's SMTP backend, and can add
+a per-message delay to imitate a remote provider.
+"""
+import socketserver
+import threading
+import time
+
+
+class SinkStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+        self.bytes = 0
+
+    def add(self, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self):
+        with self.lock:
+            return {'connections': self.connections, 'messages': self.messages, 'bytes': self.bytes}
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode('ascii'))
+
+    def handle(self):
+        stats = self.server.stats
+        stats.add(connections=1)
+        self.reply('220 morning-star-sink ESMTP')
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+
+            if verb == 'EHLO':
+                self.reply('250-morning-star-sink')
+                self.reply('250-8BITMIME')
+                self.reply('250 SIZE 10485760')
+            elif verb in ('HELO', 'MAIL', 'RCPT', 'RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                size = 0
+                for data_line in self.rfile:
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                    size += len(data_line)
+                if self.server.delay:
+                    time.sleep(self.server.delay)
+                stats.add(messages=1, bytes=size)
+                self.reply('250 OK queued')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0, delay=0):
+        super().__init__((host, port), SMTPSinkHandler)
+        self.stats = SinkStats()
+        self.delay = delay
+        self.thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,73 @@
+import hashlib
+import os
+
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+
+from core import critical_css
+
+register = template.Library()
+
+FONTS_URL = 'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap'
+
+_versions = {}
+_critical = {}
+
+
+def mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def versioned_static(name):
+    """
+    Static URL that changes with the file's content. The manifest storage
+    already puts the hash in the file name; otherwise it goes in ``?v=``.
+    """
+    path = None if settings.STATIC_MANIFEST else critical_css.find_stylesheet(name)
+    if path is None:
+        return static(name)
+    stamp = mtime(path)
+    if _versions.get(name, (None,))[0] != stamp:
+        with open(path, 'rb') as handle:
+            _versions[name] = (stamp, hashlib.sha256(handle.read()).hexdigest()[:12])
+    return f'{static(name)}?v={_versions[name][1]}'
+
+
+def get_critical_css(page):
+    """
+    The page's critical CSS, or None when it has not been built, was cut
+    from stylesheets that have changed since, or a stylesheet is missing
+    """
+    stylesheets = [critical_css.find_stylesheet(name) for name in critical_css.STYLESHEETS]
+    if None in stylesheets:
+        return None
+    paths = [critical_css.critical_path(page), critical_css.manifest_path()] + stylesheets
+    stamps = tuple(mtime(path) for path in paths)
+    if _critical.get(page, (None,))[0] != stamps:
+        css = None
+        manifest = critical_css.load_manifest()
+        if (None not in stamps and page in manifest.get('pages', {})
+                and manifest.get('stylesheets') == critical_css.stylesheets_hash()):
+            with open(paths[0], encoding='utf-8') as handle:
+                css = handle.read()
+        _critical[page] = (stamps, css)
+    return _critical[page][1]
+
+
+@register.inclusion_tag('components/stylesheets.html')
+def page_stylesheets(page=None):
+    """
+    Site stylesheets for ``<head>``. With a page name whose critical CSS has
+    been built, that CSS is inlined and the full stylesheets load without
+    blocking the first render.
+
+        {% page_stylesheets 'home' %}
+    """
+    return {
+        'critical_css': get_critical_css(page) if page else None,
+        'stylesheets': [versioned_static(name) for name in critical_css.STYLESHEETS] + [FONTS_URL],
+    }
@@ -0,0 +1,69 @@
+import os
+
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from core.images import load_manifest, manifest_path
+
+register = template.Library()
+
+_manifest = {'mtime': None, 'data': {}}
+
+# A failed <picture> keeps retrying its sources, so an onerror that swaps the
+# image first drops them and the srcset to let ``this.src`` take effect
+PICTURE_ONERROR = (
+    "var p=this.parentNode;p.querySelectorAll('source').forEach(function(s){p.removeChild(s)});"
+    "this.removeAttribute('srcset');this.onerror=null;"
+)
+
+
+def get_manifest():
+    """The derivative manifest, re-read only when build_images rewrites it"""
+    try:
+        mtime = os.path.getmtime(manifest_path())
+    except OSError:
+        return {}
+    if mtime != _manifest['mtime']:
+        _manifest['data'] = load_manifest()
+        _manifest['mtime'] = mtime
+    return _manifest['data']
+
+
+def srcset(variants):
+    return ', '.join(f"{static(variant['path'])} {variant['width']}w" for variant in variants)
+
+
+@register.simple_tag
+def responsive_image(name, alt='', sizes='100vw', loading='lazy', **attrs):
+    """
+    ``<picture>`` with WebP and resized sources for a static image, falling
+    back to a plain ``<img>`` when build_images has not been run. An
+    ``onerror`` handler runs on the ``<img>`` with the sources removed.
+
+        {% responsive_image 'images/school-exterior.jpg' alt='School' class='w-full' sizes='33vw' %}
+    """
+    attrs.update(alt=alt, loading=loading, decoding='async')
+    entry = get_manifest().get(name)
+    if not entry:
+        return format_html(
+            '<img src="{}" {}>',
+            static(name),
+            format_html_join(' ', '{}="{}"', attrs.items()),
+        )
+
+    fallback_format = next(key for key in entry['variants'] if key != 'webp')
+    fallback = entry['variants'][fallback_format]
+    attrs.update(width=entry['width'], height=entry['height'])
+    if 'onerror' in attrs:
+        attrs['onerror'] = PICTURE_ONERROR + attrs['onerror']
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" {}></picture>',
+        srcset(entry['variants']['webp']),
+        sizes,
+        static(fallback[-1]['path']),
+        srcset(fallback),
+        sizes,
+        format_html_join(' ', '{}="{}"', attrs.items()),
+    )
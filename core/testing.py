@@ -0,0 +1,128 @@
+"""
+pytest plugin for Morning Star Academy
+
+Loaded through ``pytest.ini`` (``-p core.testing``). Provides a seeded
+database and a fixture that checks every project URL against the query
+budget declared on its view (see ``core.query_budget``).
+"""
+import os
+import uuid
+
+import pytest
+
+BUDGETED_NAMESPACES = ('core', 'applications', 'administration')
+
+# A GET of these URLs answers with something other than 200 by design
+EXPECTED_STATUSES = {
+    'applications:start_document_upload': 405,
+    'applications:document_upload': 405,
+    'administration:logout': 302,
+}
+
+# URLs whose ``pk`` is not an application's
+URL_KWARG_NAMES = {
+    'administration:document_download': {'pk': 'document_pk'},
+}
+
+
+def iter_project_urls(patterns=None, namespace=None):
+    """Yield ``(url_name, url_pattern)`` for the project's own URL patterns"""
+    from django.urls import URLPattern, URLResolver, get_resolver
+
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+
+    for entry in patterns:
+        if isinstance(entry, URLResolver):
+            yield from iter_project_urls(entry.url_patterns, entry.namespace or namespace)
+        elif isinstance(entry, URLPattern) and namespace in BUDGETED_NAMESPACES and entry.name:
+            yield f'{namespace}:{entry.name}', entry
+
+
+@pytest.fixture
+def seeded_applications(db):
+    """Synthetic applications across statuses, grades and dates"""
+    from applications.factories import seed_applications
+
+    return seed_applications(50)
+
+
+@pytest.fixture
+def staff_user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='staff', password='not-a-real-password', is_staff=True
+    )
+
+
+@pytest.fixture
+def uploaded_document(seeded_applications, settings, tmp_path):
+    """A processed PDF document of the first seeded application"""
+    from applications.documents import complete_upload, partial_path
+    from applications.models import ApplicationDocument
+
+    settings.MEDIA_ROOT = str(tmp_path)
+    document = ApplicationDocument.objects.create(
+        application=seeded_applications[0], document_type='report_card', original_name='report.pdf',
+        content_type='application/pdf', size=5, checksum='abc',
+    )
+    os.makedirs(os.path.dirname(partial_path(document)))
+    with open(partial_path(document), 'wb') as handle:
+        handle.write(b'%PDF-')
+    complete_upload(document)
+    return document
+
+
+@pytest.fixture
+def url_kwargs(seeded_applications, uploaded_document):
+    """Sample values for the keyword arguments used in project URLs"""
+    from applications.tokens import make_verification_token
+
+    application = seeded_applications[0]
+    return {
+        'pk': application.pk,
+        'document_pk': uploaded_document.pk,
+        'ref_number': application.reference_number,
+        'token': make_verification_token(application),
+        'upload_id': uuid.uuid4(),
+    }
+
+
+@pytest.fixture
+def assert_query_budgets(client, staff_user, url_kwargs):
+    """
+    Callable fixture: GET every project URL as a staff user and assert that
+    each declares a query budget and stays within it. A URL answering with
+    anything but its expected status (200 unless listed in
+    ``EXPECTED_STATUSES``) fails too, since its budget was not measured.
+    """
+    from django.urls import reverse
+    from core.query_budget import count_queries, get_view_budget
+
+    def check(skip=()):
+        failures = []
+        for url_name, pattern in iter_project_urls():
+            if url_name in skip:
+                continue
+            budget = get_view_budget(pattern.callback)
+            if budget is None:
+                failures.append(f'{url_name}: no query budget declared')
+                continue
+
+            names = URL_KWARG_NAMES.get(url_name, {})
+            kwargs = {name: url_kwargs[names.get(name, name)] for name in pattern.pattern.regex.groupindex}
+            url = reverse(url_name, kwargs=kwargs)
+
+            # Log in outside the measured block so only the request is counted
+            client.force_login(staff_user)
+            with count_queries() as counter:
+                response = client.get(url)
+            response.close()
+            expected = EXPECTED_STATUSES.get(url_name, 200)
+            if response.status_code != expected:
+                failures.append(f'{url_name} ({url}): status {response.status_code}, expected {expected}')
+            elif counter.count > budget:
+                failures.append(f'{url_name} ({url}): {counter.count} queries, budget {budget}')
+
+        assert not failures, 'Query budget violations:\n' + '\n'.join(failures)
+
+    return check
@@ -0,0 +1,21 @@
+from core.checks import check_shared_cache
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+REDIS = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache'}}
+
+
+def test_per_process_cache_warns_in_production(settings):
+    settings.DEBUG = False
+    settings.CACHES = LOCMEM
+
+    assert [warning.id for warning in check_shared_cache(None)] == ['core.W001']
+
+
+def test_shared_cache_and_debug_do_not_warn(settings):
+    settings.DEBUG = False
+    settings.CACHES = REDIS
+    assert check_shared_cache(None) == []
+
+    settings.DEBUG = True
+    settings.CACHES = LOCMEM
+    assert check_shared_cache(None) == []
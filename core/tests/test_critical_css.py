@@ -0,0 +1,29 @@
+import pytest
+
+from core import critical_css
+from core.templatetags import critical_css as tags
+
+
+@pytest.fixture
+def missing_stylesheet(settings, monkeypatch):
+    settings.STATIC_MANIFEST = False
+    monkeypatch.setattr(critical_css, 'STYLESHEETS', critical_css.STYLESHEETS + ('css/missing.css',))
+    monkeypatch.setattr(critical_css, '_stylesheet_paths', {})
+    lookups = []
+    find = critical_css.finders.find
+    monkeypatch.setattr(critical_css.finders, 'find', lambda name: lookups.append(name) or find(name))
+    return lookups
+
+
+def test_missing_stylesheet_falls_back_to_plain_links(missing_stylesheet):
+    context = tags.page_stylesheets('home')
+
+    assert context['critical_css'] is None
+    assert f'{critical_css.settings.STATIC_URL}css/missing.css' in context['stylesheets']
+
+
+def test_stylesheet_lookups_are_cached(missing_stylesheet):
+    tags.page_stylesheets('home')
+    tags.page_stylesheets('home')
+
+    assert sorted(missing_stylesheet) == sorted(critical_css.STYLESHEETS)
@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+
+from core import db_metrics
+
+
+def fake_connection(pool):
+    return SimpleNamespace(settings_dict={'OPTIONS': {'pool': {'max_size': 4}} if pool else {}})
+
+
+def test_per_request_connections_are_counted_as_opened(monkeypatch):
+    monkeypatch.setattr(db_metrics, 'get_pool_stats', lambda alias='default': None)
+    metrics = db_metrics.ConnectionChurnMetrics()
+    for _ in range(3):
+        metrics.on_connection_created(None, fake_connection(pool=False))
+        metrics.on_request_finished(None)
+
+    assert metrics.snapshot()['connections_per_request'] == 1
+
+
+def test_pool_checkouts_are_not_counted_as_new_connections(monkeypatch):
+    stats = {'connections_num': 5}
+    monkeypatch.setattr(db_metrics, 'get_pool_stats', lambda alias='default': dict(stats))
+    metrics = db_metrics.ConnectionChurnMetrics()
+    metrics.reset()
+    stats['connections_num'] = 7
+    for _ in range(10):
+        metrics.on_connection_created(None, fake_connection(pool=True))
+        metrics.on_request_finished(None)
+
+    snapshot = metrics.snapshot()
+    assert snapshot['connections_opened'] == 2
+    assert snapshot['pool_checkouts'] == 10
+    assert snapshot['connections_per_request'] == 0.2
@@ -0,0 +1,66 @@
+import copy
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from django.urls import reverse
+
+from applications.factories import ApplicationFactory
+from applications.models import Application
+from core.db_router import REPLICA_ALIAS
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.filterwarnings('ignore:Overriding setting DATABASES'),
+]
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    """A second SQLite database as the replica; unlike a test MIRROR its rows can differ"""
+    replica_settings = dict(copy.deepcopy(connections['default'].settings_dict), NAME=str(tmp_path / 'replica.sqlite3'))
+    settings.DATABASES = dict(settings.DATABASES, **{REPLICA_ALIAS: replica_settings})
+    connections.settings[REPLICA_ALIAS] = replica_settings
+    # Connect up front: the test case only allows new connections to the
+    # databases it was set up with, and the test client keeps this one open
+    connections[REPLICA_ALIAS].connect()
+    call_command('migrate', database=REPLICA_ALIAS, verbosity=0)
+    yield REPLICA_ALIAS
+    connections[REPLICA_ALIAS].close()
+    del connections[REPLICA_ALIAS]
+    del connections.settings[REPLICA_ALIAS]
+
+
+@pytest.fixture
+def application(replica):
+    """The same application on both databases; the replica copy has a stale name"""
+    application = ApplicationFactory(status='pending', student_last_name='Primary')
+    stale = Application.all_years.get(pk=application.pk)
+    stale.student_last_name = 'Replica'
+    Application.all_years.db_manager(replica).bulk_create([stale])
+    return application
+
+
+@pytest.fixture
+def staff_client(client, staff_user):
+    client.force_login(staff_user)
+    return client
+
+
+def test_staff_list_and_detail_read_from_the_replica(staff_client, application):
+    listing = staff_client.get(reverse('administration:application_list'))
+    detail = staff_client.get(reverse('administration:application_detail', args=[application.pk]))
+
+    assert [row.student_last_name for row in listing.context['applications']] == ['Replica']
+    assert detail.context['application'].student_last_name == 'Replica'
+
+
+def test_a_write_pins_the_staff_member_to_the_primary(staff_client, application):
+    url = reverse('administration:application_detail', args=[application.pk])
+
+    staff_client.post(url, {'status': 'rejected'})
+    detail = staff_client.get(url)
+
+    assert detail.context['application'].student_last_name == 'Primary'
+    assert detail.context['application'].status == 'rejected'
+    assert Application.all_years.db_manager(REPLICA_ALIAS).get(pk=application.pk).status == 'pending'
@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+import pytest
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.core.management import call_command
+from django.utils import timezone
+
+from applications.factories import ApplicationFactory
+from applications.models import Application, EmailLog
+from core import email_log
+from core.email_backends import EmailAPIError
+from core.fake_email_provider import FakeEmailProvider
+
+
+@pytest.fixture
+def provider():
+    provider = FakeEmailProvider().start()
+    yield provider
+    provider.stop()
+
+
+@pytest.fixture
+def http_email(settings, provider):
+    settings.EMAIL_BACKEND = 'core.email_backends.BatchEmailBackend'
+    settings.EMAIL_API_PROVIDER = 'batch'
+    settings.EMAIL_API_URL = provider.url
+    settings.EMAIL_API_KEY = provider.api_key
+    settings.EMAIL_API_BACKOFF = 0
+    return settings
+
+
+def message(to='parent@example.com', **kwargs):
+    return EmailMessage('Subject', 'Body', 'school@example.com', [to] if to else [], **kwargs)
+
+
+def test_queued_messages_report_each_outcome(http_email, provider):
+    outcomes = []
+    good = message()
+    bad = message(to='other@example.com')
+    bad.body = ''  # the provider rejects messages without content
+    for email in (good, bad):
+        email.on_delivery = lambda ok, error, email=email: outcomes.append((email, ok))
+
+    connection = get_connection()
+    connection.open()
+    connection.send_messages([good, bad])
+    assert (good.delivery_status, bad.delivery_status) == ('queued', 'queued')
+    connection.close()
+
+    assert outcomes == [(good, True), (bad, False)]
+    assert bad.delivery_error
+    assert len(provider.outbox) == 1
+
+
+def test_unobserved_failures_raise_on_close(http_email):
+    http_email.EMAIL_API_KEY = 'wrong-key'
+    connection = get_connection()
+    connection.open()
+    connection.send_messages([message()])
+    with pytest.raises(EmailAPIError):
+        connection.close()
+
+
+def test_immediate_send_raises_for_its_own_failure(http_email):
+    http_email.EMAIL_API_KEY = 'wrong-key'
+    with pytest.raises(EmailAPIError):
+        message().send()
+
+
+@pytest.mark.django_db
+def test_send_reminders_records_failures_when_the_batch_fails_at_close(http_email, tmp_path):
+    http_email.EMAIL_API_KEY = 'wrong-key'
+    applications = ApplicationFactory.create_batch(
+        3, status='pending', next_reminder_at=timezone.now() - timedelta(minutes=1), email_verified_at=None,
+    )
+
+    call_command('send_reminders', lock_file=str(tmp_path / 'lock'))
+    email_log.flush()
+
+    statuses = list(EmailLog.objects.filter(email_type='reminder').values_list('status', flat=True))
+    assert statuses == ['failed'] * 3
+    for application in Application.all_years.filter(pk__in=[a.pk for a in applications]):
+        assert application.reminders_sent == 0
+
+
+@pytest.mark.parametrize('api', ['sendgrid', 'mailgun'])
+def test_provider_adapters_deliver_through_the_pooled_session(settings, provider, api):
+    settings.EMAIL_BACKEND = 'core.email_backends.BatchEmailBackend'
+    settings.EMAIL_API_PROVIDER = api
+    settings.EMAIL_API_URL = provider.url_for(api)
+    settings.EMAIL_API_KEY = provider.api_key
+
+    emails = []
+    for index in range(3):
+        email = EmailMultiAlternatives('Subject', 'Text body', 'school@example.com', [f'parent{index}@example.com'])
+        email.attach_alternative('<p>HTML body</p>', 'text/html')
+        emails.append(email)
+    emails[0].attach('letter.txt', 'Admission letter', 'text/plain')
+
+    connection = get_connection()
+    connection.open()
+    connection.send_messages(emails)
+    connection.close()
+
+    assert [email.delivery_status for email in emails] == ['sent'] * 3
+    assert sorted(sent['to'][0] for sent in provider.outbox) == [f'parent{index}@example.com' for index in range(3)]
+    assert all(sent['html'] == '<p>HTML body</p>' for sent in provider.outbox)
+    assert any(sent['attachments'] for sent in provider.outbox)
+    assert provider.stats.snapshot()['requests'] == 3
@@ -0,0 +1,50 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from applications.models import EmailLog
+from core import email_log
+from core.management.commands import benchmark
+
+pytestmark = pytest.mark.django_db
+
+
+def record():
+    email_log.record(email_type='test', recipient='parent@example.com', subject='Test', status='sent')
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer():
+    email_log.buffer.flush()
+    yield
+    email_log.buffer.entries.clear()
+    email_log.buffer.oldest = None
+
+
+def test_benchmark_teardown_leaves_nothing_buffered(monkeypatch, tmp_path):
+    destroyed = []
+    monkeypatch.setattr(connection.creation, 'create_test_db', lambda **kwargs: None)
+    monkeypatch.setattr(
+        connection.creation, 'destroy_test_db',
+        lambda *args, **kwargs: destroyed.append(list(email_log.buffer.entries)),
+    )
+    monkeypatch.setattr(benchmark, 'setup_test_environment', lambda: None)
+    monkeypatch.setattr(benchmark, 'teardown_test_environment', lambda: None)
+    monkeypatch.setattr(benchmark.Command, 'run_suite', lambda self, *args: record() or {})
+
+    call_command('benchmark', output=str(tmp_path / 'results.json'))
+
+    assert destroyed == [[]]
+    assert EmailLog.objects.count() == 1
+
+
+def test_entries_from_another_database_are_dropped():
+    record()
+    connection.settings_dict['NAME'], old_name = 'elsewhere', connection.settings_dict['NAME']
+    try:
+        assert email_log.flush() == 0
+    finally:
+        connection.settings_dict['NAME'] = old_name
+
+    assert email_log.buffer.entries == []
+    assert EmailLog.objects.count() == 0
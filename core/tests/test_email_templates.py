@@ -0,0 +1,37 @@
+import os
+import shutil
+
+import pytest
+
+from core import email_templates
+
+TEMPLATE = 'emails/status_approved.html'
+
+
+@pytest.fixture
+def project(settings, tmp_path):
+    """A copy of the email templates to build and edit"""
+    shutil.copytree(os.path.join(settings.BASE_DIR, 'templates', 'emails'), tmp_path / 'templates' / 'emails',
+                    ignore=shutil.ignore_patterns(email_templates.COMPILED_DIR))
+    settings.BASE_DIR = tmp_path
+    settings.TEMPLATES = [dict(settings.TEMPLATES[0], DIRS=[tmp_path / 'templates'])]
+    return tmp_path
+
+
+def test_source_is_used_until_templates_are_built(project):
+    assert email_templates.email_template(TEMPLATE).origin.template_name == TEMPLATE
+
+    email_templates.build()
+
+    assert email_templates.email_template(TEMPLATE).origin.template_name == email_templates.compiled_name(TEMPLATE)
+
+
+def test_edited_source_wins_over_a_stale_compiled_copy(project, caplog):
+    email_templates.build()
+    path = email_templates.source_path(TEMPLATE)
+    with open(path, 'a') as handle:
+        handle.write('\n{# edited #}\n')
+    os.utime(path, (os.path.getatime(path), os.path.getmtime(path) + 5))
+
+    assert email_templates.email_template(TEMPLATE).origin.template_name == TEMPLATE
+    assert 'out of date' in caplog.text
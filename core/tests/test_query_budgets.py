@@ -0,0 +1,28 @@
+import pytest
+from django.urls import reverse
+
+from core.query_budget import QueryBudgetExceeded
+
+
+def test_project_urls_stay_within_query_budgets(assert_query_budgets):
+    assert_query_budgets()
+
+
+def test_raise_mode_turns_overflow_into_an_error(client, staff_user, seeded_applications, settings, monkeypatch):
+    from administration.views import DashboardView
+
+    settings.QUERY_BUDGET_MODE = 'raise'
+    client.force_login(staff_user)
+    assert client.get(reverse('administration:dashboard')).status_code == 200
+
+    monkeypatch.setattr(DashboardView, 'query_budget', 1)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get(reverse('administration:dashboard'))
+
+
+def test_unexpected_status_fails_the_budget_check(assert_query_budgets, monkeypatch):
+    from core import testing
+
+    monkeypatch.setitem(testing.EXPECTED_STATUSES, 'core:home', 404)
+    with pytest.raises(AssertionError, match='core:home .*status 200, expected 404'):
+        assert_query_budgets()
@@ -0,0 +1,29 @@
+from core.templatetags import responsive_images
+
+ENTRY = {
+    'width': 800,
+    'height': 600,
+    'variants': {
+        'webp': [{'path': 'images/derived/photo-400.webp', 'width': 400}],
+        'jpeg': [{'path': 'images/derived/photo-400.jpg', 'width': 400}],
+    },
+}
+
+
+def test_onerror_inside_picture_drops_the_sources_first(monkeypatch):
+    monkeypatch.setattr(responsive_images, 'get_manifest', lambda: {'images/photo.jpg': ENTRY})
+
+    html = responsive_images.responsive_image('images/photo.jpg', onerror="this.src='fallback.svg';")
+
+    assert '<picture>' in html
+    handler = html.split('onerror="')[1].split('"')[0]
+    assert handler.index('removeChild') < handler.index('this.src=')
+
+
+def test_onerror_on_a_plain_image_is_left_alone(monkeypatch):
+    monkeypatch.setattr(responsive_images, 'get_manifest', lambda: {})
+
+    html = responsive_images.responsive_image('images/photo.jpg', onerror="this.style.display='none';")
+
+    assert 'removeChild' not in html
+    assert 'onerror="this.style.display=&#x27;none&#x27;;"' in html
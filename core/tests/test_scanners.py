@@ -0,0 +1,85 @@
+import logging
+import re
+
+import pytest
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.urls import URLResolver, get_resolver
+
+from core.scanners import SCANNER_PATTERNS, ScannerLog, compile_patterns, scanner_log
+
+SCANNER = compile_patterns(SCANNER_PATTERNS + tuple(getattr(settings, 'SCANNER_EXTRA_PATTERNS', ())))
+
+PROBES = [
+    '/wp-login.php', '/wp-admin/', '/wordpress/', '/.env', '/.git/config', '/phpmyadmin/index.php',
+    '/pma', '/adminer', '/xmlrpc.php', '/cgi-bin/luci', '/static/../../etc/passwd',
+]
+
+
+def sample_path(route):
+    """A concrete path for a URL route or regex: every parameter becomes ``sample``"""
+    route = re.sub(r'<[^>]+>', 'sample', route)
+    route = re.sub(r'\(\?P<\w+>[^)]*\)', 'sample', route)
+    return route.replace('^', '').replace('$', '').replace('\\', '')
+
+
+def iter_routes(patterns=None, prefix='/'):
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for entry in patterns:
+        path = prefix + sample_path(str(entry.pattern))
+        if isinstance(entry, URLResolver):
+            yield from iter_routes(entry.url_patterns, path)
+        else:
+            yield path
+
+
+def iter_static_urls():
+    # Files collectstatic skips are never served
+    for finder in finders.get_finders():
+        for path, _ in finder.list(['CVS', '.*', '*~']):
+            yield settings.STATIC_URL + path.replace('\\', '/')
+
+
+@pytest.mark.parametrize('path', PROBES)
+def test_probes_match(path):
+    assert SCANNER.search(path)
+
+
+def test_project_urls_and_static_files_are_not_scanner_probes():
+    caught = [path for path in [*iter_routes(), *iter_static_urls()] if SCANNER.search(path)]
+
+    assert not caught
+
+
+@pytest.mark.parametrize('path', ['/pmail/', '/adminerator/', '/wp-guide/', '/.well-known/security.txt'])
+def test_neighbouring_paths_are_not_probes(path):
+    assert not SCANNER.search(path)
+
+
+@pytest.mark.django_db
+def test_probe_gets_a_bare_404_without_queries(client, django_assert_num_queries):
+    scanner_log.reset()
+    with django_assert_num_queries(0):
+        response = client.get('/wp-login.php')
+
+    assert response.status_code == 404
+    assert response.content == b'Not Found'
+    assert 'Set-Cookie' not in response
+    assert scanner_log.paths['/wp-login.php'] == 1
+    # Nothing left for the exit summary, which would log after pytest closes its streams
+    scanner_log.reset()
+
+
+def test_scanner_log_summarises_hits(caplog):
+    log = ScannerLog()
+    log.add('/.env', '10.0.0.1')
+    log.add('/.env', '10.0.0.2')
+    log.add('/wp-login.php', '10.0.0.1')
+
+    with caplog.at_level(logging.WARNING, logger='django.security'):
+        assert log.flush() == 3
+
+    message, = [record.getMessage() for record in caplog.records]
+    assert '3 in' in message and 'from 2 addresses' in message and '/.env x2' in message
+    assert log.flush() == 0
@@ -1,8 +1,11 @@
 from django.shortcuts import render
 from django.views.generic import TemplateView
+from .query_budget import QueryBudgetMixin
 
-class HomeView(TemplateView):
+class HomeView(QueryBudgetMixin, TemplateView):
     template_name = 'core/home.html'
+    query_budget = 2
 
-class AboutView(TemplateView):
+class AboutView(QueryBudgetMixin, TemplateView):
     template_name = 'core/about.html'
+    query_budget = 2
@@ -1,12 +1,18 @@
+import importlib.util
 import os
 from pathlib import Path
-from decouple import config, Csv
+from decouple import config, Choices, Csv
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = config('SECRET_KEY')
-DEBUG = config('DEBUG', default=True, cast=bool)
+# 'production' leaves out the development-only apps below and turns DEBUG off
+SETTINGS_PROFILE = config(
+    'SETTINGS_PROFILE', default='development', cast=Choices(['development', 'production'])
+)
+DEBUG = config('DEBUG', default=SETTINGS_PROFILE == 'development', cast=bool)
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1', cast=Csv())
 
 INSTALLED_APPS = [
@@ -15,6 +21,7 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    'whitenoise.runserver_nostatic',
     'django.contrib.staticfiles',
     'tailwind',
     'theme',
@@ -24,8 +31,13 @@ INSTALLED_APPS = [
     'administration',
 ]
 
+# Tailwind's build tooling and browser auto-reload
+DEV_APPS = ['tailwind', 'django_browser_reload']
+
 MIDDLEWARE = [
+    'core.middleware.ScannerFilterMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'core.middleware.SecurityHeadersMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -39,6 +51,13 @@ MIDDLEWARE = [
     'django_browser_reload.middleware.BrowserReloadMiddleware',
 ]
 
+if SETTINGS_PROFILE == 'production':
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in DEV_APPS]
+    MIDDLEWARE = [
+        middleware for middleware in MIDDLEWARE
+        if middleware.split('.')[0] not in DEV_APPS
+    ]
+
 ROOT_URLCONF = 'morning_star_academy.urls'
 
 TEMPLATES = [
@@ -59,9 +78,76 @@ TEMPLATES = [
 WSGI_APPLICATION = 'morning_star_academy.wsgi.application'
 
 DATABASE_URL = config('DATABASE_URL', default='sqlite:///db.sqlite3')
+
+# Connection management: 'per-request' (open/close every request),
+# 'persistent' (reuse for DB_CONN_MAX_AGE seconds with health checks) or
+# 'pool' (psycopg 3 connection pool, PostgreSQL only; needs psycopg[pool],
+# which is not in requirements.txt since psycopg2 is the default driver)
+DB_CONNECTION_MODE = config(
+    'DB_CONNECTION_MODE',
+    default='per-request',
+    cast=Choices(['per-request', 'persistent', 'pool']),
+)
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=600, cast=int)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=1, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=config('GUNICORN_THREADS', default=4, cast=int), cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=int)
+
+# Optional read replica for staff reporting reads (see core.db_router)
+DATABASE_REPLICA_URL = config('DATABASE_REPLICA_URL', default='')
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=15, cast=int)
+
 DATABASES = {
-    'default': dj_database_url.parse(DATABASE_URL)
+    alias: dj_database_url.parse(
+        url,
+        conn_max_age=DB_CONN_MAX_AGE if DB_CONNECTION_MODE == 'persistent' else 0,
+        conn_health_checks=DB_CONNECTION_MODE == 'persistent',
+    )
+    for alias, url in [('default', DATABASE_URL), ('replica', DATABASE_REPLICA_URL)]
+    if url
 }
+if 'replica' in DATABASES:
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
+for database in DATABASES.values():
+    if DB_CONNECTION_MODE == 'pool' and database['ENGINE'] == 'django.db.backends.postgresql':
+        if not (importlib.util.find_spec('psycopg') and importlib.util.find_spec('psycopg_pool')):
+            raise ImproperlyConfigured(
+                'DB_CONNECTION_MODE=pool needs psycopg 3 and psycopg_pool '
+                '(pip install "psycopg[binary,pool]"); use persistent with psycopg2'
+            )
+        # Pools are per process, so DB_POOL_MAX_SIZE is per gunicorn worker
+        database.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
+
+# SQLite profile for single-box deployments: WAL lets readers run alongside
+# a writer, and BEGIN IMMEDIATE takes the write lock up front so concurrent
+# workers queue on busy_timeout instead of deadlocking on lock upgrades
+SQLITE_TUNED = config('SQLITE_TUNED', default=True, cast=bool)
+SQLITE_BUSY_TIMEOUT_MS = config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int)
+SQLITE_MMAP_SIZE = config('SQLITE_MMAP_SIZE', default=134217728, cast=int)
+SQLITE_CACHE_SIZE_KB = config('SQLITE_CACHE_SIZE_KB', default=20000, cast=int)
+
+for database in DATABASES.values():
+    if SQLITE_TUNED and database['ENGINE'] == 'django.db.backends.sqlite3':
+        database.setdefault('OPTIONS', {}).update({
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS};'
+                f'PRAGMA mmap_size={SQLITE_MMAP_SIZE};'
+                f'PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB};'
+            ),
+        })
+
+# Log database connection churn every N requests (0 disables)
+DB_CONNECTION_METRICS_INTERVAL = config('DB_CONNECTION_METRICS_INTERVAL', default=0, cast=int)
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -93,6 +179,29 @@ STATICFILES_DIRS = [
     BASE_DIR / 'theme' / 'static',
 ]
 
+# Production static pipeline: collectstatic writes content-hashed copies plus
+# gzip and Brotli variants, and WhiteNoise serves the hashed names with
+# far-future immutable caching. Needs collectstatic, so off by default in DEBUG
+# (WhiteNoise then serves straight from the finders).
+STATIC_MANIFEST = config('STATIC_MANIFEST', default=not DEBUG, cast=bool)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'whitenoise.storage.CompressedManifestStaticFilesStorage' if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+# Responsive image derivatives written by the build_images command (see core.images)
+RESPONSIVE_IMAGE_WIDTHS = [int(width) for width in config('RESPONSIVE_IMAGE_WIDTHS', default='480,800,1200', cast=Csv())]
+RESPONSIVE_IMAGE_QUALITY = config('RESPONSIVE_IMAGE_QUALITY', default=75, cast=int)
+
+# Unhashed URLs (e.g. favicon paths hardcoded elsewhere) may change between deploys
+WHITENOISE_MAX_AGE = config('WHITENOISE_MAX_AGE', default=0 if DEBUG else 3600, cast=int)
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -107,18 +216,37 @@ LOGIN_URL = '/accounts/login/'
 LOGIN_REDIRECT_URL = '/admin-portal/'
 LOGOUT_REDIRECT_URL = '/'
 
+# Sessions: 'db', 'cached_db' or 'cache' (see core.sessions). The cached
+# modes need a cache shared by every worker, so they default on with REDIS_URL
+REDIS_URL = config('REDIS_URL', default='')
+SESSION_STORE = config(
+    'SESSION_STORE',
+    default='cached_db' if REDIS_URL else 'db',
+    cast=Choices(['db', 'cached_db', 'cache']),
+)
+SESSION_ENGINE = f'core.sessions.{SESSION_STORE}'
 SESSION_COOKIE_AGE = 3600
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 SESSION_COOKIE_SECURE = config('SESSION_COOKIE_SECURE', default=False, cast=bool)
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SAMESITE = 'Lax'
 
+# Flash messages travel in a signed cookie rather than the session
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
 CSRF_COOKIE_SECURE = config('CSRF_COOKIE_SECURE', default=False, cast=bool)
 CSRF_COOKIE_HTTPONLY = True
 CSRF_COOKIE_SAMESITE = 'Lax'
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = config('DATA_UPLOAD_MAX_MEMORY_SIZE', default=5242880, cast=int)
 FILE_UPLOAD_MAX_MEMORY_SIZE = config('FILE_UPLOAD_MAX_MEMORY_SIZE', default=5242880, cast=int)
+# Supporting documents are streamed to disk in chunks (see applications.documents)
+DOCUMENT_MAX_SIZE = config('DOCUMENT_MAX_SIZE', default=10485760, cast=int)
+DOCUMENT_MAX_PER_APPLICATION = config('DOCUMENT_MAX_PER_APPLICATION', default=6, cast=int)
+DOCUMENT_CHUNK_SIZE = config('DOCUMENT_CHUNK_SIZE', default=1048576, cast=int)
+DOCUMENT_UPLOAD_MAX_AGE_HOURS = config('DOCUMENT_UPLOAD_MAX_AGE_HOURS', default=72, cast=int)
+# Unfinished uploads older than this are deleted by process_documents
+DOCUMENT_UPLOAD_EXPIRY_HOURS = config('DOCUMENT_UPLOAD_EXPIRY_HOURS', default=24, cast=int)
 
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -131,14 +259,61 @@ EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='Morning Star Academy <info@morningstaracademy.edu.gh>')
+# HTTP API used by EMAIL_BACKEND='core.email_backends.BatchEmailBackend':
+# 'batch', 'sendgrid' or 'mailgun' (see core.email_backends)
+EMAIL_API_PROVIDER = config('EMAIL_API_PROVIDER', default='batch', cast=Choices(['batch', 'sendgrid', 'mailgun']))
+EMAIL_API_URL = config('EMAIL_API_URL', default='')
+EMAIL_API_KEY = config('EMAIL_API_KEY', default='')
+EMAIL_BATCH_SIZE = config('EMAIL_BATCH_SIZE', default=100, cast=int)
+EMAIL_API_TIMEOUT = config('EMAIL_API_TIMEOUT', default=10, cast=float)
+EMAIL_API_RETRIES = config('EMAIL_API_RETRIES', default=3, cast=int)
+EMAIL_API_BACKOFF = config('EMAIL_API_BACKOFF', default=0.5, cast=float)
+EMAIL_API_POOL_SIZE = config('EMAIL_API_POOL_SIZE', default=10, cast=int)
+# EmailLog rows are buffered and bulk-inserted (see core.email_log)
+EMAIL_LOG_BUFFER_SIZE = config('EMAIL_LOG_BUFFER_SIZE', default=20, cast=int)
+EMAIL_LOG_FLUSH_SECONDS = config('EMAIL_LOG_FLUSH_SECONDS', default=5, cast=int)
 
 SCHOOL_NAME = config('SCHOOL_NAME', default='Morning Star Academy')
 SCHOOL_ADDRESS = config('SCHOOL_ADDRESS', default='Tamale, Gbanyamli, Northern Region, Ghana')
 SCHOOL_PHONE = config('SCHOOL_PHONE', default='+233 XX XXX XXXX')
 SCHOOL_EMAIL = config('SCHOOL_EMAIL', default='info@morningstaracademy.edu.gh')
+ADMIN_EMAIL = config('ADMIN_EMAIL', default=SCHOOL_EMAIL)
+# Public origin used for links in emails, e.g. https://morningstaracademy.edu.gh
+SITE_URL = config('SITE_URL', default='http://localhost:8000')
+EMAIL_VERIFICATION_MAX_AGE_HOURS = config('EMAIL_VERIFICATION_MAX_AGE_HOURS', default=48, cast=int)
+# Reminders to verify the guardian email (see the send_reminders command)
+REMINDER_FIRST_DELAY_HOURS = config('REMINDER_FIRST_DELAY_HOURS', default=24, cast=int)
+REMINDER_INTERVAL_HOURS = config('REMINDER_INTERVAL_HOURS', default=48, cast=int)
+REMINDER_MAX_COUNT = config('REMINDER_MAX_COUNT', default=2, cast=int)
+# A reminder that fails is retried after 30, 60, 120... minutes; after
+# REMINDER_MAX_FAILURES failures it counts as one of REMINDER_MAX_COUNT
+REMINDER_RETRY_MINUTES = config('REMINDER_RETRY_MINUTES', default=30, cast=int)
+REMINDER_MAX_FAILURES = config('REMINDER_MAX_FAILURES', default=3, cast=int)
 
 MAX_APPLICATIONS_PER_DAY = config('MAX_APPLICATIONS_PER_DAY', default=50, cast=int)
+# Optional per-grade daily caps, e.g. "primary_1=10,jhs_1=5" (see applications.intake)
+MAX_APPLICATIONS_PER_DAY_BY_GRADE = {
+    grade.strip(): int(cap)
+    for grade, cap in (
+        item.split('=') for item in config('MAX_APPLICATIONS_PER_DAY_BY_GRADE', default='', cast=Csv())
+    )
+}
+
+# Repeated apply-form POSTs replay the first outcome (see applications.submissions)
+SUBMISSION_KEY_TTL = config('SUBMISSION_KEY_TTL', default=900, cast=int)
+# Kept short: the waiting repeat holds a sync worker
+SUBMISSION_WAIT_SECONDS = config('SUBMISSION_WAIT_SECONDS', default=2, cast=int)
+
 ACADEMIC_YEAR = config('ACADEMIC_YEAR', default='2024/2025')
+ACADEMIC_YEAR_START_MONTH = config('ACADEMIC_YEAR_START_MONTH', default=9, cast=int)
+
+# Extra whitespace-separated path regexes answered by ScannerFilterMiddleware,
+# and how often its aggregated log line is written (see core.scanners)
+SCANNER_EXTRA_PATTERNS = config('SCANNER_EXTRA_PATTERNS', default='').split()
+SCANNER_LOG_INTERVAL = config('SCANNER_LOG_INTERVAL', default=60, cast=int)
+
+# Per-view query budgets: 'off', 'log' or 'raise' (see core.query_budget)
+QUERY_BUDGET_MODE = config('QUERY_BUDGET_MODE', default='log' if DEBUG else 'off')
 
 CACHES = {
     'default': {
@@ -146,6 +321,12 @@ CACHES = {
         'TIMEOUT': 300,
     }
 }
+if REDIS_URL:
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'TIMEOUT': 300,
+    }
 
 LOGGING = {
     'version': 1,
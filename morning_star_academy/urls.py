@@ -4,7 +4,6 @@ URL configuration for morning_star_academy project.
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -21,8 +20,8 @@ handler403 = 'core.error_handlers.custom_403_handler'
 handler400 = 'core.error_handlers.custom_400_handler'
 
 # Add browser reload for development
-if settings.DEBUG:
+if settings.DEBUG and 'django_browser_reload' in settings.INSTALLED_APPS:
     urlpatterns += [
         path("__reload__/", include("django_browser_reload.urls")),
     ]
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATICFILES_DIRS[0])
+    # Static files are served by WhiteNoise (see STORAGES in settings)
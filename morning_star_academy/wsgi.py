@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'morning_star_academy.settings')
 
 application = get_wsgi_application()
+
+# Import the URLconf, and with it every view module, now rather than on the
+# first request, so workers forked by ``gunicorn --preload`` start warm
+from django.urls import get_resolver  # noqa: E402
+
+get_resolver().url_patterns